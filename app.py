@@ -18,7 +18,8 @@ LOGO_PATH = ASSETS_DIR / "techlink-logo.svg"
 # Sidebar logo removed per request
 
 # Import data initialization
-from data.sample_data import initialize_data, reset_demo_data
+from data.sample_data import reset_demo_data
+from services.data_service import DataService
 
 # Page configuration
 st.set_page_config(
@@ -95,10 +96,8 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Initialize session state and data
-if 'initialized' not in st.session_state:
-    initialize_data()
-    st.session_state.initialized = True
+# Initialize the data service (seeds demo data on first use)
+DataService()
 
 # Sidebar utility: reload demo data
 with st.sidebar:
@@ -160,13 +159,12 @@ def main():
         st.markdown("### System Status")
         
         # Get current stats
-        from services.data_service import DataService
         ds = DataService()
         
-        st.metric("Active Projects", len([p for p in ds.get_all_projects() if p['status'] == 'active']))
+        st.metric("Active Projects", ds.count_by('projects', 'status').get('active', 0))
         st.metric("Total Customers", len(ds.get_all_customers()))
         st.metric("Test Plans", len(ds.get_all_test_plans()))
-        st.metric("Pending RFQs", len([r for r in ds.get_all_rfqs() if r['status'] == 'pending']))
+        st.metric("Pending RFQs", ds.count_by('rfqs', 'status').get('pending', 0))
         
         st.markdown("---")
         
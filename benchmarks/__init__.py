@@ -0,0 +1,6 @@
+"""
+Headless benchmarks for the data layer and pages
+
+python -m benchmarks.data_service   # DataService operations at 1k..1M records
+python -m benchmarks.pages          # page reruns and interactions through AppTest
+"""
@@ -0,0 +1,182 @@
+"""
+Micro-benchmarks of DataService operations across data scales
+Each (storage, scale) run loads a generated dataset in a fresh process, so peak
+memory is per run, then times every operation for a fixed time budget.
+
+Usage: python -m benchmarks.data_service --scales 1k,10k,100k,1m --storage memory,sqlite \
+           [--output run.json] [--compare baseline.json --threshold 0.25 --min-delta 5]
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from data.generator import load_dataset
+from services.data_service import DataService
+from services.storage import MemoryStorage, SQLiteStorage, Storage
+
+from .harness import (SCALES, compare, environment, measure, parse_scales, peak_alloc_kb,
+                      peak_rss_mb, print_table, write_results)
+
+STORAGES = ('memory', 'typed', 'sqlite')
+# Fixed so runs on different days see the same dataset and date windows
+DATASET_END = date(2025, 1, 1)
+SEED = 1234
+
+
+def dataset_size(records: int) -> Dict[str, int]:
+    """Get the generator's main counts for a scale, given as the number of test results"""
+    return {'customers': max(records // 100, 10), 'projects': max(records // 20, 20), 'results': records}
+
+
+def _storage(kind: str, workdir: str) -> Storage:
+    if kind == 'memory':
+        return MemoryStorage({})
+    if kind == 'typed':
+        return MemoryStorage({}, typed=True)
+    if kind == 'sqlite':
+        return SQLiteStorage(str(Path(workdir) / 'bench.db'))
+    raise ValueError(f"Unknown storage: {kind} (expected {', '.join(STORAGES)})")
+
+
+def operations(ds: DataService, sizes: Dict[str, int], seed: int) -> Dict[str, Callable[[], Any]]:
+    """Get the benchmarked operations, reads first so writes do not invalidate the read caches"""
+    rng = random.Random(seed)
+
+    def cycle(values: List[Any]):
+        return itertools.cycle(values).__next__
+
+    customer_id = cycle([rng.randint(1, sizes['customers']) for _ in range(1000)])
+    project_id = cycle([rng.randint(1, sizes['projects']) for _ in range(1000)])
+    test_plan_id = cycle([rng.randint(1, ds.count('test_plans')) for _ in range(1000)])
+    offset = cycle([rng.randrange(0, max(sizes['results'] - 20, 1)) for _ in range(1000)])
+    project_status = cycle(['pending', 'active', 'completed', 'on_hold'])
+    company_word = cycle(['apex', 'nova sys', 'titan', 'quantum elec', 'zenith labs', 'orbit'])
+    result_word = cycle(['emissions', 'thermal cyc', 'rf output', 'surge', 'leakage current'])
+    month_start = datetime.combine(DATASET_END, datetime.min.time()) - timedelta(days=30)
+
+    def new_result():
+        plan = ds.get_test_plan_by_id(test_plan_id())
+        return {'test_name': 'Benchmark run', 'test_type': plan['test_type'], 'test_plan_id': plan['id'],
+                'project_id': plan['project_id'], 'project_name': plan['project_name'], 'pass_fail': 'Pass'}
+
+    return {
+        'get_project_by_id': lambda: ds.get_project_by_id(project_id()),
+        'get_test_plan_by_id': lambda: ds.get_test_plan_by_id(test_plan_id()),
+        'test_results_by_project': lambda: ds.get_test_results_by_project(project_id()),
+        'test_plans_by_project': lambda: ds.get_test_plans_by_project(project_id()),
+        'rfqs_by_customer': lambda: ds.get_rfqs_by_customer(customer_id()),
+        'count_by_status': lambda: ds.count_by('test_results', 'pass_fail'),
+        'dashboard_stats': ds.get_dashboard_stats,
+        'search_customers': lambda: ds.search('customers', company_word()),
+        'search_test_results_top20': lambda: ds.search('test_results', result_word(), limit=20),
+        'filter_projects_by_status': lambda: list(ds.query('projects', where={'status': project_status()})),
+        'filter_failed_results_latest20': lambda: list(ds.query(
+            'test_results', where={'pass_fail': 'Fail'}, order_by='created_at', descending=True, limit=20)),
+        'list_test_results_page': lambda: ds.list('test_results', offset=offset(), limit=20),
+        'test_results_last_30_days': lambda: ds.get_by_date_range('test_results', 'created_at', month_start),
+        'test_results_frame': lambda: ds.get_frame('test_results'),
+        'add_customer': lambda: ds.add_customer({'company_name': 'Benchmark Ltd', 'email': 'bench@example.com',
+                                                 'contact_person': 'Bench Mark', 'status': 'active'}),
+        'add_test_result': lambda: ds.add_test_result(new_result()),
+        'update_project_status': lambda: ds.update_project(project_id(), {'status': project_status()}),
+        'add_many_test_results_100': lambda: ds.add_many('test_results', [new_result() for _ in range(100)]),
+    }
+
+
+def run_benchmark(storage: str, scale: str, budget: float, seed: int = SEED) -> Dict[str, Any]:
+    """Load a dataset of the given scale into a storage backend and time every operation"""
+    workdir = tempfile.mkdtemp(prefix='lms-bench-')
+    try:
+        sizes = dataset_size(SCALES[scale])
+        store = _storage(storage, workdir)
+        started = time.perf_counter()
+        loaded = load_dataset(store, seed=seed, end=DATASET_END, **sizes)
+        load_seconds = time.perf_counter() - started
+        ds = DataService(store)
+        results = {}
+        for name, func in operations(ds, sizes, seed).items():
+            results[name] = measure(func, budget)
+            results[name]['peak_alloc_kb'] = peak_alloc_kb(func)
+        return {
+            'storage': storage,
+            'scale': scale,
+            'records': sum(loaded.values()),
+            'load_seconds': round(load_seconds, 2),
+            'peak_rss_mb': peak_rss_mb(),
+            'operations': results,
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _flatten(payload: Dict[str, Any]) -> Dict[tuple, Dict[str, Any]]:
+    """Key a run's operation results by (storage, scale, operation)"""
+    return {(run['storage'], run['scale'], name): values
+            for run in payload['runs'] for name, values in run['operations'].items()}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark DataService operations across data scales")
+    parser.add_argument('--scales', default='1k,10k,100k,1m', help="comma separated, from 1k, 10k, 100k, 1m")
+    parser.add_argument('--storage', default='memory,sqlite', help=f"comma separated, from {', '.join(STORAGES)}")
+    parser.add_argument('--budget', type=float, default=0.5, help="seconds spent timing each operation")
+    parser.add_argument('--output', help="results file (default: benchmarks/results/data_service-<time>.json)")
+    parser.add_argument('--compare', help="earlier results file to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed p50 slowdown, e.g. 0.25 = 25%%")
+    parser.add_argument('--min-delta', type=float, default=5.0, help="ignore p50 slowdowns below this many us")
+    args = parser.parse_args(argv)
+
+    try:
+        scales = parse_scales(args.scales)
+    except ValueError as e:
+        parser.error(str(e))
+    storages = [s.strip() for s in args.storage.split(',') if s.strip()]
+    for kind in storages:
+        if kind not in STORAGES:
+            parser.error(f"unknown storage {kind}")
+
+    payload = {'benchmark': 'data_service', 'environment': environment(), 'budget': args.budget,
+               'seed': SEED, 'runs': []}
+    # A fresh process per run keeps peak memory and warm caches from leaking between runs
+    context = multiprocessing.get_context('spawn')
+    for kind in storages:
+        for scale in scales:
+            print(f"{kind} @ {scale} ...", flush=True)
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                run = pool.submit(run_benchmark, kind, scale, args.budget).result()
+            payload['runs'].append(run)
+            print(f"  {run['records']:,} records loaded in {run['load_seconds']}s, "
+                  f"peak RSS {run['peak_rss_mb']} MB")
+            print_table(
+                ['operation', 'ops/sec', 'p50 us', 'p99 us', 'peak KB'],
+                [[name, r['ops_per_sec'], r['p50_us'], r['p99_us'], r['peak_alloc_kb']]
+                 for name, r in run['operations'].items()],
+            )
+    path = write_results('data_service', payload, args.output)
+    print(f"Wrote {path}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(_flatten(payload), _flatten(baseline), 'p50_us', args.threshold,
+                              args.min_delta)
+        for (kind, scale, name), before, after in regressions:
+            print(f"REGRESSION {kind} @ {scale} {name}: p50 {before}us -> {after}us")
+        if regressions:
+            return 1
+        print(f"No p50 regressions over {args.threshold:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
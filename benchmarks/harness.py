@@ -0,0 +1,126 @@
+"""
+Timing, memory and result-file helpers shared by the benchmarks
+"""
+
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+# Record counts for the scale names accepted on the command line
+SCALES = {'1k': 1_000, '10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+
+def parse_scales(value: str) -> List[str]:
+    """Parse a comma separated list of scale names, e.g. '1k,10k'"""
+    scales = [s.strip().lower() for s in value.split(',') if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        raise ValueError(f"Unknown scale: {', '.join(unknown)} (expected {', '.join(SCALES)})")
+    return scales
+
+
+def measure(func: Callable[[], Any], budget: float = 0.5, min_calls: int = 3,
+            max_calls: int = 10_000) -> Dict[str, Any]:
+    """Call func repeatedly for about budget seconds and summarize its latency"""
+    func()  # warm caches and lazily built indexes
+    timings = []
+    clock = time.perf_counter
+    deadline = clock() + budget
+    while len(timings) < max_calls and (len(timings) < min_calls or clock() < deadline):
+        start = clock()
+        func()
+        timings.append(clock() - start)
+    latency = np.array(timings) * 1e6
+    return {
+        'calls': len(timings),
+        'ops_per_sec': round(len(timings) / latency.sum() * 1e6, 1),
+        'p50_us': round(float(np.percentile(latency, 50)), 1),
+        'p99_us': round(float(np.percentile(latency, 99)), 1),
+    }
+
+
+def peak_alloc_kb(func: Callable[[], Any]) -> float:
+    """Get the peak memory allocated by one call of func, traced separately from the timed calls"""
+    tracemalloc.start()
+    try:
+        func()
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Get the peak resident memory of this process, where the platform reports it"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10), 1)
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine and code version a run was made on"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, cwd=Path(__file__).parent, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ''
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit or None,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+    }
+
+
+def write_results(name: str, payload: Dict[str, Any], path: Optional[str] = None) -> Path:
+    """Write a benchmark run to path, by default benchmarks/results/<name>-<timestamp>.json"""
+    if path is None:
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        target = RESULTS_DIR / f"{name}-{stamp}.json"
+    else:
+        target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(payload, indent=2))
+    return target
+
+
+def compare(current: Dict[Tuple, Dict[str, Any]], baseline: Dict[Tuple, Dict[str, Any]],
+            metric: str, threshold: float, min_delta: float = 0.0) -> List[Tuple[Tuple, float, float]]:
+    """Get the (key, baseline, current) entries whose metric grew by more than threshold
+
+    Growth below min_delta (in the metric's unit) is treated as timer noise.
+    """
+    regressions = []
+    for key, values in current.items():
+        before = baseline.get(key, {}).get(metric)
+        after = values.get(metric)
+        if before and after is not None and after > before * (1 + threshold) and after - before > min_delta:
+            regressions.append((key, before, after))
+    return regressions
+
+
+def print_table(headers: List[str], rows: List[List[Any]]):
+    """Print rows as a plain aligned text table"""
+    cells = [[str(h) for h in headers]] + [['' if v is None else str(v) for v in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    for n, row in enumerate(cells):
+        print('  '.join(v.ljust(w) if i == 0 else v.rjust(w) for i, (v, w) in enumerate(zip(row, widths))))
+        if n == 0:
+            print('  '.join('-' * w for w in widths))
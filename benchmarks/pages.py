@@ -0,0 +1,227 @@
+"""
+Per-page rerun latency benchmarks on Streamlit's AppTest harness
+Each page in pages/ is loaded against generated datasets of increasing size,
+then put through the common interactions (search, filter change, View Details,
+next page), recording the wall time and element count of every rerun.
+
+Usage: python -m benchmarks.pages --scales 1k,10k,100k --storage session \
+           [--pages Dashboard,Customers] [--output run.json] [--compare baseline.json]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .data_service import DATASET_END, SEED, dataset_size
+from .harness import SCALES, compare, environment, parse_scales, print_table, write_results
+
+PAGES_DIR = Path(__file__).parent.parent / 'pages'
+STORAGES = ('session', 'sqlite')
+SEARCH_TEXT = 'smart'
+
+
+def page_files(names: Optional[List[str]] = None) -> List[Path]:
+    """Get the page scripts, optionally only those whose file name contains one of names"""
+    files = sorted(PAGES_DIR.glob('*.py'))
+    if names:
+        files = [f for f in files if any(n.lower() in f.stem.lower() for n in names)]
+    return files
+
+
+def _count_elements(block) -> int:
+    """Count the leaf elements under an AppTest block"""
+    children = getattr(block, 'children', None)
+    if isinstance(children, dict):
+        return sum(_count_elements(child) for child in children.values())
+    return 1
+
+
+def _interactions(at) -> Dict[str, Callable[[], Any]]:
+    """Find the common interactions the rendered page offers, keyed by step name"""
+    steps = {}
+    search = [t for t in at.text_input if 'search' in (t.label or '').lower()]
+    if search:
+        steps['search'] = lambda: search[0].input(SEARCH_TEXT)
+    filters = [s for s in at.selectbox if s.options and s.options[0] == 'All' and len(s.options) > 1]
+    if filters:
+        steps['filter'] = lambda: filters[0].select(filters[0].options[1])
+    # Record buttons are keyed view_<...>; unkeyed "View ..." buttons switch pages
+    view = [b for b in at.button if (b.key or '').startswith('view_')]
+    if view:
+        steps['view_details'] = lambda: view[0].click()
+    following = [b for b in at.button if (b.key or '').endswith('_next')]
+    if following:
+        steps['next_page'] = lambda: following[0].click()
+    return steps
+
+
+def _timed_run(at) -> Dict[str, Any]:
+    """Rerun the page and record its wall time, element count and any exception"""
+    start = time.perf_counter()
+    at.run()
+    wall_ms = (time.perf_counter() - start) * 1000
+    error = at.exception[0].message if at.exception else None
+    # AppTest reports no exception for some failures (e.g. a script it could not run); an empty page is one
+    if error is None and not _count_elements(at.main):
+        error = "page rendered no elements"
+    return {
+        'wall_ms': round(wall_ms, 1),
+        'elements': _count_elements(at.main) + _count_elements(at.sidebar),
+        'error': error,
+    }
+
+
+def _compile_error(path: Path) -> Optional[str]:
+    """Get the SyntaxError a page script raises on this Python, which AppTest does not report"""
+    try:
+        compile(path.read_text(encoding='utf-8'), str(path), 'exec')
+    except SyntaxError as e:
+        return f"SyntaxError: {e.msg} (line {e.lineno})"
+    return None
+
+
+def bench_page(path: Path, prepare: Callable[[Any], None], reruns: int, timeout: float) -> List[Dict[str, Any]]:
+    """Load a page in a fresh session, then time plain reruns and each interaction it offers"""
+    from streamlit.testing.v1 import AppTest
+
+    error = _compile_error(path)
+    if error:
+        return [{'step': 'load', 'wall_ms': 0.0, 'elements': 0, 'error': error}]
+    at = AppTest.from_file(str(path), default_timeout=timeout)
+    prepare(at)
+    steps = [dict(step='load', **_timed_run(at))]
+    if steps[0]['error']:
+        return steps
+    runs = [_timed_run(at) for _ in range(reruns)]
+    steps.append(dict(step='rerun', **runs[0], wall_ms_max=max(r['wall_ms'] for r in runs)))
+    steps[-1]['wall_ms'] = round(statistics.median(r['wall_ms'] for r in runs), 1)
+    # Apply the loaded page's interactions in turn, finding each again on the latest rerun
+    for name in list(_interactions(at)):
+        interact = _interactions(at).get(name)
+        if interact is None:
+            continue
+        interact()
+        steps.append(dict(step=name, **_timed_run(at)))
+    return steps
+
+
+def run_benchmark(storage: str, scale: str, pages: List[str], reruns: int, timeout: float,
+                  seed: int = SEED) -> Dict[str, Any]:
+    """Load a dataset of the given scale and benchmark every page against it"""
+    from data.generator import load_dataset
+    from services.storage import MemoryStorage, SQLiteStorage
+
+    workdir = tempfile.mkdtemp(prefix='lms-pages-')
+    try:
+        sizes = dataset_size(SCALES[scale])
+        os.environ.pop('LMS_SNAPSHOT', None)
+        os.environ.pop('LMS_TYPED_RECORDS', None)
+        os.environ['LMS_STORAGE'] = storage
+        if storage == 'sqlite':
+            path = str(Path(workdir) / 'pages.db')
+            os.environ['LMS_SQLITE_PATH'] = path
+            loaded = load_dataset(SQLiteStorage(path), seed=seed, end=DATASET_END, **sizes)
+
+            def prepare(at):
+                pass
+        else:
+            # Every session starts from the same prebuilt state, indexes included
+            state: Dict[str, Any] = {}
+            store = MemoryStorage(state)
+            loaded = load_dataset(store, seed=seed, end=DATASET_END, **sizes)
+            store.build_indexes()
+
+            def prepare(at):
+                for key, value in state.items():
+                    at.session_state[key] = value
+                at.session_state['initialized'] = True
+
+        results = {}
+        for path in page_files(pages):
+            results[path.stem] = bench_page(path, prepare, reruns, timeout)
+        return {
+            'storage': storage,
+            'scale': scale,
+            'records': sum(loaded.values()),
+            'pages': results,
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _flatten(payload: Dict[str, Any]) -> Dict[tuple, Dict[str, Any]]:
+    """Key a run's steps by (storage, scale, page, step)"""
+    return {(run['storage'], run['scale'], page, step['step']): step
+            for run in payload['runs'] for page, steps in run['pages'].items() for step in steps}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark page reruns across data scales")
+    parser.add_argument('--scales', default='1k,10k,100k', help="comma separated, from 1k, 10k, 100k, 1m")
+    parser.add_argument('--storage', default='session', help=f"comma separated, from {', '.join(STORAGES)}")
+    parser.add_argument('--pages', help="comma separated parts of page names, e.g. Dashboard,NCRs")
+    parser.add_argument('--reruns', type=int, default=3, help="plain reruns timed after the first load")
+    parser.add_argument('--timeout', type=float, default=600, help="seconds allowed for one rerun")
+    parser.add_argument('--output', help="results file (default: benchmarks/results/pages-<time>.json)")
+    parser.add_argument('--compare', help="earlier results file to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed slowdown, e.g. 0.25 = 25%%")
+    parser.add_argument('--min-delta', type=float, default=20.0, help="ignore slowdowns below this many ms")
+    args = parser.parse_args(argv)
+
+    try:
+        scales = parse_scales(args.scales)
+    except ValueError as e:
+        parser.error(str(e))
+    storages = [s.strip() for s in args.storage.split(',') if s.strip()]
+    for kind in storages:
+        if kind not in STORAGES:
+            parser.error(f"unknown storage {kind}")
+    pages = [p.strip() for p in args.pages.split(',')] if args.pages else None
+
+    payload = {'benchmark': 'pages', 'environment': environment(), 'reruns': args.reruns,
+               'seed': SEED, 'runs': []}
+    failed = False
+    # A fresh process per run keeps Streamlit caches and memory from leaking between runs
+    context = multiprocessing.get_context('spawn')
+    for kind in storages:
+        for scale in scales:
+            print(f"{kind} @ {scale} ...", flush=True)
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                run = pool.submit(run_benchmark, kind, scale, pages, args.reruns, args.timeout).result()
+            payload['runs'].append(run)
+            print(f"  {run['records']:,} records")
+            rows = []
+            for page, steps in run['pages'].items():
+                for step in steps:
+                    rows.append([page, step['step'], step['wall_ms'], step['elements'],
+                                 (step['error'] or '')[:60]])
+                    failed = failed or bool(step['error'])
+            print_table(['page', 'step', 'wall ms', 'elements', 'error'], rows)
+    path = write_results('pages', payload, args.output)
+    print(f"Wrote {path}")
+
+    status = 1 if failed else 0
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(_flatten(payload), _flatten(baseline), 'wall_ms', args.threshold,
+                              args.min_delta)
+        for (kind, scale, page, step), before, after in regressions:
+            print(f"REGRESSION {kind} @ {scale} {page} {step}: {before}ms -> {after}ms")
+        if regressions:
+            status = 1
+        else:
+            print(f"No rerun regressions over {args.threshold:.0%} against {args.compare}")
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,9 @@
+"""
+Reusable UI components for the pages
+"""
+
+from .concurrency import shown_version
+from .pagination import paginate
+from .performance import performance_panel
+
+__all__ = ['paginate', 'performance_panel', 'shown_version']
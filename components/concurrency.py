@@ -0,0 +1,23 @@
+"""
+Optimistic concurrency helpers for action buttons on shared records
+"""
+
+from typing import Dict, Any
+
+import streamlit as st
+
+from services.storage import record_version
+
+
+def shown_version(record: Dict[str, Any], key: str) -> int:
+    """Get the version of record the user saw when key's widget was last drawn, and remember the current one
+
+    A button click reruns the page, which reads the record again; pass this as
+    expected_version so a change someone else made before the click raises
+    ConflictError instead of being overwritten.
+    """
+    seen = st.session_state.setdefault('_shown_versions', {})
+    current = record_version(record)
+    shown = seen.get(key, current)
+    seen[key] = current
+    return shown
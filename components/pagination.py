@@ -0,0 +1,35 @@
+"""
+Page controls for long record lists
+"""
+
+import math
+from typing import List, Dict, Any
+
+import streamlit as st
+
+from services.data_service import DataService
+
+
+def paginate(ds: DataService, collection: str, key: str, page_size: int = 20,
+             order_by: str = 'id', descending: bool = False) -> List[Dict[str, Any]]:
+    """Get the records of the current page, showing Prev/Next controls when there is more than one page"""
+    total = ds.count(collection)
+    pages = max(1, math.ceil(total / page_size))
+    state_key = f'{key}_page'
+    page = min(max(st.session_state.get(state_key, 1), 1), pages)
+    
+    if pages > 1:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            if st.button("◀ Prev", key=f"{key}_prev", disabled=page <= 1, width="stretch"):
+                page -= 1
+        with col3:
+            if st.button("Next ▶", key=f"{key}_next", disabled=page >= pages, width="stretch"):
+                page += 1
+        with col2:
+            first = (page - 1) * page_size + 1
+            st.caption(f"Page {page} of {pages} · showing {first}-{min(page * page_size, total)} of {total}")
+    
+    st.session_state[state_key] = page
+    return ds.list(collection, offset=(page - 1) * page_size, limit=page_size,
+                   order_by=order_by, descending=descending)['records']
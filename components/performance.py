@@ -0,0 +1,36 @@
+"""
+Sidebar Performance panel for the opt-in rerun profiler (LMS_PROFILE=1)
+"""
+
+import pandas as pd
+import streamlit as st
+
+from services import profiler
+
+
+def performance_panel():
+    """Close this rerun's profile and show its breakdown in the sidebar; call it last on a page"""
+    summary = profiler.finish_rerun()
+    if summary is None:
+        return
+    reruns = profiler.history(summary['page'])
+
+    with st.sidebar.expander("⏱️ Performance"):
+        st.caption(f"Last rerun: {summary['total_ms']:.0f} ms · {summary['started']}")
+        st.dataframe(pd.DataFrame(summary['sections']), hide_index=True, width="stretch")
+
+        if summary['calls']:
+            st.markdown("**Slowest calls**")
+            st.dataframe(pd.DataFrame(summary['calls'][:10]), hide_index=True, width="stretch")
+
+        st.markdown(f"**Last {len(reruns)} reruns of this page**")
+        st.dataframe(pd.DataFrame(profiler.percentiles(reruns)), hide_index=True, width="stretch")
+
+        st.download_button(
+            "Export JSON",
+            data=profiler.export_json(),
+            file_name="lms-profile.json",
+            mime="application/json",
+            key="profiler_export",
+            width="stretch",
+        )
@@ -0,0 +1,746 @@
+"""
+Synthetic data generator for load testing and benchmarks
+Builds referentially consistent records for every collection at any volume.
+Numeric, categorical and date columns are drawn as numpy arrays a chunk at a
+time, so large datasets can be streamed into storage without building them
+in memory first.
+
+Usage: python -m data.generator --customers 10000 --projects 50000 --results 1000000 \
+           --seed 7 --sqlite data/load.db
+"""
+
+import argparse
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from services.schema import COLLECTIONS
+
+DAY = 86400
+
+# Default sizes of the other collections, relative to customers/projects/results
+_SIZES = {
+    'rfqs': ('customers', 3),
+    'test_plans': ('projects', 2),
+    'test_executions': ('results', 0.25),
+    'samples': ('projects', 1.5),
+    'trfs': ('projects', 1),
+    'documents': ('projects', 0.5),
+    'audits': ('customers', 0.05),
+    'ncrs': ('results', 0.002),
+    'certifications': ('customers', 0.01),
+}
+
+# Order records are generated in, parents before children
+_ORDER = (
+    'customers', 'rfqs', 'estimations', 'projects', 'test_plans', 'test_executions',
+    'test_results', 'samples', 'trfs', 'documents', 'audits', 'ncrs', 'certifications',
+)
+
+_COMPANY_PREFIXES = [
+    'Apex', 'Nova', 'Vertex', 'Quantum', 'Zenith', 'Orbit', 'Pioneer', 'Summit', 'Helix',
+    'Falcon', 'Nimbus', 'Sigma', 'Vector', 'Polaris', 'Cobalt', 'Titan', 'Aurora', 'Crest',
+    'Lumen', 'Stellar', 'Triton', 'Eon', 'Matrix', 'Nexus', 'Horizon', 'Spectra', 'Volt',
+    'Kinetic', 'Prism', 'Atlas',
+]
+_COMPANY_CORES = [
+    'Electronics', 'Systems', 'Devices', 'Technologies', 'Labs', 'Automation', 'Power',
+    'Wireless', 'Controls', 'Instruments', 'Networks', 'Solutions', 'Robotics', 'Embedded',
+    'Semiconductors', 'Energy', 'Digital', 'Telecom', 'Mobility', 'Sensors',
+]
+_COMPANY_SUFFIXES = ['Ltd', 'Pvt Ltd', 'Inc', 'Industries', 'Corp', 'LLP', 'Group', 'Co']
+_FIRST_NAMES = [
+    'John', 'Sarah', 'Mike', 'Emily', 'Priya', 'Arun', 'Jane', 'Alex', 'Ravi', 'Anita',
+    'David', 'Meera', 'Karan', 'Sneha', 'Vikram', 'Lisa', 'Rahul', 'Divya', 'Tom', 'Neha',
+]
+_LAST_NAMES = [
+    'Smith', 'Johnson', 'Chen', 'Davis', 'Nair', 'Mehta', 'Kumar', 'Sharma', 'Iyer', 'Rao',
+    'Williams', 'Brown', 'Patel', 'Gupta', 'Reddy', 'Singh', 'Das', 'Joshi', 'Menon', 'Bose',
+]
+# (city, state, GST state code, PIN prefix)
+_CITIES = [
+    ('Bangalore', 'Karnataka', 29, 560), ('Mumbai', 'Maharashtra', 27, 400),
+    ('Pune', 'Maharashtra', 27, 411), ('Hyderabad', 'Telangana', 36, 500),
+    ('Chennai', 'Tamil Nadu', 33, 600), ('New Delhi', 'Delhi', 7, 110),
+    ('Noida', 'Uttar Pradesh', 9, 201), ('Ahmedabad', 'Gujarat', 24, 380),
+    ('Kolkata', 'West Bengal', 19, 700), ('Kochi', 'Kerala', 32, 682),
+]
+_STREETS = ['Tech Park', 'Industrial Area', 'Business Hub', 'Tech City', 'Electronics City',
+            'SEZ Phase 2', 'Innovation Campus', 'MIDC Estate']
+
+_PRODUCT_ADJECTIVES = ['Smart', 'Compact', 'Industrial', 'Wireless', 'Portable', 'Rugged',
+                       'Connected', 'High-Power', 'Low-Power', 'Modular']
+_PRODUCT_DEVICES = ['Router', 'Sensor Hub', 'LED Driver', 'Power Adapter', 'RF Module',
+                    'Motor Controller', 'Gateway', 'Smart Meter', 'Charger', 'Camera',
+                    'Inverter', 'Thermostat', 'Access Point', 'Medical Monitor', 'Display Panel']
+_PROJECT_KINDS = ['EMC Testing', 'RF Compliance', 'Safety Testing', 'Certification',
+                  'Environmental Testing']
+
+_TEST_TYPES = ['EMC', 'RF', 'Safety', 'Environmental']
+_TEST_TYPE_WEIGHTS = [0.4, 0.25, 0.2, 0.15]
+_PASS_RATES = np.array([0.8, 0.85, 0.92, 0.88])
+_PLAN_NAMES = {
+    'EMC': ['EMC Compliance Test Plan', 'Radiated Emissions Plan', 'Conducted Immunity Plan'],
+    'RF': ['RF Emission Test Plan', 'RF Compliance Test', 'Spurious Emissions Plan'],
+    'Safety': ['Safety Certification Test', 'Electrical Safety Plan', 'Hi-Pot Test Plan'],
+    'Environmental': ['Environmental Stress Test', 'Thermal Analysis', 'Vibration and Shock Plan'],
+}
+_TEST_NAMES = {
+    'EMC': ['Radiated Emissions - 30MHz to 1GHz', 'Conducted Emissions - Mains', 'ESD Immunity',
+            'Electrical Fast Transient', 'Surge Immunity', 'Harmonic Current Emissions'],
+    'RF': ['RF Output Power Verification', 'Occupied Bandwidth', 'Spurious Emissions up to 6GHz',
+           'Frequency Stability', 'Receiver Blocking'],
+    'Safety': ['Dielectric Strength', 'Leakage Current', 'Ground Continuity', 'Temperature Rise',
+               'Flammability Review'],
+    'Environmental': ['Thermal Cycling - High Temp', 'Thermal Cycling - Low Temp', 'Damp Heat',
+                      'Random Vibration', 'Mechanical Shock'],
+}
+_ENGINEERS = ['John Doe', 'Jane Smith', 'Mike Johnson', 'Sarah Williams', 'Ravi Iyer',
+              'Anita Rao', 'Karan Mehta', 'Divya Menon']
+
+_REQUESTED_TESTS = ['EMC Testing', 'RF Testing', 'Safety Testing', 'Environmental Testing',
+                    'Certification']
+_REQUIREMENTS = ['CISPR 32 Class B, EN 301 489', 'FCC Part 15C, EN 62368-1 clauses 4/5',
+                 'IEC 61000-4-2/4/5, CISPR 15', 'IEC 60068-2-1/2/14', 'IS 13252, BIS CRS',
+                 'ETSI EN 300 328, EN 62311']
+_SAMPLE_NAMES = ['Main Unit', 'EVT boards', 'DVT units', 'Enclosure set', 'Power supply',
+                 'Cable assembly', 'Production units', 'PCB assembly']
+_DOC_CATEGORIES = ['Test Report', 'Certificate', 'Specification', 'Manual', 'Drawing', 'Other']
+_DOC_EXTENSIONS = {'Test Report': 'pdf', 'Certificate': 'pdf', 'Specification': 'xlsx',
+                   'Manual': 'docx', 'Drawing': 'pdf', 'Other': 'pdf'}
+_AUDIT_TYPES = ['Internal Audit', 'External Audit', 'Surveillance Audit', 'Compliance Audit',
+                'Process Audit']
+_DEPARTMENTS = ['Quality', 'Lab Operations', 'EMC Lab', 'RF Lab', 'Safety Lab', 'Calibration', 'All']
+_NCR_TITLES = [
+    ('Documentation', 'Test record missing reviewer signature'),
+    ('Process', 'Cable labeling missing in chamber setup'),
+    ('Equipment', 'Chamber ambient exceeded spec'),
+    ('Personnel', 'Technician not trained on updated SOP'),
+    ('Quality', 'Incorrect calibration file used'),
+    ('Safety', 'PPE not worn during hi-pot test'),
+    ('Other', 'Sample traceability label damaged'),
+]
+_CERT_TYPES = ['Quality Management', 'Environmental Management', 'Safety Management',
+               'Testing Accreditation', 'Calibration Accreditation', 'Other']
+_CERT_NAMES = {
+    'Quality Management': 'ISO 9001:2015', 'Environmental Management': 'ISO 14001:2015',
+    'Safety Management': 'ISO 45001:2018', 'Testing Accreditation': 'ISO/IEC 17025 - Testing',
+    'Calibration Accreditation': 'ISO/IEC 17025 - Calibration', 'Other': 'BIS Recognition',
+}
+_ISSUERS = ['NABL', 'TUV', 'BIS', 'UL', 'Intertek', 'Local Authority']
+
+
+def _pick(rng: np.random.Generator, size: int, weights: List[float]) -> np.ndarray:
+    """Draw category codes 0..len(weights)-1 with the given relative weights"""
+    p = np.asarray(weights, dtype=float)
+    return rng.choice(len(p), size=size, p=p / p.sum())
+
+
+def _labels(values: List[Any], codes: np.ndarray) -> List[Any]:
+    """Map category codes to their values"""
+    return np.asarray(values, dtype=object)[codes].tolist()
+
+
+def _business_time(rng: np.random.Generator, days: np.ndarray) -> np.ndarray:
+    """Get timestamps (epoch seconds) at a random minute of office hours on the given days"""
+    return days * DAY + rng.integers(9 * 60, 18 * 60, size=len(days)) * 60
+
+
+def _after(rng: np.random.Generator, seconds: np.ndarray, mean_days: float, limit: int) -> np.ndarray:
+    """Get timestamps an exponentially distributed delay after seconds, truncated at limit"""
+    # Inverse CDF of the exponential truncated to the time left, so nothing piles up at the limit
+    mean = mean_days * DAY
+    left = np.maximum(limit - seconds, 0)
+    delay = -mean * np.log1p(-rng.random(len(seconds)) * -np.expm1(-left / mean))
+    return (seconds + delay.astype(np.int64)) // 60 * 60
+
+
+def _timestamps(seconds: np.ndarray) -> List[datetime]:
+    """Convert epoch seconds to datetimes"""
+    return seconds.astype('datetime64[s]').tolist()
+
+
+def _dates(seconds: np.ndarray) -> List[date]:
+    """Convert epoch seconds to dates"""
+    return (seconds // DAY).astype('datetime64[D]').tolist()
+
+
+def _epoch_day(value: date) -> int:
+    """Get the number of days since the epoch for a date"""
+    return (value - date(1970, 1, 1)).days
+
+
+def _chunks(count: int, chunk_size: int) -> Iterator[Tuple[int, int]]:
+    """Split ids 1..count into [first, stop) ranges"""
+    for first in range(1, count + 1, chunk_size):
+        yield first, min(first + chunk_size, count + 1)
+
+
+def dataset_sizes(customers: int = 1000, projects: int = 5000, results: int = 100_000,
+                  **sizes: int) -> Dict[str, int]:
+    """Get the number of records generated for each collection (estimations follow RFQs)"""
+    unknown = set(sizes) - set(_SIZES)
+    if unknown:
+        raise ValueError(f"Unknown collection size: {', '.join(sorted(unknown))}")
+    counts = {'customers': customers, 'projects': projects, 'test_results': results}
+    base = {'customers': customers, 'projects': projects, 'results': results}
+    for name, (source, ratio) in _SIZES.items():
+        counts[name] = sizes.get(name, max(int(base[source] * ratio), 3 if base[source] else 0))
+    if not counts['customers'] and (counts['projects'] or counts['rfqs']):
+        raise ValueError("customers are required for projects and rfqs")
+    if not counts['projects'] and (counts['test_plans'] or counts['samples'] or counts['trfs']):
+        raise ValueError("projects are required for test plans, samples and trfs")
+    if not counts['test_plans'] and (counts['test_results'] or counts['test_executions']):
+        raise ValueError("test_plans are required for test results and executions")
+    return counts
+
+
+def iter_dataset(customers: int = 1000, projects: int = 5000, results: int = 100_000,
+                 seed: Optional[int] = None, start: Optional[date] = None, end: Optional[date] = None,
+                 chunk_size: int = 10_000, **sizes: int) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """Generate a dataset as (collection, records) chunks, parents before children
+
+    Records get IDs 1..n in each collection and creation dates spread between
+    start and end (default: the three years up to today). Pass a seed and an
+    explicit end date to get the same records on every run.
+    """
+    counts = dataset_sizes(customers, projects, results, **sizes)
+    rng = np.random.default_rng(seed)
+    end = end or date.today()
+    start = start or end - timedelta(days=3 * 365)
+    first_day, last_day = _epoch_day(start), _epoch_day(end)
+    today = last_day * DAY
+    horizon = today + DAY - 1
+
+    # Parent columns kept for the children that reference them
+    customer_names: List[str] = []
+    customer_created = np.empty(counts['customers'], dtype=np.int64)
+    rfq_customer = np.empty(counts['rfqs'], dtype=np.int64)
+    rfq_status = np.empty(counts['rfqs'], dtype=np.int64)
+    rfq_received = np.empty(counts['rfqs'], dtype=np.int64)
+    rfq_products: List[str] = []
+    project_names: List[str] = []
+    project_created = np.empty(counts['projects'], dtype=np.int64)
+    project_status = np.empty(counts['projects'], dtype=np.int64)
+    plan_project = np.empty(counts['test_plans'], dtype=np.int64)
+    plan_type = np.empty(counts['test_plans'], dtype=np.int64)
+    plan_created = np.empty(counts['test_plans'], dtype=np.int64)
+
+    def products(size: int) -> List[str]:
+        adjective = _labels(_PRODUCT_ADJECTIVES, rng.integers(len(_PRODUCT_ADJECTIVES), size=size))
+        device = _labels(_PRODUCT_DEVICES, rng.integers(len(_PRODUCT_DEVICES), size=size))
+        model = rng.integers(100, 1000, size=size).tolist()
+        return [f"{a} {d} X{m}" for a, d, m in zip(adjective, device, model)]
+
+    def people(size: int) -> List[str]:
+        first = _labels(_FIRST_NAMES, rng.integers(len(_FIRST_NAMES), size=size))
+        last = _labels(_LAST_NAMES, rng.integers(len(_LAST_NAMES), size=size))
+        return [f"{f} {l}" for f, l in zip(first, last)]
+
+    def growing(size: int) -> np.ndarray:
+        """Draw office-hours timestamps whose volume grows steadily over the date range"""
+        days = first_day + ((last_day - first_day + 1) * np.sqrt(rng.random(size))).astype(np.int64)
+        return _business_time(rng, np.minimum(days, last_day))
+
+    signups: Dict[str, np.ndarray] = {}
+
+    def signed_up(when: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Pick a customer who had signed up by each timestamp; returns (customer ids, timestamps)"""
+        if not signups:
+            signups['order'] = np.argsort(customer_created, kind='stable')
+            signups['created'] = customer_created[signups['order']]
+        available = np.maximum(np.searchsorted(signups['created'], when, side='right'), 1)
+        customer = signups['order'][(rng.random(len(when)) * available).astype(np.int64)] + 1
+        return customer, np.maximum(when, customer_created[customer - 1])
+
+    def customers_chunk(first: int, stop: int) -> List[Dict[str, Any]]:
+        ids = range(first, stop)
+        size = len(ids)
+        # Customer sign-ups grow over time
+        created = growing(size)
+        customer_created[first - 1:stop - 1] = created
+        prefix = _labels(_COMPANY_PREFIXES, rng.integers(len(_COMPANY_PREFIXES), size=size))
+        core = _labels(_COMPANY_CORES, rng.integers(len(_COMPANY_CORES), size=size))
+        suffix = _labels(_COMPANY_SUFFIXES, rng.integers(len(_COMPANY_SUFFIXES), size=size))
+        names = [f"{p} {c} {s}" for p, c, s in zip(prefix, core, suffix)]
+        customer_names.extend(names)
+        city = rng.integers(len(_CITIES), size=size).tolist()
+        street = rng.integers(1, 999, size=size).tolist()
+        area = _labels(_STREETS, rng.integers(len(_STREETS), size=size))
+        phone = rng.integers(7_000_000_000, 9_999_999_999, size=size).tolist()
+        status = _labels(['active', 'inactive'], _pick(rng, size, [0.88, 0.12]))
+        contact = people(size)
+        stamps = _timestamps(created)
+        records = []
+        for i, record_id in enumerate(ids):
+            town, state, code, pin = _CITIES[city[i]]
+            records.append({
+                'id': record_id,
+                'company_name': names[i],
+                'email': f"contact{record_id}@{prefix[i].lower()}{core[i].lower()}.com",
+                'contact_person': contact[i],
+                'phone': f"+91 {phone[i]}",
+                'address': f"{street[i]} {area[i]}, {town}, {state} {pin}{record_id % 1000:03d}",
+                'gst_number': f"{code:02d}AABC{prefix[i][0]}{record_id % 10000:04d}{core[i][0]}1Z{record_id % 10}",
+                'status': status[i],
+                'created_at': stamps[i],
+            })
+        return records
+
+    def rfqs_chunk(first: int, stop: int) -> List[Dict[str, Any]]:
+        ids = range(first, stop)
+        size = len(ids)
+        customer, received = signed_up(growing(size))
+        # Recent RFQs are still pending; older ones have been decided
+        age = (today - received) // DAY
+        status = np.where(age < 14, 0, _pick(rng, size, [0.05, 0.75, 0.2]))
+        rfq_customer[first - 1:stop - 1] = customer
+        rfq_status[first - 1:stop - 1] = status
+        rfq_received[first - 1:stop - 1] = received
+        product = products(size)
+        rfq_products.extend(product)
+        kind = _labels(_PROJECT_KINDS, rng.integers(len(_PROJECT_KINDS), size=size))
+        units = rng.integers(1, 8, size=size).tolist()
+        customer = customer.tolist()
+        return [{
+            'id': record_id,
+            'customer_id': customer[i],
+            'customer_name': customer_names[customer[i] - 1],
+            'product': product[i],
+            'description': f"{kind[i]} for {product[i]}",
+            'received_date': day,
+            'status': label,
+            'notes': f"{units[i]} unit(s) supplied for testing",
+        } for i, (record_id, day, label) in enumerate(zip(
+            ids, _dates(received), _labels(['pending', 'approved', 'rejected'], status)))]
+
+    def estimations() -> Iterator[List[Dict[str, Any]]]:
+        # Decided RFQs and about half of the pending ones have an estimation
+        rfq_ids = np.flatnonzero((rfq_status != 0) | (rng.random(len(rfq_status)) < 0.5)) + 1
+        next_id = 1
+        for offset in range(0, len(rfq_ids), chunk_size):
+            rfq = rfq_ids[offset:offset + chunk_size]
+            size = len(rfq)
+            created = _after(rng, rfq_received[rfq - 1], 3, horizon)
+            # approved RFQ -> approved quote, rejected -> rejected, pending -> draft or sent
+            status = np.select(
+                [rfq_status[rfq - 1] == 1, rfq_status[rfq - 1] == 2, rng.random(size) < 0.4],
+                [2, 3, 0], default=1,
+            )
+            pre_tests = rng.integers(2, 6, size=size)
+            pre_cycle = rng.integers(12, 19, size=size) * 1000.0
+            pre_cycles = rng.integers(1, 3, size=size)
+            comp_cycle = rng.integers(45, 61, size=size) * 500.0
+            comp_cycles = rng.integers(1, 4, size=size)
+            pre_total = pre_cycle * pre_cycles
+            comp_total = comp_cycle * comp_cycles
+            customer = rfq_customer[rfq - 1].tolist()
+            days = _dates(created)
+            labels = _labels(['draft', 'sent', 'approved', 'rejected'], status)
+            columns = [a.tolist() for a in (pre_tests, pre_cycle, pre_cycles, comp_cycle, comp_cycles,
+                                            pre_total, comp_total)]
+            rfq = rfq.tolist()
+            records = []
+            for i in range(size):
+                tests, cycle, cycles, c_cycle, c_cycles, p_total, c_total = (c[i] for c in columns)
+                records.append({
+                    'id': next_id + i,
+                    'rfq_id': rfq[i],
+                    'customer_id': customer[i],
+                    'customer_name': customer_names[customer[i] - 1],
+                    'product': rfq_products[rfq[i] - 1],
+                    'test_types': [f"Precompliance ({tests} tests)", 'Compliance (1 test)'],
+                    'total_cost': p_total + c_total,
+                    'status': labels[i],
+                    'created_at': days[i],
+                    'valid_until': days[i] + timedelta(days=30),
+                    'notes': '',
+                    'precompliance': {'num_tests': tests, 'cycle_cost': cycle,
+                                      'num_cycles': cycles, 'total_cost': p_total},
+                    'compliance': {'num_tests': 1, 'cycle_cost': c_cycle,
+                                   'num_cycles': c_cycles, 'total_cost': c_total},
+                })
+            next_id += size
+            yield records
+
+    def projects_chunk(first: int, stop: int) -> List[Dict[str, Any]]:
+        ids = range(first, stop)
+        size = len(ids)
+        client, created = signed_up(growing(size))
+        start_day = created // DAY + rng.integers(1, 15, size=size)
+        end_day = start_day + rng.integers(14, 61, size=size)
+        # Status follows the schedule: pending, active, completed, with some on hold
+        status = np.select([start_day * DAY > today, end_day * DAY < today], [0, 2], default=1)
+        status = np.where((status != 0) & (rng.random(size) < 0.06), 3, status)
+        project_created[first - 1:stop - 1] = created
+        project_status[first - 1:stop - 1] = status
+        kind = _labels(_PROJECT_KINDS, rng.integers(len(_PROJECT_KINDS), size=size))
+        product = products(size)
+        names = [f"{k} - {p}" for k, p in zip(kind, product)]
+        project_names.extend(names)
+        estimated = rng.integers(40, 300, size=size) * 500.0
+        actual = np.where(status == 2, np.round(estimated * rng.uniform(0.85, 1.1, size=size), -2), 0.0)
+        columns = [a.tolist() for a in (client, estimated, actual)]
+        labels = _labels(['pending', 'active', 'completed', 'on_hold'], status)
+        starts, ends = _dates(start_day * DAY), _dates(end_day * DAY)
+        stamps = _timestamps(created)
+        return [{
+            'id': record_id,
+            'code': f"PROJ-{stamps[i].year}-{record_id:03d}",
+            'name': names[i],
+            'client_id': columns[0][i],
+            'client_name': customer_names[columns[0][i] - 1],
+            'description': f"{kind[i]} for {product[i]}",
+            'status': labels[i],
+            'start_date': starts[i],
+            'end_date': ends[i],
+            'estimated_cost': columns[1][i],
+            'actual_cost': columns[2][i],
+            'created_at': stamps[i],
+        } for i, record_id in enumerate(ids)]
+
+    def test_plans_chunk(first: int, stop: int) -> List[Dict[str, Any]]:
+        ids = range(first, stop)
+        size = len(ids)
+        project = rng.integers(1, counts['projects'] + 1, size=size)
+        created = _after(rng, project_created[project - 1], 2, horizon)
+        test_type = _pick(rng, size, _TEST_TYPE_WEIGHTS)
+        plan_project[first - 1:stop - 1] = project
+        plan_type[first - 1:stop - 1] = test_type
+        plan_created[first - 1:stop - 1] = created
+        # Draft, InProgress, Completed, Approved, following the project's status
+        parent = project_status[project - 1]
+        status = np.select(
+            [parent == 2, parent == 0],
+            [2, np.where(rng.random(size) < 0.6, 0, 3)],
+            default=_pick(rng, size, [0.15, 0.45, 0.2, 0.2]),
+        )
+        planned_start = created // DAY + rng.integers(1, 10, size=size)
+        planned_end = planned_start + rng.integers(7, 30, size=size)
+        actual_start = planned_start + rng.integers(0, 3, size=size)
+        actual_end = planned_end + rng.integers(-3, 6, size=size)
+        engineer = rng.integers(len(_ENGINEERS), size=size).tolist()
+        variant = rng.integers(3, size=size).tolist()
+        types = _labels(_TEST_TYPES, test_type)
+        labels = _labels(['Draft', 'InProgress', 'Completed', 'Approved'], status)
+        project = project.tolist()
+        dates = [_dates(d * DAY) for d in (planned_start, planned_end, actual_start, actual_end)]
+        stamps = _timestamps(created)
+        return [{
+            'id': record_id,
+            'project_id': project[i],
+            'project_name': project_names[project[i] - 1],
+            'name': _PLAN_NAMES[types[i]][variant[i]],
+            'description': f"{types[i]} testing for {project_names[project[i] - 1]}",
+            'test_type': types[i],
+            'status': labels[i],
+            'assigned_engineer_id': engineer[i] + 1,
+            'assigned_engineer_name': _ENGINEERS[engineer[i]],
+            'planned_start_date': dates[0][i],
+            'planned_end_date': dates[1][i],
+            'actual_start_date': dates[2][i] if labels[i] in ('InProgress', 'Completed') else None,
+            'actual_end_date': dates[3][i] if labels[i] == 'Completed' else None,
+            'created_at': stamps[i],
+        } for i, record_id in enumerate(ids)]
+
+    def test_names(types: np.ndarray) -> List[str]:
+        pick = rng.random(len(types))
+        return [_TEST_NAMES[t][int(p * len(_TEST_NAMES[t]))] for t, p in zip(_labels(_TEST_TYPES, types), pick)]
+
+    def test_executions_chunk(first: int, stop: int) -> List[Dict[str, Any]]:
+        ids = range(first, stop)
+        size = len(ids)
+        plan = rng.integers(1, counts['test_plans'] + 1, size=size)
+        started = _after(rng, plan_created[plan - 1], 10, horizon)
+        ended = started + rng.integers(30, 8 * 60, size=size) * 60
+        # Executions still running or queued are the recent ones
+        status = np.where(ended < today - DAY, 0, _pick(rng, size, [0.2, 0.4, 0.4]))
+        passed = rng.random(size) < _PASS_RATES[plan_type[plan - 1]]
+        names = test_names(plan_type[plan - 1])
+        labels = _labels(['completed', 'running', 'pending'], status)
+        outcome = _labels(['Fail', 'Pass'], passed.astype(np.int64))
+        project = plan_project[plan - 1].tolist()
+        plan = plan.tolist()
+        starts, ends, stamps = _timestamps(started), _timestamps(ended), _timestamps(started - 600)
+        return [{
+            'id': record_id,
+            'test_plan_id': plan[i],
+            'project_id': project[i],
+            'project_name': project_names[project[i] - 1],
+            'test_name': names[i],
+            'status': labels[i],
+            'started_at': starts[i] if labels[i] != 'pending' else None,
+            'ended_at': ends[i] if labels[i] == 'completed' else None,
+            'result': outcome[i] if labels[i] == 'completed' else None,
+            'created_at': stamps[i],
+        } for i, record_id in enumerate(ids)]
+
+    def test_results_chunk(first: int, stop: int) -> List[Dict[str, Any]]:
+        ids = range(first, stop)
+        size = len(ids)
+        plan = rng.integers(1, counts['test_plans'] + 1, size=size)
+        created = _after(rng, plan_created[plan - 1], 14, horizon)
+        types = plan_type[plan - 1]
+        passed = rng.random(size) < _PASS_RATES[types]
+        names = test_names(types)
+        labels = _labels(_TEST_TYPES, types)
+        outcome = _labels(['Fail', 'Pass'], passed.astype(np.int64))
+        project = plan_project[plan - 1].tolist()
+        plan = plan.tolist()
+        stamps = _timestamps(created)
+        return [{
+            'id': record_id,
+            'test_name': names[i],
+            'test_type': labels[i],
+            'test_plan_id': plan[i],
+            'project_id': project[i],
+            'project_name': project_names[project[i] - 1],
+            'pass_fail': outcome[i],
+            'created_at': stamps[i],
+        } for i, record_id in enumerate(ids)]
+
+    def samples_chunk(first: int, stop: int) -> List[Dict[str, Any]]:
+        ids = range(first, stop)
+        size = len(ids)
+        project = rng.integers(1, counts['projects'] + 1, size=size)
+        created = _after(rng, project_created[project - 1], 4, horizon)
+        # received, in_testing, tested, returned, by the project's status
+        parent = project_status[project - 1]
+        status = np.select(
+            [parent == 2, parent == 0],
+            [np.where(rng.random(size) < 0.6, 3, 2), 0],
+            default=_pick(rng, size, [0.25, 0.5, 0.25]),
+        )
+        sample_type = _pick(rng, size, [0.55, 0.25, 0.12, 0.08])
+        quantity = rng.integers(1, 11, size=size).tolist()
+        name = _labels(_SAMPLE_NAMES, rng.integers(len(_SAMPLE_NAMES), size=size))
+        types = _labels(['Product', 'Component', 'Material', 'Other'], sample_type)
+        labels = _labels(['received', 'in_testing', 'tested', 'returned'], status)
+        project = project.tolist()
+        days, stamps = _dates(created), _timestamps(created)
+        return [{
+            'id': record_id,
+            'project_id': project[i],
+            'project_name': project_names[project[i] - 1],
+            'sample_number': f"SMP-{record_id:04d}",
+            'name': name[i],
+            'sample_type': types[i],
+            'quantity': quantity[i],
+            'status': labels[i],
+            'received_date': days[i],
+            'description': f"{quantity[i]} x {name[i].lower()} for {project_names[project[i] - 1]}",
+            'created_at': stamps[i],
+        } for i, record_id in enumerate(ids)]
+
+    def trfs_chunk(first: int, stop: int) -> List[Dict[str, Any]]:
+        ids = range(first, stop)
+        size = len(ids)
+        project = rng.integers(1, counts['projects'] + 1, size=size)
+        created = _after(rng, project_created[project - 1], 1, horizon)
+        parent = project_status[project - 1]
+        status = np.where(parent == 2, 4, _pick(rng, size, [0.15, 0.3, 0.45, 0.1]))
+        priority = _labels(['low', 'normal', 'high', 'urgent'], _pick(rng, size, [0.2, 0.55, 0.2, 0.05]))
+        # One to three requested tests, as bits of a mask over _REQUESTED_TESTS
+        mask = rng.random((size, len(_REQUESTED_TESTS))) < 0.35
+        mask[np.arange(size), rng.integers(len(_REQUESTED_TESTS), size=size)] = True
+        tests = [[t for t, wanted in zip(_REQUESTED_TESTS, row) if wanted] for row in mask.tolist()]
+        requirements = _labels(_REQUIREMENTS, rng.integers(len(_REQUIREMENTS), size=size))
+        labels = _labels(['draft', 'submitted', 'approved', 'rejected', 'completed'], status)
+        project = project.tolist()
+        stamps = _timestamps(created)
+        return [{
+            'id': record_id,
+            'project_id': project[i],
+            'project_name': project_names[project[i] - 1],
+            'trf_number': f"TRF-{stamps[i].year}-{record_id:04d}",
+            'requested_tests': tests[i],
+            'requirements': requirements[i],
+            'notes': '',
+            'status': labels[i],
+            'priority': priority[i],
+            'created_at': stamps[i],
+        } for i, record_id in enumerate(ids)]
+
+    def documents_chunk(first: int, stop: int) -> List[Dict[str, Any]]:
+        ids = range(first, stop)
+        size = len(ids)
+        project = rng.integers(1, counts['projects'] + 1, size=size) if counts['projects'] else None
+        if project is None:
+            uploaded = _business_time(rng, rng.integers(first_day, last_day + 1, size=size))
+            subject = ['Lab'] * size
+        else:
+            uploaded = _after(rng, project_created[project - 1], 30, horizon)
+            subject = [project_names[p - 1] for p in project.tolist()]
+        category = _labels(_DOC_CATEGORIES, _pick(rng, size, [0.45, 0.15, 0.15, 0.1, 0.1, 0.05]))
+        status = _labels(['draft', 'approved', 'archived'], _pick(rng, size, [0.25, 0.65, 0.1]))
+        major = rng.integers(0, 4, size=size).tolist()
+        minor = rng.integers(0, 10, size=size).tolist()
+        stamps = _timestamps(uploaded)
+        return [{
+            'id': record_id,
+            'name': f"{category[i]} - {subject[i]}",
+            'category': category[i],
+            'version': f"v{major[i] + 1}.{minor[i]}",
+            'status': status[i],
+            'description': f"{category[i]} for {subject[i]}",
+            'filename': f"DOC-{record_id:05d}.{_DOC_EXTENSIONS[category[i]]}",
+            'uploaded_at': stamps[i],
+        } for i, record_id in enumerate(ids)]
+
+    def audits_chunk(first: int, stop: int) -> List[Dict[str, Any]]:
+        ids = range(first, stop)
+        size = len(ids)
+        # Scheduled up to a quarter ahead; created a few weeks before the audit
+        scheduled = rng.integers(first_day, last_day + 91, size=size) * DAY
+        created = _business_time(rng, np.maximum(scheduled // DAY - rng.integers(7, 45, size=size), first_day))
+        status = np.where(scheduled > today, 0, _pick(rng, size, [0.0, 0.05, 0.8, 0.15]))
+        audit_type = _labels(_AUDIT_TYPES, _pick(rng, size, [0.4, 0.15, 0.15, 0.2, 0.1]))
+        department = _labels(_DEPARTMENTS, rng.integers(len(_DEPARTMENTS), size=size))
+        labels = _labels(['scheduled', 'in_progress', 'completed', 'pending_action'], status)
+        auditor = people(size)
+        days, stamps = _dates(scheduled), _timestamps(created)
+        return [{
+            'id': record_id,
+            'name': f"{audit_type[i]} - {department[i]} Q{(days[i].month - 1) // 3 + 1} {days[i].year}",
+            'audit_type': audit_type[i],
+            'auditor': auditor[i],
+            'scheduled_date': days[i],
+            'status': labels[i],
+            'department': department[i],
+            'scope': f"{audit_type[i]} of {department[i]} processes",
+            'findings': 'Minor observations recorded.' if labels[i] in ('completed', 'pending_action') else '',
+            'created_at': stamps[i],
+        } for i, record_id in enumerate(ids)]
+
+    def ncrs_chunk(first: int, stop: int) -> List[Dict[str, Any]]:
+        ids = range(first, stop)
+        size = len(ids)
+        detected = _business_time(rng, rng.integers(first_day, last_day + 1, size=size))
+        created = np.minimum(detected + rng.integers(10, 8 * 60, size=size) * 60, horizon)
+        age = (today - detected) // DAY
+        # Older NCRs have been worked through to closure
+        status = np.select(
+            [age < 14, age < 60],
+            [_pick(rng, size, [0.6, 0.4]), _pick(rng, size, [0.1, 0.3, 0.6]) + 1],
+            default=_pick(rng, size, [0.02, 0.03, 0.15, 0.8]),
+        )
+        severity = _labels(['minor', 'major', 'critical'], _pick(rng, size, [0.65, 0.28, 0.07]))
+        kind = rng.integers(len(_NCR_TITLES), size=size).tolist()
+        labels = _labels(['open', 'investigating', 'action_taken', 'closed'], status)
+        reporter = people(size)
+        days, stamps = _dates(detected), _timestamps(created)
+        records = []
+        for i, record_id in enumerate(ids):
+            category, title = _NCR_TITLES[kind[i]]
+            records.append({
+                'id': record_id,
+                'title': title,
+                'description': f"{title} (NCR-{record_id:05d})",
+                'severity': severity[i],
+                'category': category,
+                'status': labels[i],
+                'reported_by': reporter[i],
+                'detected_date': days[i],
+                'root_cause': 'Under investigation' if labels[i] in ('open', 'investigating') else 'Identified',
+                'corrective_action': '' if labels[i] == 'open' else 'Corrective action defined',
+                'created_at': stamps[i],
+            })
+        return records
+
+    def certifications_chunk(first: int, stop: int) -> List[Dict[str, Any]]:
+        ids = range(first, stop)
+        size = len(ids)
+        issued = rng.integers(first_day, last_day + 1, size=size)
+        expiry = issued + rng.choice([365, 2 * 365, 3 * 365], size=size) - 1
+        # Expired, renewals for those due within a quarter, otherwise mostly active
+        status = np.select(
+            [expiry * DAY < today, (expiry * DAY - today) < 91 * DAY],
+            [1, np.where(rng.random(size) < 0.5, 3, 0)],
+            default=np.where(rng.random(size) < 0.04, 2, 0),
+        )
+        cert_type = _labels(_CERT_TYPES, _pick(rng, size, [0.2, 0.1, 0.15, 0.3, 0.15, 0.1]))
+        issuer = _labels(_ISSUERS, rng.integers(len(_ISSUERS), size=size))
+        labels = _labels(['active', 'expired', 'suspended', 'pending_renewal'], status)
+        issue_days, expiry_days = _dates(issued * DAY), _dates(expiry * DAY)
+        stamps = _timestamps(issued * DAY + 10 * 3600)
+        return [{
+            'id': record_id,
+            'name': _CERT_NAMES[cert_type[i]],
+            'cert_type': cert_type[i],
+            'cert_number': f"CERT-{issue_days[i].year}-{record_id:05d}",
+            'issued_by': issuer[i],
+            'issue_date': issue_days[i],
+            'expiry_date': expiry_days[i],
+            'status': labels[i],
+            'scope': f"{cert_type[i]} scope of the laboratory",
+            'notes': '',
+            'created_at': stamps[i],
+        } for i, record_id in enumerate(ids)]
+
+    builders = {
+        'customers': customers_chunk, 'rfqs': rfqs_chunk, 'projects': projects_chunk,
+        'test_plans': test_plans_chunk, 'test_executions': test_executions_chunk,
+        'test_results': test_results_chunk, 'samples': samples_chunk, 'trfs': trfs_chunk,
+        'documents': documents_chunk, 'audits': audits_chunk, 'ncrs': ncrs_chunk,
+        'certifications': certifications_chunk,
+    }
+    for name in _ORDER:
+        if name == 'estimations':
+            for records in estimations():
+                yield name, records
+            continue
+        for first, stop in _chunks(counts[name], chunk_size):
+            yield name, builders[name](first, stop)
+
+
+def generate_dataset(customers: int = 1000, projects: int = 5000, results: int = 100_000,
+                     seed: Optional[int] = None, **options: Any) -> Dict[str, List[Dict[str, Any]]]:
+    """Generate a dataset for every collection, e.g. to pass to DataService.reset()
+
+    Accepts the same options as iter_dataset(); use that or load_dataset() to
+    stream large datasets instead.
+    """
+    data: Dict[str, List[Dict[str, Any]]] = {name: [] for name in COLLECTIONS}
+    for name, records in iter_dataset(customers, projects, results, seed, **options):
+        data[name].extend(records)
+    return data
+
+
+def load_dataset(storage, customers: int = 1000, projects: int = 5000, results: int = 100_000,
+                 seed: Optional[int] = None, **options: Any) -> Dict[str, int]:
+    """Replace all data in a storage backend with a generated dataset, streamed chunk by chunk
+
+    Returns the number of records loaded into each collection.
+    """
+    storage.load({name: [] for name in COLLECTIONS})
+    loaded = {name: 0 for name in COLLECTIONS}
+    for name, records in iter_dataset(customers, projects, results, seed, **options):
+        storage.insert_many(name, records)
+        loaded[name] += len(records)
+    return loaded
+
+
+if __name__ == '__main__':
+    from services.storage import MemoryStorage, SQLiteStorage
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--customers', type=int, default=1000)
+    parser.add_argument('--projects', type=int, default=5000)
+    parser.add_argument('--results', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--end', type=date.fromisoformat, default=None, help="last creation date (YYYY-MM-DD)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--sqlite', help="SQLite database to write")
+    target.add_argument('--snapshot', help="in-memory snapshot file to write")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    storage = SQLiteStorage(args.sqlite) if args.sqlite else MemoryStorage({})
+    loaded = load_dataset(storage, args.customers, args.projects, args.results, args.seed, end=args.end)
+    if args.snapshot:
+        storage.save_snapshot(args.snapshot)
+    for name, count in loaded.items():
+        print(f"{name:>16}: {count:,}")
+    print(f"Wrote {args.sqlite or args.snapshot} in {time.perf_counter() - started:.1f}s")
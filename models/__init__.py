@@ -2,11 +2,41 @@
 Data models for the Lab Management System
 """
 
+from .base import Record, MISSING
 from .customer import Customer
 from .project import Project
 from .test_plan import TestPlan
 from .rfq import RFQ
 from .estimation import Estimation
+from .test_execution import TestExecution
+from .test_result import TestResult
+from .sample import Sample
+from .trf import TRF
+from .document import Document
+from .audit import Audit
+from .ncr import NCR
+from .certification import Certification
 
-__all__ = ['Customer', 'Project', 'TestPlan', 'RFQ', 'Estimation']
+# Model used for each collection in typed storage mode
+MODELS = {
+    'customers': Customer,
+    'projects': Project,
+    'test_plans': TestPlan,
+    'rfqs': RFQ,
+    'estimations': Estimation,
+    'test_executions': TestExecution,
+    'test_results': TestResult,
+    'samples': Sample,
+    'trfs': TRF,
+    'documents': Document,
+    'audits': Audit,
+    'ncrs': NCR,
+    'certifications': Certification,
+}
 
+__all__ = [
+    'Record', 'MISSING', 'MODELS',
+    'Customer', 'Project', 'TestPlan', 'RFQ', 'Estimation',
+    'TestExecution', 'TestResult', 'Sample', 'TRF', 'Document',
+    'Audit', 'NCR', 'Certification',
+]
@@ -0,0 +1,23 @@
+"""
+Audit model
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Optional
+
+from .base import Record
+
+@dataclass(slots=True)
+class Audit(Record):
+    """Audit model"""
+    id: int
+    name: str
+    audit_type: Optional[str] = None
+    auditor: Optional[str] = None
+    scheduled_date: Optional[date] = None
+    status: str = 'scheduled'  # scheduled, in_progress, completed, pending_action
+    department: Optional[str] = None
+    scope: Optional[str] = None
+    findings: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.now)
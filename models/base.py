@@ -0,0 +1,142 @@
+"""
+Base class for typed records
+"""
+
+from collections.abc import MutableMapping
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Iterator, Optional
+
+
+class _Missing:
+    """Marker for fields the source dict did not have"""
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'MISSING'
+
+    def __reduce__(self):
+        return 'MISSING'
+
+
+MISSING = _Missing()
+
+# class -> (field names, set of field names)
+_FIELD_NAMES: Dict[type, tuple] = {}
+
+
+@dataclass(slots=True)
+class Record:
+    """Slotted dataclass record that can also be used like the dict it was built from
+
+    Fields the source dict did not have hold MISSING and read as absent, so
+    record.get('field', default) behaves as it does on a dict. Keys outside the
+    model are kept in an overflow dict.
+    """
+    _extra: Optional[Dict[str, Any]] = field(default=None, kw_only=True, repr=False, compare=False)
+
+    @classmethod
+    def _names(cls) -> tuple:
+        """Get the model's field names as a tuple and a set"""
+        names = _FIELD_NAMES.get(cls)
+        if names is None:
+            ordered = tuple(f.name for f in fields(cls) if f.name != '_extra')
+            names = _FIELD_NAMES[cls] = (ordered, frozenset(ordered))
+        return names
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Record':
+        """Build a record from a dict"""
+        ordered, known = cls._names()
+        extra = {key: value for key, value in data.items() if key not in known}
+        return cls(**{name: data.get(name, MISSING) for name in ordered}, _extra=extra or None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return dict(self.items())
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._names()[1]:
+            value = getattr(self, key)
+            if value is not MISSING:
+                return value
+        elif self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key in self._names()[1]:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+        if key in self._names()[1]:
+            setattr(self, key, MISSING)
+        else:
+            del self._extra[key]
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._names()[1]:
+            return getattr(self, key) is not MISSING
+        return bool(self._extra) and key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def keys(self):
+        """Get the keys that are set, model fields first"""
+        present = [name for name in self._names()[0] if getattr(self, name) is not MISSING]
+        return present + list(self._extra or ())
+
+    def items(self):
+        """Get (key, value) pairs of the keys that are set"""
+        return [(key, self[key]) for key in self.keys()]
+
+    def values(self):
+        """Get the values of the keys that are set"""
+        return [self[key] for key in self.keys()]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a value, or default if the key is not set"""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def update(self, other=(), **kwargs):
+        """Set several keys at once"""
+        pairs = other.items() if hasattr(other, 'items') else other
+        for key, value in pairs:
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        """Get a value, setting it to default first if the key is not set"""
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key: str, *default: Any) -> Any:
+        """Remove a key and return its value"""
+        if key not in self:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = self[key]
+        del self[key]
+        return value
+
+    def copy(self) -> Dict[str, Any]:
+        """Get a plain dict copy"""
+        return self.to_dict()
+
+
+MutableMapping.register(Record)
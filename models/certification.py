@@ -0,0 +1,24 @@
+"""
+Certification model
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Optional
+
+from .base import Record
+
+@dataclass(slots=True)
+class Certification(Record):
+    """Laboratory certification/accreditation model"""
+    id: int
+    name: str
+    cert_type: Optional[str] = None
+    cert_number: Optional[str] = None
+    issued_by: Optional[str] = None
+    issue_date: Optional[date] = None
+    expiry_date: Optional[date] = None
+    status: str = 'active'  # active, expired, suspended, pending_renewal
+    scope: Optional[str] = None
+    notes: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.now)
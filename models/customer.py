@@ -6,8 +6,10 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
-@dataclass
-class Customer:
+from .base import Record
+
+@dataclass(slots=True)
+class Customer(Record):
     """Customer/Client model"""
     id: int
     company_name: str
@@ -18,18 +20,3 @@ class Customer:
     gst_number: Optional[str] = None
     status: str = 'active'
     created_at: datetime = field(default_factory=datetime.now)
-    
-    def to_dict(self):
-        """Convert to dictionary"""
-        return {
-            'id': self.id,
-            'company_name': self.company_name,
-            'email': self.email,
-            'contact_person': self.contact_person,
-            'phone': self.phone,
-            'address': self.address,
-            'gst_number': self.gst_number,
-            'status': self.status,
-            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-        }
-
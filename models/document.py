@@ -0,0 +1,21 @@
+"""
+Document model
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from .base import Record
+
+@dataclass(slots=True)
+class Document(Record):
+    """Controlled document model"""
+    id: int
+    name: str
+    category: Optional[str] = None
+    version: str = 'v1.0'
+    status: str = 'draft'  # draft, approved, archived
+    description: Optional[str] = None
+    filename: Optional[str] = None
+    uploaded_at: datetime = field(default_factory=datetime.now)
@@ -0,0 +1,24 @@
+"""
+NCR (Non-Conformance Report) model
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Optional
+
+from .base import Record
+
+@dataclass(slots=True)
+class NCR(Record):
+    """NCR model"""
+    id: int
+    title: str
+    description: Optional[str] = None
+    severity: str = 'minor'  # minor, major, critical
+    category: Optional[str] = None
+    status: str = 'open'
+    reported_by: Optional[str] = None
+    detected_date: Optional[date] = None
+    root_cause: Optional[str] = None
+    corrective_action: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.now)
@@ -0,0 +1,24 @@
+"""
+Sample model
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Optional
+
+from .base import Record
+
+@dataclass(slots=True)
+class Sample(Record):
+    """Test sample model"""
+    id: int
+    project_id: int
+    project_name: str
+    sample_number: str
+    name: str
+    sample_type: str = 'Product'  # Product, Component, Material, Other
+    quantity: int = 1
+    status: str = 'received'  # received, in_testing, tested, returned
+    received_date: Optional[date] = None
+    description: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.now)
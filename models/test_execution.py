@@ -0,0 +1,23 @@
+"""
+Test Execution model
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from .base import Record
+
+@dataclass(slots=True)
+class TestExecution(Record):
+    """Test Execution model"""
+    id: int
+    test_plan_id: int
+    project_id: Optional[int] = None
+    project_name: Optional[str] = None
+    test_name: Optional[str] = None
+    status: str = 'pending'  # pending, running, completed
+    started_at: Optional[datetime] = None
+    ended_at: Optional[datetime] = None
+    result: Optional[str] = None  # PASS, FAIL
+    created_at: datetime = field(default_factory=datetime.now)
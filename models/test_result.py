@@ -0,0 +1,21 @@
+"""
+Test Result model
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from .base import Record
+
+@dataclass(slots=True)
+class TestResult(Record):
+    """Test Result model"""
+    id: int
+    test_name: Optional[str] = None
+    test_type: Optional[str] = None
+    test_plan_id: Optional[int] = None
+    project_id: Optional[int] = None
+    project_name: Optional[str] = None
+    pass_fail: Optional[str] = None  # Pass, Fail
+    created_at: datetime = field(default_factory=datetime.now)
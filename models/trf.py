@@ -0,0 +1,23 @@
+"""
+TRF (Test Request Form) model
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional, List
+
+from .base import Record
+
+@dataclass(slots=True)
+class TRF(Record):
+    """TRF model"""
+    id: int
+    project_id: int
+    project_name: str
+    trf_number: str
+    requested_tests: List[str] = field(default_factory=list)
+    requirements: Optional[str] = None
+    notes: Optional[str] = None
+    status: str = 'draft'  # draft, submitted, approved, rejected, completed
+    priority: str = 'normal'  # low, normal, high, urgent
+    created_at: datetime = field(default_factory=datetime.now)
@@ -13,8 +13,11 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from services.data_service import DataService
 from services.chart_service import ChartService
+from services.profiler import profile_page, section
+from components import performance_panel
 
 st.set_page_config(page_title="Dashboard", page_icon="📊", layout="wide")
+profile_page("Dashboard")
 
 # Initialize services
 ds = DataService()
@@ -25,10 +28,8 @@ st.title("📊 Dashboard")
 st.markdown("Real-time overview of your lab operations and key metrics")
 
 # Get statistics
+section("Statistics")
 stats = ds.get_dashboard_stats()
-projects = ds.get_all_projects()
-test_plans = ds.get_all_test_plans()
-test_results = ds.get_all_test_results()
 
 # KPI Metrics Row
 col1, col2, col3, col4 = st.columns(4)
@@ -94,6 +95,7 @@ with col4:
 st.markdown("---")
 
 # Charts Row
+section("Charts")
 col1, col2 = st.columns(2)
 
 with col1:
@@ -116,10 +118,7 @@ with col2:
     st.subheader("Test Plans by Type")
     
     # Test type distribution
-    test_types = {}
-    for tp in test_plans:
-        test_type = tp.get('test_type', 'Unknown')
-        test_types[test_type] = test_types.get(test_type, 0) + 1
+    test_types = ds.count_values('test_plans', 'test_type')
     
     if test_types:
         type_data = [{'type': k, 'count': v} for k, v in test_types.items()]
@@ -131,15 +130,17 @@ with col2:
 st.markdown("---")
 
 # Monthly Trends
+section("Monthly trends")
 st.subheader("📅 Monthly Trends")
 
 # Generate mock monthly data
+test_plan_status = ds.count_by('test_plans', 'status')
 months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun']
 monthly_data = []
 
 for i, month in enumerate(months):
-    projects_count = len([p for p in projects if p['status'] == 'active']) if i == len(months) - 1 else i + 1
-    tests_count = len([tp for tp in test_plans if tp['status'] == 'InProgress']) if i == len(months) - 1 else i * 2
+    projects_count = stats['active_projects'] if i == len(months) - 1 else i + 1
+    tests_count = test_plan_status.get('InProgress', 0) if i == len(months) - 1 else i * 2
     completed_count = stats['completed_tests'] if i == len(months) - 1 else i
     
     monthly_data.append({
@@ -155,12 +156,13 @@ st.plotly_chart(fig, width="stretch")
 st.markdown("---")
 
 # Recent Activities
+section("Recent activities")
 st.subheader("🔔 Recent Activities")
 
 activities = []
 
 # Get recent projects
-recent_projects = sorted(projects, key=lambda x: x.get('created_at', ''), reverse=True)[:3]
+recent_projects = ds.query('projects', order_by='created_at', descending=True, limit=3)
 for proj in recent_projects:
     activities.append({
         'type': 'Project',
@@ -170,7 +172,7 @@ for proj in recent_projects:
     })
 
 # Get recent test plans
-recent_plans = sorted(test_plans, key=lambda x: x.get('created_at', ''), reverse=True)[:3]
+recent_plans = ds.query('test_plans', order_by='created_at', descending=True, limit=3)
 for plan in recent_plans:
     activities.append({
         'type': 'Test Plan',
@@ -212,6 +214,7 @@ else:
     st.info("No recent activities")
 
 # Quick Actions
+section("Quick actions")
 st.markdown("---")
 st.subheader("⚡ Quick Actions")
 
@@ -237,3 +240,4 @@ with col4:
 st.markdown("---")
 st.caption(f"Last updated: {datetime.now().strftime('%B %d, %Y at %H:%M')}")
 
+performance_panel()
@@ -11,8 +11,11 @@ import pandas as pd
 sys.path.append(str(Path(__file__).parent.parent))
 
 from services.data_service import DataService
+from services.profiler import profile_page, section
+from components import performance_panel
 
 st.set_page_config(page_title="Customers", page_icon="👥", layout="wide")
+profile_page("Customers")
 
 # Initialize services
 ds = DataService()
@@ -29,6 +32,7 @@ with col3:
         st.session_state.show_add_customer = True
 
 # Add customer form
+section("Add form")
 if st.session_state.get('show_add_customer', False):
     with st.form("add_customer_form"):
         st.subheader("Add New Customer")
@@ -78,6 +82,7 @@ if st.session_state.get('show_add_customer', False):
 st.markdown("---")
 
 # Search and filter
+section("Search")
 col1, col2 = st.columns([3, 1])
 
 with col1:
@@ -86,33 +91,26 @@ with col1:
 with col2:
     status_filter = st.selectbox("Filter by Status", ["All", "active", "inactive"])
 
-# Get customers
-customers = ds.get_all_customers()
-
-# Apply filters
-if search_term:
-    customers = [c for c in customers if 
-                 search_term.lower() in c.get('company_name', '').lower() or
-                 search_term.lower() in c.get('email', '').lower() or
-                 search_term.lower() in c.get('contact_person', '').lower()]
-
-if status_filter != "All":
-    customers = [c for c in customers if c.get('status') == status_filter]
+# Get customers matching the filters, best search matches first
+customers = list(ds.query(
+    'customers',
+    where={'status': status_filter} if status_filter != "All" else None,
+    search=search_term or None,
+))
 
 # Display statistics
+section("Statistics")
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
     st.metric("Total Customers", len(ds.get_all_customers()))
 
 with col2:
-    active_customers = len([c for c in ds.get_all_customers() if c.get('status') == 'active'])
+    active_customers = ds.count_by('customers', 'status').get('active', 0)
     st.metric("Active Customers", active_customers)
 
 with col3:
-    # Count projects per customer
-    projects = ds.get_all_projects()
-    clients_with_projects = len(set([p['client_id'] for p in projects]))
+    clients_with_projects = ds.count_customers_with_projects()
     st.metric("Clients with Projects", clients_with_projects)
 
 with col4:
@@ -121,6 +119,7 @@ with col4:
 st.markdown("---")
 
 # Display customers
+section("Customer list")
 if customers:
     st.subheader(f"Customer List ({len(customers)} results)")
     
@@ -148,7 +147,7 @@ if customers:
                     st.warning("INACTIVE")
                 
                 # Count customer's projects
-                customer_projects = [p for p in ds.get_all_projects() if p['client_id'] == customer['id']]
+                customer_projects = ds.get_projects_by_customer(customer['id'])
                 st.info(f"**{len(customer_projects)}** Projects")
                 
                 if st.button("View Details", key=f"view_{customer['id']}", width="stretch"):
@@ -160,6 +159,7 @@ else:
     st.info("No customers found. Add your first customer to get started!")
 
 # Customer details in expander (if selected)
+section("Details")
 if st.session_state.get('selected_customer'):
     customer_id = st.session_state.selected_customer
     customer = ds.get_customer_by_id(customer_id)
@@ -185,7 +185,7 @@ if st.session_state.get('selected_customer'):
             
             # Show related projects
             st.markdown("#### Related Projects")
-            customer_projects = [p for p in ds.get_all_projects() if p['client_id'] == customer_id]
+            customer_projects = ds.get_projects_by_customer(customer_id)
             
             if customer_projects:
                 for proj in customer_projects:
@@ -201,3 +201,4 @@ if st.session_state.get('selected_customer'):
 st.markdown("---")
 st.caption("💡 Tip: Use the search box to quickly find customers. Click 'Add New Customer' to register a new client.")
 
+performance_panel()
@@ -11,9 +11,13 @@ from datetime import datetime
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent))
 
+from services import ConflictError
 from services.data_service import DataService
+from services.profiler import profile_page, section
+from components import performance_panel, shown_version
 
 st.set_page_config(page_title="RFQs", page_icon="📋", layout="wide")
+profile_page("RFQs")
 
 # Initialize services
 ds = DataService()
@@ -30,6 +34,7 @@ with col3:
         st.session_state.show_add_rfq = True
 
 # Add RFQ form
+section("Add form")
 if st.session_state.get('show_add_rfq', False):
     with st.form("add_rfq_form"):
         st.subheader("Add New RFQ")
@@ -68,7 +73,7 @@ if st.session_state.get('show_add_rfq', False):
                     'customer_name': customer['company_name'],
                     'product': product,
                     'description': description,
-                    'received_date': received_date.strftime('%Y-%m-%d'),
+                    'received_date': received_date,
                     'status': status,
                     'notes': notes,
                 }
@@ -86,28 +91,29 @@ if st.session_state.get('show_add_rfq', False):
 st.markdown("---")
 
 # Statistics
+section("Statistics")
 rfqs = ds.get_all_rfqs()
 
+rfq_status = ds.count_by('rfqs', 'status')
+
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
     st.metric("Total RFQs", len(rfqs))
 
 with col2:
-    pending = len([r for r in rfqs if r['status'] == 'pending'])
-    st.metric("Pending", pending)
+    st.metric("Pending", rfq_status.get('pending', 0))
 
 with col3:
-    approved = len([r for r in rfqs if r['status'] == 'approved'])
-    st.metric("Approved", approved)
+    st.metric("Approved", rfq_status.get('approved', 0))
 
 with col4:
-    rejected = len([r for r in rfqs if r['status'] == 'rejected'])
-    st.metric("Rejected", rejected)
+    st.metric("Rejected", rfq_status.get('rejected', 0))
 
 st.markdown("---")
 
 # Filters
+section("Filters")
 col1, col2 = st.columns([3, 1])
 
 with col1:
@@ -117,18 +123,14 @@ with col2:
     status_filter = st.selectbox("Filter by Status", ["All", "pending", "approved", "rejected"])
 
 # Apply filters
-filtered_rfqs = rfqs
-
-if search_term:
-    filtered_rfqs = [r for r in filtered_rfqs if 
-                     search_term.lower() in r.get('product', '').lower() or
-                     search_term.lower() in r.get('customer_name', '').lower() or
-                     search_term.lower() in r.get('description', '').lower()]
-
-if status_filter != "All":
-    filtered_rfqs = [r for r in filtered_rfqs if r['status'] == status_filter]
+filtered_rfqs = list(ds.query(
+    'rfqs',
+    where={'status': status_filter} if status_filter != "All" else None,
+    search=search_term or None,
+))
 
 # Display RFQs
+section("RFQ list")
 if filtered_rfqs:
     st.subheader(f"RFQ List ({len(filtered_rfqs)} results)")
     
@@ -166,19 +168,25 @@ if filtered_rfqs:
                         st.rerun()
                 
                 with col_b:
+                    version = shown_version(rfq, f"approve_{rfq['id']}")
                     if status == 'pending' and st.button("✓ Approve", key=f"approve_{rfq['id']}", width="stretch"):
-                        ds.update_rfq(rfq['id'], {'status': 'approved'})
-                        st.success("RFQ approved!")
-                        st.rerun()
+                        try:
+                            estimation = ds.approve_rfq(rfq['id'], expected_version=version)
+                        except ConflictError:
+                            st.error("This RFQ was changed by someone else. Review it and approve again.")
+                        else:
+                            st.success(f"RFQ approved! Estimation EST-{estimation['id']:04d} is ready to fill in.")
+                            st.rerun()
             
             st.markdown("---")
 else:
     st.info("No RFQs found matching your criteria")
 
 # RFQ details
+section("Details")
 if st.session_state.get('selected_rfq'):
     rfq_id = st.session_state.selected_rfq
-    rfq = next((r for r in rfqs if r['id'] == rfq_id), None)
+    rfq = ds.get_rfq_by_id(rfq_id)
     
     if rfq:
         with st.expander(f"📋 RFQ Details: #{rfq['id']:03d}", expanded=True):
@@ -206,11 +214,16 @@ if st.session_state.get('selected_rfq'):
                     st.switch_page("pages/04_💰_Estimations.py")
             
             with col2:
+                version = shown_version(rfq, "approve_rfq_details")
                 if rfq['status'] == 'pending':
                     if st.button("✓ Approve RFQ", width="stretch"):
-                        ds.update_rfq(rfq['id'], {'status': 'approved'})
-                        st.success("RFQ approved successfully!")
-                        st.rerun()
+                        try:
+                            estimation = ds.approve_rfq(rfq['id'], expected_version=version)
+                        except ConflictError:
+                            st.error("This RFQ was changed by someone else. Review it and approve again.")
+                        else:
+                            st.success(f"RFQ approved successfully! Estimation EST-{estimation['id']:04d} is ready to fill in.")
+                            st.rerun()
             
             with col3:
                 if st.button("Close Details"):
@@ -221,3 +234,4 @@ if st.session_state.get('selected_rfq'):
 st.markdown("---")
 st.caption("💡 Tip: Approve RFQs to create estimations and move forward with the project workflow.")
 
+performance_panel()
@@ -5,15 +5,18 @@ Estimations page - Cost estimation management
 import streamlit as st
 import sys
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import date, timedelta
 import pandas as pd
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from services.data_service import DataService
+from services.profiler import profile_page, section
+from components import performance_panel
 
 st.set_page_config(page_title="Estimations", page_icon="💰", layout="wide")
+profile_page("Estimations")
 
 # Initialize services
 ds = DataService()
@@ -39,6 +42,7 @@ with col3:
         st.session_state.show_add_estimation = True
 
 # Add estimation form
+section("Add form")
 if st.session_state.get('show_add_estimation', False):
     with st.form("add_estimation_form"):
         st.subheader("Create New Estimation")
@@ -141,7 +145,7 @@ if st.session_state.get('show_add_estimation', False):
         
         if submit:
             if selected_rfq and product:
-                valid_until = (datetime.now() + timedelta(days=valid_days)).strftime('%Y-%m-%d')
+                valid_until = date.today() + timedelta(days=valid_days)
                 
                 new_estimation = {
                     'rfq_id': selected_rfq['id'],
@@ -182,7 +186,9 @@ if st.session_state.get('show_add_estimation', False):
 st.markdown("---")
 
 # Statistics
+section("Statistics")
 estimations = ds.get_all_estimations()
+estimation_status = ds.count_by('estimations', 'status')
 
 col1, col2, col3, col4, col5, col6 = st.columns(6)
 
@@ -190,12 +196,10 @@ with col1:
     st.metric("Total Estimations", len(estimations))
 
 with col2:
-    draft_count = len([e for e in estimations if e['status'] == 'draft'])
-    st.metric("Draft", draft_count)
+    st.metric("Draft", estimation_status.get('draft', 0))
 
 with col3:
-    approved_count = len([e for e in estimations if e['status'] == 'approved'])
-    st.metric("Approved", approved_count)
+    st.metric("Approved", estimation_status.get('approved', 0))
 
 with col4:
     total_value = sum([e['total_cost'] for e in estimations if e['status'] == 'approved'])
@@ -222,6 +226,7 @@ with col6:
 st.markdown("---")
 
 # Display estimations
+section("Estimation list")
 if estimations:
     st.subheader(f"Estimation List ({len(estimations)} results)")
     
@@ -267,9 +272,10 @@ else:
     st.info("No estimations found. Create your first estimation from an RFQ!")
 
 # Estimation details
+section("Details")
 if st.session_state.get('selected_estimation'):
     est_id = st.session_state.selected_estimation
-    est = next((e for e in estimations if e['id'] == est_id), None)
+    est = ds.get_estimation_by_id(est_id)
     
     if est:
         with st.expander(f"💰 Estimation Details: EST-{est['id']:04d}", expanded=True):
@@ -365,6 +371,7 @@ if st.session_state.get('selected_estimation'):
                     st.rerun()
 
 # Rate chart reference
+section("Rate chart")
 with st.expander("📚 Rate Chart & Pricing Reference", expanded=False):
     st.markdown("### Testing Categories & 8hr Cycle Pricing")
     
@@ -470,3 +477,4 @@ with st.expander("📚 Rate Chart & Pricing Reference", expanded=False):
 st.markdown("---")
 st.caption("💡 Tip: Create estimations from approved RFQs. Once approved, convert them to projects.")
 
+performance_panel()
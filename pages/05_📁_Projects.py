@@ -12,8 +12,11 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from services.data_service import DataService
 from services.chart_service import ChartService
+from services.profiler import profile_page, section
+from components import performance_panel
 
 st.set_page_config(page_title="Projects", page_icon="📁", layout="wide")
+profile_page("Projects")
 
 # Initialize services
 ds = DataService()
@@ -31,6 +34,7 @@ with col3:
         st.session_state.show_add_project = True
 
 # Add project form
+section("Add form")
 if st.session_state.get('show_add_project', False):
     with st.form("add_project_form"):
         st.subheader("Create New Project")
@@ -75,8 +79,8 @@ if st.session_state.get('show_add_project', False):
                     'client_name': customer['company_name'],
                     'description': description,
                     'status': status,
-                    'start_date': start_date.strftime('%Y-%m-%d'),
-                    'end_date': end_date.strftime('%Y-%m-%d'),
+                    'start_date': start_date,
+                    'end_date': end_date,
                     'estimated_cost': estimated_cost,
                     'actual_cost': 0.0,
                 }
@@ -94,7 +98,9 @@ if st.session_state.get('show_add_project', False):
 st.markdown("---")
 
 # Statistics
+section("Statistics")
 projects = ds.get_all_projects()
+project_status = ds.count_by('projects', 'status')
 
 col1, col2, col3, col4 = st.columns(4)
 
@@ -102,12 +108,10 @@ with col1:
     st.metric("Total Projects", len(projects))
 
 with col2:
-    active = len([p for p in projects if p['status'] == 'active'])
-    st.metric("Active Projects", active)
+    st.metric("Active Projects", project_status.get('active', 0))
 
 with col3:
-    completed = len([p for p in projects if p['status'] == 'completed'])
-    st.metric("Completed", completed)
+    st.metric("Completed", project_status.get('completed', 0))
 
 with col4:
     total_value = sum([p.get('estimated_cost', 0) for p in projects if p['status'] == 'active'])
@@ -116,6 +120,7 @@ with col4:
 st.markdown("---")
 
 # Filters
+section("Filters")
 col1, col2, col3 = st.columns([2, 1, 1])
 
 with col1:
@@ -128,16 +133,11 @@ with col3:
     sort_by = st.selectbox("Sort by", ["Created Date", "Start Date", "Name"])
 
 # Apply filters
-filtered_projects = projects
-
-if search_term:
-    filtered_projects = [p for p in filtered_projects if 
-                        search_term.lower() in p.get('name', '').lower() or
-                        search_term.lower() in p.get('code', '').lower() or
-                        search_term.lower() in p.get('client_name', '').lower()]
-
-if status_filter != "All":
-    filtered_projects = [p for p in filtered_projects if p['status'] == status_filter]
+filtered_projects = list(ds.query(
+    'projects',
+    where={'status': status_filter} if status_filter != "All" else None,
+    search=search_term or None,
+))
 
 def display_project_card(project, ds):
     """Display a project card"""
@@ -199,6 +199,7 @@ def display_project_card(project, ds):
         st.markdown("---")
 
 # Display projects
+section("Project list")
 if filtered_projects:
     st.subheader(f"Project List ({len(filtered_projects)} results)")
     
@@ -219,6 +220,7 @@ else:
     st.info("No projects found matching your criteria")
 
 # Project details
+section("Details")
 if st.session_state.get('selected_project'):
     proj_id = st.session_state.selected_project
     project = ds.get_project_by_id(proj_id)
@@ -282,3 +284,4 @@ if st.session_state.get('selected_project'):
 st.markdown("---")
 st.caption("💡 Tip: Create test plans for your projects to track testing progress and results.")
 
+performance_panel()
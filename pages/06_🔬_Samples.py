@@ -12,8 +12,11 @@ import random
 sys.path.append(str(Path(__file__).parent.parent))
 
 from services.data_service import DataService
+from services.profiler import profile_page, section
+from components import paginate, performance_panel
 
 st.set_page_config(page_title="Samples", page_icon="🔬", layout="wide")
+profile_page("Samples")
 
 # Initialize services
 ds = DataService()
@@ -30,6 +33,7 @@ with col3:
         st.session_state.show_add_sample = True
 
 # Add sample form
+section("Add form")
 if st.session_state.get('show_add_sample', False):
     with st.form("add_sample_form"):
         st.subheader("Register New Sample")
@@ -78,7 +82,7 @@ if st.session_state.get('show_add_sample', False):
                     'sample_type': sample_type,
                     'quantity': quantity,
                     'status': status,
-                    'received_date': received_date.strftime('%Y-%m-%d'),
+                    'received_date': received_date,
                     'description': description,
                 }
                 ds.add_sample(new_sample)
@@ -95,32 +99,32 @@ if st.session_state.get('show_add_sample', False):
 st.markdown("---")
 
 # Statistics
-samples = ds.get_all_samples()
+section("Statistics")
+total_samples = ds.count('samples')
+sample_status = ds.count_by('samples', 'status')
 
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    st.metric("Total Samples", len(samples))
+    st.metric("Total Samples", total_samples)
 
 with col2:
-    in_testing = len([s for s in samples if s.get('status') == 'in_testing'])
-    st.metric("In Testing", in_testing)
+    st.metric("In Testing", sample_status.get('in_testing', 0))
 
 with col3:
-    tested = len([s for s in samples if s.get('status') == 'tested'])
-    st.metric("Tested", tested)
+    st.metric("Tested", sample_status.get('tested', 0))
 
 with col4:
-    received = len([s for s in samples if s.get('status') == 'received'])
-    st.metric("Received", received)
+    st.metric("Received", sample_status.get('received', 0))
 
 st.markdown("---")
 
 # Display samples
-if samples:
-    st.subheader(f"Sample List ({len(samples)} samples)")
+section("Sample list")
+if total_samples:
+    st.subheader(f"Sample List ({total_samples} samples)")
     
-    for sample in samples:
+    for sample in paginate(ds, 'samples', key='samples'):
         with st.container():
             col1, col2, col3 = st.columns([3, 2, 1])
             
@@ -145,7 +149,7 @@ if samples:
                 elif status == 'tested':
                     st.success("TESTED")
                 else:
-                    st.secondary("RETURNED")
+                    st.info("RETURNED")
                 
                 if st.button("View", key=f"view_sample_{sample['id']}", width="stretch"):
                     st.info(f"Sample details for {sample['sample_number']}")
@@ -157,3 +161,5 @@ else:
 # Footer
 st.markdown("---")
 st.caption("💡 Tip: Register samples when they arrive and update their status as testing progresses.")
+
+performance_panel()
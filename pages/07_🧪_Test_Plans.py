@@ -5,14 +5,19 @@ Test Plans page - Test planning and management
 import streamlit as st
 import sys
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+import pandas as pd
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent))
 
+from services import ConflictError
 from services.data_service import DataService
+from services.profiler import profile_page, section
+from components import performance_panel, shown_version
 
 st.set_page_config(page_title="Test Plans", page_icon="🧪", layout="wide")
+profile_page("Test Plans")
 
 # Initialize services
 ds = DataService()
@@ -29,6 +34,7 @@ with col3:
         st.session_state.show_add_test_plan = True
 
 # Add test plan form
+section("Add form")
 if st.session_state.get('show_add_test_plan', False):
     with st.form("add_test_plan_form"):
         st.subheader("Create New Test Plan")
@@ -79,8 +85,8 @@ if st.session_state.get('show_add_test_plan', False):
                     'test_type': test_type,
                     'status': status,
                     'assigned_engineer_name': engineer if engineer else 'Unassigned',
-                    'planned_start_date': planned_start.strftime('%Y-%m-%d'),
-                    'planned_end_date': planned_end.strftime('%Y-%m-%d'),
+                    'planned_start_date': planned_start,
+                    'planned_end_date': planned_end,
                 }
                 ds.add_test_plan(new_test_plan)
                 st.success(f"✅ Test plan '{test_plan_name}' created successfully!")
@@ -96,7 +102,9 @@ if st.session_state.get('show_add_test_plan', False):
 st.markdown("---")
 
 # Statistics
+section("Statistics")
 test_plans = ds.get_all_test_plans()
+test_plan_status = ds.count_by('test_plans', 'status')
 
 col1, col2, col3, col4 = st.columns(4)
 
@@ -104,20 +112,18 @@ with col1:
     st.metric("Total Test Plans", len(test_plans))
 
 with col2:
-    in_progress = len([tp for tp in test_plans if tp['status'] == 'InProgress'])
-    st.metric("In Progress", in_progress)
+    st.metric("In Progress", test_plan_status.get('InProgress', 0))
 
 with col3:
-    completed = len([tp for tp in test_plans if tp['status'] == 'Completed'])
-    st.metric("Completed", completed)
+    st.metric("Completed", test_plan_status.get('Completed', 0))
 
 with col4:
-    approved = len([tp for tp in test_plans if tp['status'] == 'Approved'])
-    st.metric("Approved", approved)
+    st.metric("Approved", test_plan_status.get('Approved', 0))
 
 st.markdown("---")
 
 # Filters
+section("Filters")
 col1, col2, col3 = st.columns([2, 1, 1])
 
 with col1:
@@ -130,26 +136,30 @@ with col3:
     status_filter = st.selectbox("Status", ["All", "Draft", "InProgress", "Completed", "Approved"])
 
 # Apply filters
-filtered_plans = test_plans
-
-if search_term:
-    filtered_plans = [tp for tp in filtered_plans if 
-                     search_term.lower() in tp.get('name', '').lower() or
-                     search_term.lower() in tp.get('project_name', '').lower()]
+plans_df = ds.get_frame('test_plans')
+mask = pd.Series(True, index=plans_df.index)
 
 if test_type_filter != "All":
-    filtered_plans = [tp for tp in filtered_plans if tp['test_type'] == test_type_filter]
+    mask &= plans_df['test_type'] == test_type_filter
 
 if status_filter != "All":
-    filtered_plans = [tp for tp in filtered_plans if tp['status'] == status_filter]
+    mask &= plans_df['status'] == status_filter
+
+if search_term:
+    # Keep the search ranking
+    matches = set(plans_df.loc[mask, 'id'])
+    filtered_plans = [tp for tp in ds.search('test_plans', search_term) if tp['id'] in matches]
+else:
+    filtered_plans = ds.get_many('test_plans', plans_df.loc[mask, 'id'])
 
 # Test plan details - Display prominently before the list if selected
+section("Details")
 if st.session_state.get('selected_test_plan'):
     st.markdown("---")
     st.markdown("## 📋 Test Plan Details")
     
     tp_id = st.session_state.selected_test_plan
-    tp = next((t for t in test_plans if t['id'] == tp_id), None)
+    tp = ds.get_test_plan_by_id(tp_id)
     
     if tp:
         # Get related data
@@ -192,13 +202,8 @@ if st.session_state.get('selected_test_plan'):
                 
                 # Calculate duration if dates are available
                 if tp.get('actual_start_date') and tp.get('actual_end_date'):
-                    try:
-                        start = datetime.strptime(tp['actual_start_date'], '%Y-%m-%d')
-                        end = datetime.strptime(tp['actual_end_date'], '%Y-%m-%d')
-                        duration = (end - start).days
-                        st.write(f"**Duration:** {duration} days")
-                    except:
-                        pass
+                    duration = (tp['actual_end_date'] - tp['actual_start_date']).days
+                    st.write(f"**Duration:** {duration} days")
             
             st.markdown("---")
             
@@ -325,24 +330,34 @@ if st.session_state.get('selected_test_plan'):
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
+                version = shown_version(tp, f"start_{tp_id}")
                 if tp['status'] == 'Draft':
                     if st.button("▶️ Start Test", key=f"start_{tp_id}", width="stretch"):
-                        ds.update_test_plan(tp['id'], {
-                            'status': 'InProgress',
-                            'actual_start_date': datetime.now().strftime('%Y-%m-%d')
-                        })
-                        st.success("Test plan started!")
-                        st.rerun()
+                        try:
+                            ds.update_test_plan(tp['id'], {
+                                'status': 'InProgress',
+                                'actual_start_date': date.today()
+                            }, expected_version=version)
+                        except ConflictError:
+                            st.error("This test plan was changed by someone else. Review it and start it again.")
+                        else:
+                            st.success("Test plan started!")
+                            st.rerun()
             
             with col2:
+                version = shown_version(tp, f"complete_{tp_id}")
                 if tp['status'] == 'InProgress':
                     if st.button("✅ Complete Test", key=f"complete_{tp_id}", width="stretch"):
-                        ds.update_test_plan(tp['id'], {
-                            'status': 'Completed',
-                            'actual_end_date': datetime.now().strftime('%Y-%m-%d')
-                        })
-                        st.success("Test plan completed!")
-                        st.rerun()
+                        try:
+                            ds.update_test_plan(tp['id'], {
+                                'status': 'Completed',
+                                'actual_end_date': date.today()
+                            }, expected_version=version)
+                        except ConflictError:
+                            st.error("This test plan was changed by someone else. Review it and complete it again.")
+                        else:
+                            st.success("Test plan completed!")
+                            st.rerun()
             
             with col3:
                 if st.button("⚗️ View Executions", key=f"executions_{tp_id}", width="stretch"):
@@ -361,6 +376,7 @@ if st.session_state.get('selected_test_plan'):
     st.markdown("---")
 
 # Display test plans
+section("Test plan list")
 if filtered_plans:
     st.subheader(f"Test Plan List ({len(filtered_plans)} results)")
     
@@ -402,3 +418,5 @@ else:
 # Footer
 st.markdown("---")
 st.caption("💡 Tip: Create test plans for projects to organize and track testing activities.")
+
+performance_panel()
@@ -11,8 +11,11 @@ from datetime import datetime
 sys.path.append(str(Path(__file__).parent.parent))
 
 from services.data_service import DataService
+from services.profiler import profile_page, section
+from components import paginate, performance_panel
 
 st.set_page_config(page_title="Test Executions", page_icon="⚗️", layout="wide")
+profile_page("Test Executions")
 
 # Initialize services
 ds = DataService()
@@ -22,28 +25,28 @@ st.title("⚗️ Test Executions")
 st.markdown("Monitor and manage test execution activities")
 
 # Statistics
-test_executions = ds.get_all_test_executions()
+section("Statistics")
+total_executions = ds.count('test_executions')
+execution_status = ds.count_by('test_executions', 'status')
 
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    st.metric("Total Executions", len(test_executions))
+    st.metric("Total Executions", total_executions)
 
 with col2:
-    running = len([te for te in test_executions if te.get('status') == 'running'])
-    st.metric("Running", running)
+    st.metric("Running", execution_status.get('running', 0))
 
 with col3:
-    completed = len([te for te in test_executions if te.get('status') == 'completed'])
-    st.metric("Completed", completed)
+    st.metric("Completed", execution_status.get('completed', 0))
 
 with col4:
-    pending = len([te for te in test_executions if te.get('status') == 'pending'])
-    st.metric("Pending", pending)
+    st.metric("Pending", execution_status.get('pending', 0))
 
 st.markdown("---")
 
 # Display available test plans
+section("Available test plans")
 st.subheader("Available Test Plans")
 st.markdown("Test plans that can be executed:")
 
@@ -73,11 +76,12 @@ else:
     st.info("No test plans available for execution. Create and approve test plans first.")
 
 # Display executions
+section("Execution list")
 st.markdown("---")
 st.subheader("Execution History")
 
-if test_executions:
-    for execution in test_executions:
+if total_executions:
+    for execution in paginate(ds, 'test_executions', key='executions'):
         with st.container():
             col1, col2, col3 = st.columns([3, 2, 1])
             
@@ -105,3 +109,5 @@ else:
 # Footer
 st.markdown("---")
 st.caption("💡 Tip: Execute approved test plans and track their progress here.")
+
+performance_panel()
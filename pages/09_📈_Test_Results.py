@@ -12,8 +12,11 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from services.data_service import DataService
 from services.chart_service import ChartService
+from services.profiler import profile_page, section
+from components import performance_panel
 
 st.set_page_config(page_title="Test Results", page_icon="📈", layout="wide")
+profile_page("Test Results")
 
 # Initialize services
 ds = DataService()
@@ -24,20 +27,23 @@ st.title("📈 Test Results")
 st.markdown("View and analyze test results")
 
 # Statistics
+section("Statistics")
 test_results = ds.get_all_test_results()
 test_executions = ds.get_all_test_executions() if hasattr(ds, "get_all_test_executions") else []
 
+result_counts = ds.count_by('test_results', 'pass_fail')
+passed = result_counts.get('Pass', 0)
+failed = result_counts.get('Fail', 0)
+
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
     st.metric("Total Results", len(test_results))
 
 with col2:
-    passed = len([tr for tr in test_results if tr.get('pass_fail') == 'Pass'])
     st.metric("Passed", passed)
 
 with col3:
-    failed = len([tr for tr in test_results if tr.get('pass_fail') == 'Fail'])
     st.metric("Failed", failed)
 
 with col4:
@@ -50,6 +56,7 @@ with col4:
 st.markdown("---")
 
 # Results visualization
+section("Charts")
 if test_results:
     col1, col2 = st.columns(2)
     
@@ -65,15 +72,7 @@ if test_results:
     
     with col2:
         st.subheader("Results by Test Type")
-        type_results = {}
-        for tr in test_results:
-            test_type = tr.get('test_type', 'Unknown')
-            if test_type not in type_results:
-                type_results[test_type] = {'passed': 0, 'failed': 0}
-            if tr.get('pass_fail') == 'Pass':
-                type_results[test_type]['passed'] += 1
-            else:
-                type_results[test_type]['failed'] += 1
+        type_results = ds.get_results_by_test_type()
         
         if type_results:
             type_data = [{'type': k, 'passed': v['passed'], 'failed': v['failed']} 
@@ -113,6 +112,7 @@ st.markdown("---")
 st.caption("💡 Tip: Test results are automatically recorded when test executions are completed.")
 
 # Recent executions (if any)
+section("Recent executions")
 if test_executions:
     st.subheader("Recent Test Executions")
     for execn in test_executions[:5]:
@@ -133,3 +133,5 @@ if test_executions:
                 else:
                     st.info(res)
         st.markdown("---")
+
+performance_panel()
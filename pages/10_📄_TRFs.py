@@ -6,13 +6,17 @@ import streamlit as st
 import sys
 from pathlib import Path
 from datetime import datetime
+import pandas as pd
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from services.data_service import DataService
+from services.profiler import profile_page, section
+from components import performance_panel
 
 st.set_page_config(page_title="TRFs", page_icon="📄", layout="wide")
+profile_page("TRFs")
 
 # Initialize services
 ds = DataService()
@@ -29,6 +33,7 @@ with col3:
         st.session_state.show_add_trf = True
 
 # Add TRF form
+section("Add form")
 if st.session_state.get('show_add_trf', False):
     with st.form("add_trf_form"):
         st.subheader("Create New TRF")
@@ -97,7 +102,9 @@ if st.session_state.get('show_add_trf', False):
 st.markdown("---")
 
 # Statistics
+section("Statistics")
 trfs = ds.get_all_trfs()
+trf_status = ds.count_by('trfs', 'status')
 
 col1, col2, col3, col4 = st.columns(4)
 
@@ -105,20 +112,19 @@ with col1:
     st.metric("Total TRFs", len(trfs))
 
 with col2:
-    pending = len([t for t in trfs if t.get('status') in ['draft', 'submitted']])
+    pending = trf_status.get('draft', 0) + trf_status.get('submitted', 0)
     st.metric("Pending", pending)
 
 with col3:
-    approved = len([t for t in trfs if t.get('status') == 'approved'])
-    st.metric("Approved", approved)
+    st.metric("Approved", trf_status.get('approved', 0))
 
 with col4:
-    completed = len([t for t in trfs if t.get('status') == 'completed'])
-    st.metric("Completed", completed)
+    st.metric("Completed", trf_status.get('completed', 0))
 
 st.markdown("---")
 
 # Display TRFs
+section("TRF list")
 if trfs:
     st.subheader(f"TRF List ({len(trfs)} TRFs)")
     
@@ -129,21 +135,19 @@ if trfs:
     selected_priority = st.selectbox("Filter by Priority", priorities)
     search_term = st.text_input("Search", placeholder="Search by TRF number, project, or test...")
     
-    filtered = trfs
+    trfs_df = ds.get_frame('trfs')
+    mask = pd.Series(True, index=trfs_df.index)
     if selected_status != "All":
-        filtered = [t for t in filtered if t.get('status') == selected_status]
+        mask &= trfs_df['status'] == selected_status
     if selected_priority != "All":
-        filtered = [t for t in filtered if t.get('priority') == selected_priority]
-    if search_term:
-        s = search_term.lower()
-        filtered = [
-            t for t in filtered
-            if s in t.get('trf_number', '').lower()
-            or s in t.get('project_name', '').lower()
-            or any(s in test.lower() for test in t.get('requested_tests', []))
-        ]
+        mask &= trfs_df['priority'] == selected_priority
     
-    trfs = filtered
+    if search_term:
+        # Keep the search ranking
+        matches = set(trfs_df.loc[mask, 'id'])
+        trfs = [t for t in ds.search('trfs', search_term) if t['id'] in matches]
+    else:
+        trfs = ds.get_many('trfs', trfs_df.loc[mask, 'id'])
     
     for trf in trfs:
         with st.container():
@@ -182,3 +186,4 @@ else:
 st.markdown("---")
 st.caption("💡 Tip: TRFs are used to formally request tests and track approval workflows.")
 
+performance_panel()
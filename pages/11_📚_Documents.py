@@ -6,13 +6,17 @@ import streamlit as st
 import sys
 from pathlib import Path
 from datetime import datetime
+import pandas as pd
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from services.data_service import DataService
+from services.profiler import profile_page, section
+from components import performance_panel
 
 st.set_page_config(page_title="Documents", page_icon="📚", layout="wide")
+profile_page("Documents")
 
 # Initialize services
 ds = DataService()
@@ -29,6 +33,7 @@ with col3:
         st.session_state.show_upload_doc = True
 
 # Upload document form
+section("Upload form")
 if st.session_state.get('show_upload_doc', False):
     with st.form("upload_doc_form"):
         st.subheader("Upload New Document")
@@ -79,7 +84,9 @@ if st.session_state.get('show_upload_doc', False):
 st.markdown("---")
 
 # Statistics
+section("Statistics")
 documents = ds.get_all_documents()
+document_categories = ds.count_by('documents', 'category')
 
 col1, col2, col3, col4 = st.columns(4)
 
@@ -87,40 +94,40 @@ with col1:
     st.metric("Total Documents", len(documents))
 
 with col2:
-    reports = len([d for d in documents if d.get('category') == 'Test Report'])
-    st.metric("Test Reports", reports)
+    st.metric("Test Reports", document_categories.get('Test Report', 0))
 
 with col3:
-    certificates = len([d for d in documents if d.get('category') == 'Certificate'])
-    st.metric("Certificates", certificates)
+    st.metric("Certificates", document_categories.get('Certificate', 0))
 
 with col4:
-    approved = len([d for d in documents if d.get('status') == 'approved'])
-    st.metric("Approved", approved)
+    st.metric("Approved", ds.count_by('documents', 'status').get('approved', 0))
 
 st.markdown("---")
 
 # Display documents
+section("Document list")
 if documents:
     st.subheader(f"Document Library ({len(documents)} documents)")
     
     # Filters
-    categories = sorted(list(set([d.get('category', 'Other') for d in documents])))
+    categories = sorted(document_categories)
     selected_category = st.selectbox("Filter by Category", ["All"] + categories)
     selected_status = st.selectbox("Filter by Status", ["All", "draft", "approved", "archived"])
     search_term = st.text_input("Search", placeholder="Search by name or description...")
     
-    filtered_docs = documents
+    docs_df = ds.get_frame('documents')
+    mask = pd.Series(True, index=docs_df.index)
     if selected_category != "All":
-        filtered_docs = [d for d in filtered_docs if d.get('category') == selected_category]
+        mask &= docs_df['category'] == selected_category
     if selected_status != "All":
-        filtered_docs = [d for d in filtered_docs if d.get('status') == selected_status]
+        mask &= docs_df['status'] == selected_status
+    
     if search_term:
-        s = search_term.lower()
-        filtered_docs = [
-            d for d in filtered_docs
-            if s in d.get('name', '').lower() or s in d.get('description', '').lower()
-        ]
+        # Keep the search ranking
+        matches = set(docs_df.loc[mask, 'id'])
+        filtered_docs = [d for d in ds.search('documents', search_term) if d['id'] in matches]
+    else:
+        filtered_docs = ds.get_many('documents', docs_df.loc[mask, 'id'])
     
     for doc in filtered_docs:
         with st.container():
@@ -157,3 +164,4 @@ else:
 st.markdown("---")
 st.caption("💡 Tip: Upload test reports, certificates, and other important documents for easy access.")
 
+performance_panel()
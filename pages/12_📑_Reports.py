@@ -13,8 +13,11 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from services.data_service import DataService
 from services.chart_service import ChartService
+from services.profiler import profile_page, section
+from components import performance_panel
 
 st.set_page_config(page_title="Reports", page_icon="📑", layout="wide")
+profile_page("Reports")
 
 # Initialize services
 ds = DataService()
@@ -25,6 +28,7 @@ st.title("📑 Reports")
 st.markdown("Generate comprehensive reports and analytics")
 
 # Report generation section
+section("Report generation")
 st.subheader("📊 Generate New Report")
 
 col1, col2, col3 = st.columns(3)
@@ -64,6 +68,7 @@ if st.button("🔄 Generate Report", width="stretch"):
 st.markdown("---")
 
 # Quick Statistics Dashboard
+section("Quick statistics")
 st.subheader("📈 Quick Statistics")
 
 stats = ds.get_dashboard_stats()
@@ -85,6 +90,7 @@ with col4:
 st.markdown("---")
 
 # Project Performance Report
+section("Project performance")
 st.subheader("📊 Project Performance")
 
 projects = ds.get_all_projects()
@@ -120,16 +126,14 @@ else:
 st.markdown("---")
 
 # Test Plans Summary
+section("Test plans summary")
 st.subheader("🧪 Test Plans Summary")
 
 test_plans = ds.get_all_test_plans()
 
 if test_plans:
     # Status distribution
-    status_counts = {}
-    for tp in test_plans:
-        status = tp['status']
-        status_counts[status] = status_counts.get(status, 0) + 1
+    status_counts = ds.count_by('test_plans', 'status')
     
     col1, col2 = st.columns(2)
     
@@ -140,10 +144,7 @@ if test_plans:
     
     with col2:
         # Type distribution
-        type_counts = {}
-        for tp in test_plans:
-            test_type = tp['test_type']
-            type_counts[test_type] = type_counts.get(test_type, 0) + 1
+        type_counts = ds.count_values('test_plans', 'test_type')
         
         type_data = [{'type': k, 'count': v} for k, v in type_counts.items()]
         fig = cs.create_bar_chart(type_data, 'type', 'count', 'Test Plans by Type', '#10b981')
@@ -154,6 +155,7 @@ else:
 st.markdown("---")
 
 # Customer Summary
+section("Customer summary")
 st.subheader("👥 Customer Summary")
 
 customers = ds.get_all_customers()
@@ -167,7 +169,7 @@ if customers:
         
         with col2:
             # Count customer projects
-            customer_projects = [p for p in projects if p['client_id'] == customer['id']]
+            customer_projects = ds.get_projects_by_customer(customer['id'])
             st.markdown(f"{len(customer_projects)} projects")
         
         with col3:
@@ -178,6 +180,7 @@ else:
     st.info("No customer data available")
 
 # Report History (mock)
+section("Report history")
 st.subheader("📜 Report History")
 
 report_history = [
@@ -206,3 +209,4 @@ for report in report_history:
 st.markdown("---")
 st.caption("💡 Tip: Generate reports regularly to track progress and make data-driven decisions.")
 
+performance_panel()
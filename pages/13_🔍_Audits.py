@@ -11,8 +11,11 @@ from datetime import datetime, timedelta
 sys.path.append(str(Path(__file__).parent.parent))
 
 from services.data_service import DataService
+from services.profiler import profile_page, section
+from components import paginate, performance_panel
 
 st.set_page_config(page_title="Audits", page_icon="🔍", layout="wide")
+profile_page("Audits")
 
 # Initialize services
 ds = DataService()
@@ -29,6 +32,7 @@ with col3:
         st.session_state.show_add_audit = True
 
 # Add audit form
+section("Add form")
 if st.session_state.get('show_add_audit', False):
     with st.form("add_audit_form"):
         st.subheader("Schedule New Audit")
@@ -66,7 +70,7 @@ if st.session_state.get('show_add_audit', False):
                     'name': audit_name,
                     'audit_type': audit_type,
                     'auditor': auditor,
-                    'scheduled_date': scheduled_date.strftime('%Y-%m-%d'),
+                    'scheduled_date': scheduled_date,
                     'status': status,
                     'department': department,
                     'scope': scope,
@@ -86,32 +90,32 @@ if st.session_state.get('show_add_audit', False):
 st.markdown("---")
 
 # Statistics
-audits = ds.get_all_audits()
+section("Statistics")
+total_audits = ds.count('audits')
+audit_status = ds.count_by('audits', 'status')
 
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    st.metric("Total Audits", len(audits))
+    st.metric("Total Audits", total_audits)
 
 with col2:
-    scheduled = len([a for a in audits if a.get('status') == 'scheduled'])
-    st.metric("Scheduled", scheduled)
+    st.metric("Scheduled", audit_status.get('scheduled', 0))
 
 with col3:
-    in_progress = len([a for a in audits if a.get('status') == 'in_progress'])
-    st.metric("In Progress", in_progress)
+    st.metric("In Progress", audit_status.get('in_progress', 0))
 
 with col4:
-    completed = len([a for a in audits if a.get('status') == 'completed'])
-    st.metric("Completed", completed)
+    st.metric("Completed", audit_status.get('completed', 0))
 
 st.markdown("---")
 
 # Display audits
-if audits:
-    st.subheader(f"Audit List ({len(audits)} audits)")
+section("Audit list")
+if total_audits:
+    st.subheader(f"Audit List ({total_audits} audits)")
     
-    for audit in audits:
+    for audit in paginate(ds, 'audits', key='audits'):
         with st.container():
             col1, col2, col3 = st.columns([3, 2, 1])
             
@@ -145,11 +149,13 @@ else:
     st.info("No audits scheduled. Schedule your first audit to ensure compliance!")
 
 # Upcoming audits reminder
-upcoming = [a for a in audits if a.get('status') == 'scheduled']
+section("Reminders")
+upcoming = audit_status.get('scheduled', 0)
 if upcoming:
-    st.info(f"📅 You have {len(upcoming)} upcoming audit(s) scheduled.")
+    st.info(f"📅 You have {upcoming} upcoming audit(s) scheduled.")
 
 # Footer
 st.markdown("---")
 st.caption("💡 Tip: Regular audits help maintain compliance and identify areas for improvement.")
 
+performance_panel()
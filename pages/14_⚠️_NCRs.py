@@ -11,8 +11,11 @@ from datetime import datetime
 sys.path.append(str(Path(__file__).parent.parent))
 
 from services.data_service import DataService
+from services.profiler import profile_page, section
+from components import paginate, performance_panel
 
 st.set_page_config(page_title="NCRs", page_icon="⚠️", layout="wide")
+profile_page("NCRs")
 
 # Initialize services
 ds = DataService()
@@ -29,6 +32,7 @@ with col3:
         st.session_state.show_add_ncr = True
 
 # Add NCR form
+section("Add form")
 if st.session_state.get('show_add_ncr', False):
     with st.form("add_ncr_form"):
         st.subheader("Create New NCR")
@@ -77,7 +81,7 @@ if st.session_state.get('show_add_ncr', False):
                     'category': category,
                     'status': status,
                     'reported_by': reported_by,
-                    'detected_date': detected_date.strftime('%Y-%m-%d'),
+                    'detected_date': detected_date,
                     'root_cause': root_cause,
                     'corrective_action': corrective_action,
                 }
@@ -95,32 +99,32 @@ if st.session_state.get('show_add_ncr', False):
 st.markdown("---")
 
 # Statistics
-ncrs = ds.get_all_ncrs()
+section("Statistics")
+total_ncrs = ds.count('ncrs')
+ncr_status = ds.count_by('ncrs', 'status')
 
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    st.metric("Total NCRs", len(ncrs))
+    st.metric("Total NCRs", total_ncrs)
 
 with col2:
-    open_ncrs = len([n for n in ncrs if n.get('status') == 'open'])
-    st.metric("Open", open_ncrs)
+    st.metric("Open", ncr_status.get('open', 0))
 
 with col3:
-    critical = len([n for n in ncrs if n.get('severity') == 'critical'])
-    st.metric("Critical", critical)
+    st.metric("Critical", ds.count_by('ncrs', 'severity').get('critical', 0))
 
 with col4:
-    closed = len([n for n in ncrs if n.get('status') == 'closed'])
-    st.metric("Closed", closed)
+    st.metric("Closed", ncr_status.get('closed', 0))
 
 st.markdown("---")
 
 # Display NCRs
-if ncrs:
-    st.subheader(f"NCR List ({len(ncrs)} NCRs)")
+section("NCR list")
+if total_ncrs:
+    st.subheader(f"NCR List ({total_ncrs} NCRs)")
     
-    for ncr in ncrs:
+    for ncr in paginate(ds, 'ncrs', key='ncrs'):
         with st.container():
             col1, col2, col3 = st.columns([3, 2, 1])
             
@@ -152,11 +156,14 @@ else:
     st.info("No NCRs recorded. This is good news!")
 
 # Critical NCRs alert
-critical_ncrs = [n for n in ncrs if n.get('severity') == 'critical' and n.get('status') != 'closed']
+section("Critical alert")
+ncrs_df = ds.get_frame('ncrs')
+critical_ncrs = int(((ncrs_df['severity'] == 'critical') & (ncrs_df['status'] != 'closed')).sum())
 if critical_ncrs:
-    st.error(f"⚠️ Attention: {len(critical_ncrs)} critical NCR(s) require immediate action!")
+    st.error(f"⚠️ Attention: {critical_ncrs} critical NCR(s) require immediate action!")
 
 # Footer
 st.markdown("---")
 st.caption("💡 Tip: Document non-conformances promptly and implement corrective actions to prevent recurrence.")
 
+performance_panel()
@@ -5,14 +5,17 @@ Certifications page - Certification management
 import streamlit as st
 import sys
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from services.data_service import DataService
+from services.profiler import profile_page, section
+from components import performance_panel
 
 st.set_page_config(page_title="Certifications", page_icon="🏆", layout="wide")
+profile_page("Certifications")
 
 # Initialize services
 ds = DataService()
@@ -29,6 +32,7 @@ with col3:
         st.session_state.show_add_cert = True
 
 # Add certification form
+section("Add form")
 if st.session_state.get('show_add_cert', False):
     with st.form("add_cert_form"):
         st.subheader("Add New Certification")
@@ -69,8 +73,8 @@ if st.session_state.get('show_add_cert', False):
                     'cert_type': cert_type,
                     'cert_number': cert_number,
                     'issued_by': issued_by,
-                    'issue_date': issue_date.strftime('%Y-%m-%d'),
-                    'expiry_date': expiry_date.strftime('%Y-%m-%d'),
+                    'issue_date': issue_date,
+                    'expiry_date': expiry_date,
                     'status': status,
                     'scope': scope,
                     'notes': notes,
@@ -89,7 +93,9 @@ if st.session_state.get('show_add_cert', False):
 st.markdown("---")
 
 # Statistics
+section("Statistics")
 certifications = ds.get_all_certifications()
+certification_status = ds.count_by('certifications', 'status')
 
 col1, col2, col3, col4 = st.columns(4)
 
@@ -97,30 +103,21 @@ with col1:
     st.metric("Total Certifications", len(certifications))
 
 with col2:
-    active = len([c for c in certifications if c.get('status') == 'active'])
-    st.metric("Active", active)
+    st.metric("Active", certification_status.get('active', 0))
 
 with col3:
     # Calculate expiring soon (within 90 days)
-    expiring_soon = 0
-    today = datetime.now()
-    for cert in certifications:
-        if cert.get('expiry_date'):
-            try:
-                expiry = datetime.strptime(cert['expiry_date'], '%Y-%m-%d')
-                if 0 <= (expiry - today).days <= 90:
-                    expiring_soon += 1
-            except:
-                pass
-    st.metric("Expiring Soon", expiring_soon)
+    today = date.today()
+    expiring = ds.get_by_date_range('certifications', 'expiry_date', today, today + timedelta(days=91))
+    st.metric("Expiring Soon", len(expiring))
 
 with col4:
-    expired = len([c for c in certifications if c.get('status') == 'expired'])
-    st.metric("Expired", expired)
+    st.metric("Expired", certification_status.get('expired', 0))
 
 st.markdown("---")
 
 # Display certifications
+section("Certification list")
 if certifications:
     st.subheader(f"Certification List ({len(certifications)} certifications)")
     
@@ -140,18 +137,14 @@ if certifications:
                 
                 # Calculate days until expiry
                 if cert.get('expiry_date'):
-                    try:
-                        expiry = datetime.strptime(cert['expiry_date'], '%Y-%m-%d')
-                        days_left = (expiry - datetime.now()).days
-                        if days_left > 0:
-                            if days_left <= 90:
-                                st.warning(f"⚠️ Expires in {days_left} days")
-                            else:
-                                st.info(f"Valid for {days_left} days")
+                    days_left = (cert['expiry_date'] - today).days
+                    if days_left > 0:
+                        if days_left <= 90:
+                            st.warning(f"⚠️ Expires in {days_left} days")
                         else:
-                            st.error("❌ Expired")
-                    except:
-                        pass
+                            st.info(f"Valid for {days_left} days")
+                    else:
+                        st.error("❌ Expired")
             
             with col3:
                 status = cert.get('status', 'active')
@@ -172,17 +165,8 @@ else:
     st.info("No certifications recorded. Add your laboratory certifications to track their status.")
 
 # Renewal reminders
-expiring_certs = []
-today = datetime.now()
-for cert in certifications:
-    if cert.get('expiry_date') and cert.get('status') == 'active':
-        try:
-            expiry = datetime.strptime(cert['expiry_date'], '%Y-%m-%d')
-            days_left = (expiry - today).days
-            if 0 <= days_left <= 90:
-                expiring_certs.append((cert, days_left))
-        except:
-            pass
+section("Renewal reminders")
+expiring_certs = ds.get_expiring_certifications(today)
 
 if expiring_certs:
     st.warning("### 📅 Renewal Reminders")
@@ -194,3 +178,4 @@ if expiring_certs:
 st.markdown("---")
 st.caption("💡 Tip: Keep your certifications up-to-date to maintain compliance and credibility.")
 
+performance_panel()
@@ -4,6 +4,7 @@ Services for data management
 
 from .data_service import DataService
 from .chart_service import ChartService
+from .storage import ConflictError, record_version
 
-__all__ = ['DataService', 'ChartService']
+__all__ = ['DataService', 'ChartService', 'ConflictError', 'record_version']
 
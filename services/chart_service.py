@@ -7,6 +7,9 @@ import plotly.express as px
 from typing import List, Dict, Any
 import pandas as pd
 
+from .profiler import instrument
+
+@instrument('chart')
 class ChartService:
     """Service for creating charts and visualizations"""
     
@@ -1,286 +1,589 @@
 """
 Data service for managing all data operations
-Uses session state for in-memory storage
+Delegates storage to a pluggable engine (session state by default)
 """
 
-import streamlit as st
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+import heapq
+from itertools import islice
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Tuple
+from datetime import date, timedelta
 
+import pandas as pd
+
+from .dates import now, normalize
+from .memo import memoized
+from .profiler import instrument
+from .schema import COLLECTIONS, FOREIGN_KEYS, REFERENCES, CREATED_FIELDS, DATE_FIELDS, ON_DELETE, indexed_fields
+from .storage import Storage, get_storage
+
+@instrument('data')
 class DataService:
     """Central data service for all CRUD operations"""
     
-    def __init__(self):
+    def __init__(self, storage: Optional[Storage] = None):
         """Initialize data service"""
-        # Ensure session state is initialized
-        self._init_session_state()
-    
-    def _init_session_state(self):
-        """Initialize session state with demo data if not already done."""
-        # If the main initializer hasn't run, populate all demo data now.
-        if 'initialized' not in st.session_state:
-            try:
-                from data.sample_data import initialize_data
-                initialize_data()
-                return
-            except Exception:
-                # Fallback to empty structures if seeding fails
-                pass
-
-        if 'customers' not in st.session_state:
-            st.session_state.customers = []
-        if 'projects' not in st.session_state:
-            st.session_state.projects = []
-        if 'test_plans' not in st.session_state:
-            st.session_state.test_plans = []
-        if 'rfqs' not in st.session_state:
-            st.session_state.rfqs = []
-        if 'estimations' not in st.session_state:
-            st.session_state.estimations = []
-        if 'test_executions' not in st.session_state:
-            st.session_state.test_executions = []
-        if 'test_results' not in st.session_state:
-            st.session_state.test_results = []
-        if 'samples' not in st.session_state:
-            st.session_state.samples = []
-        if 'trfs' not in st.session_state:
-            st.session_state.trfs = []
-        if 'documents' not in st.session_state:
-            st.session_state.documents = []
-        if 'audits' not in st.session_state:
-            st.session_state.audits = []
-        if 'ncrs' not in st.session_state:
-            st.session_state.ncrs = []
-        if 'certifications' not in st.session_state:
-            st.session_state.certifications = []
+        # Use the configured storage engine unless one is passed in
+        self._store = storage if storage is not None else get_storage()
+    
+    def _get_by_id(self, name: str, record_id: int) -> Optional[Dict[str, Any]]:
+        """Get a record by ID from any collection"""
+        return self._store.get(name, record_id)
+    
+    def _find_by(self, name: str, field: str, value: Any) -> List[Dict[str, Any]]:
+        """Get records of a collection by an indexed foreign key"""
+        return self._store.find_by(name, field, value)
+    
+    def _insert(self, name: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Add a record to a collection"""
+        return self._store.insert(name, normalize(name, record))
+    
+    def _update(self, name: str, record_id: int, updates: Dict[str, Any],
+                expected_version: Optional[int] = None) -> bool:
+        """Update a record in any collection, raising ConflictError if it is no longer at expected_version"""
+        return self._store.update(name, record_id, normalize(name, updates), expected_version)
+    
+    def get_many(self, collection: str, record_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Get records of a collection by ID, e.g. the IDs left after filtering a frame"""
+        return self._store.get_many(collection, record_ids)
+    
+    def get_frame(self, collection: str) -> pd.DataFrame:
+        """Get a cached, read-only DataFrame view of a collection"""
+        return self._store.frame(collection)
+    
+    def get_version(self, collection: str) -> int:
+        """Get the write counter of a collection"""
+        return self._store.version(collection)
+    
+    def update(self, collection: str, record_id: int, updates: Dict[str, Any],
+               expected_version: Optional[int] = None) -> bool:
+        """Update a record of any collection, compare-and-set when expected_version is given
+        
+        Every update bumps the record's version (see record_version); pass the
+        version the user was shown so a change made by someone else in the
+        meantime raises ConflictError instead of being overwritten.
+        """
+        self._check_collection(collection)
+        return self._update(collection, record_id, updates, expected_version)
+    
+    def search(self, collection: str, query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get records whose search fields contain every word of query as a prefix, best match first"""
+        return self._store.get_many(collection, self._store.search(collection, query, limit))
+    
+    def query(self, collection: str, where: Optional[Dict[str, Any]] = None, search: Optional[str] = None,
+              order_by: Optional[str] = None, descending: bool = False,
+              limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Get records matching every where condition and the search text
+        
+        where maps fields to a value or to a list/set/tuple of allowed values,
+        e.g. query('rfqs', where={'status': 'pending'}, search='router').
+        The smallest of the ID, foreign key/status and text index candidates
+        is fetched and the remaining conditions are checked lazily. Results
+        come in search rank order when searching, otherwise by order_by or ID.
+        """
+        self._check_collection(collection)
+        where = dict(where or {})
+        if not where and not search and order_by and limit is not None:
+            return iter(self._store.page(collection, 0, limit, order_by, descending))
+        
+        def allowed(value):
+            return set(value) if isinstance(value, (list, set, tuple, frozenset)) else {value}
+        
+        # Candidate sources as (estimated size, condition it covers, fetch)
+        sources = []
+        if 'id' in where:
+            ids = list(allowed(where['id']))
+            sources.append((len(ids), 'id', lambda: self._store.get_many(collection, ids)))
+        for field in indexed_fields(collection):
+            if field in where:
+                values = allowed(where[field])
+                # The indexes hold no None values, so a condition allowing None is checked by scanning
+                if None in values:
+                    continue
+                size = sum(self._store.count_where(collection, field, v) for v in values)
+                sources.append((size, field, lambda field=field, values=values: (
+                    record for value in values for record in self._store.find_by(collection, field, value))))
+        ranks = None
+        if search:
+            ranked_ids = self._store.search(collection, search)
+            ranks = {record_id: rank for rank, record_id in enumerate(ranked_ids)}
+            sources.append((len(ranked_ids), 'search', lambda: self._store.get_many(collection, ranked_ids)))
+        
+        if sources:
+            size, driver, fetch = min(sources, key=lambda source: source[0])
+            records = iter(()) if size == 0 else fetch()
+        else:
+            driver, records = None, iter(self._store.all(collection))
+        
+        conditions = [(field, allowed(value)) for field, value in where.items() if field != driver]
+        records = (r for r in records if all(r.get(field) in values for field, values in conditions))
+        if ranks is not None and driver != 'search':
+            records = (r for r in records if r['id'] in ranks)
+        
+        if order_by:
+            def key(record):
+                value = record.get(order_by)
+                return (value is not None, value, record['id'])
+            if limit is not None:
+                select = heapq.nlargest if descending else heapq.nsmallest
+                return iter(select(limit, records, key=key))
+            return iter(sorted(records, key=key, reverse=descending))
+        if ranks is not None:
+            if driver != 'search':
+                records = iter(sorted(records, key=lambda r: ranks[r['id']]))
+        elif driver == 'id' or (driver is not None and len(allowed(where[driver])) > 1):
+            # Explicit IDs or several buckets: restore ID order
+            records = iter(sorted(records, key=lambda r: r['id']))
+        return records if limit is None else islice(records, limit)
+    
+    def get_by_date_range(self, collection: str, field: str, start: Optional[date] = None,
+                          end: Optional[date] = None) -> List[Dict[str, Any]]:
+        """Get records whose date field falls in [start, end), earliest first; a date bound means its midnight"""
+        if field not in DATE_FIELDS.get(collection, ()):
+            raise ValueError(f"{collection}.{field} is not a date field")
+        return self._store.date_range(collection, field, start, end)
+    
+    def count(self, collection: str) -> int:
+        """Get the number of records in a collection"""
+        return self._store.count(collection)
+    
+    def list(self, collection: str, offset: int = 0, limit: int = 20, order_by: str = 'id',
+             descending: bool = False, cursor: Optional[Tuple[Any, int]] = None) -> Dict[str, Any]:
+        """Get one page of a collection ordered by order_by, then ID
+        
+        Pass the previous page's next_cursor as cursor to continue after it
+        (stable while records are added), or an offset to jump to a page.
+        """
+        records = self._store.page(collection, offset, limit + 1, order_by, descending, cursor)
+        has_more = len(records) > limit
+        records = records[:limit]
+        next_cursor = (records[-1].get(order_by), records[-1]['id']) if has_more else None
+        return {
+            'records': records,
+            'total': self._store.count(collection),
+            'offset': offset,
+            'limit': limit,
+            'next_cursor': next_cursor,
+        }
+    
+    def reserve_ids(self, collection: str, count: int) -> range:
+        """Reserve a block of IDs for a bulk insert into a collection"""
+        return self._store.reserve_ids(collection, count)
+    
+    def save_snapshot(self, path: str):
+        """Write the in-memory data and its indexes to a binary snapshot, see LMS_SNAPSHOT"""
+        self._store.save_snapshot(path)
+    
+    def reset(self, data: Dict[str, List[Dict[str, Any]]]):
+        """Replace the stored collections with the given records"""
+        self._store.load({name: [normalize(name, r) for r in records] for name, records in data.items()})
+    
+    def transaction(self):
+        """Group writes so they apply atomically
+        
+        with ds.transaction():
+            ds.update_rfq(rfq_id, {'status': 'approved'})
+            ds.add_estimation(estimation)
+        
+        On shared storage other sessions see all of the block's writes or none,
+        and an exception inside the block undoes every write made in it.
+        """
+        return self._store.transaction()
+    
+    def reset_demo(self):
+        """Replace the stored collections with the demo data, seeded lazily where the storage supports it"""
+        self._store.reseed()
     
     # Customer operations
     def get_all_customers(self) -> List[Dict[str, Any]]:
         """Get all customers"""
-        return st.session_state.customers
+        return self._store.all('customers')
     
     def get_customer_by_id(self, customer_id: int) -> Optional[Dict[str, Any]]:
         """Get customer by ID"""
-        return next((c for c in st.session_state.customers if c['id'] == customer_id), None)
+        return self._get_by_id('customers', customer_id)
     
     def add_customer(self, customer: Dict[str, Any]) -> Dict[str, Any]:
         """Add new customer"""
-        customer['id'] = len(st.session_state.customers) + 1
-        customer['created_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        st.session_state.customers.append(customer)
-        return customer
+        customer['id'] = self._store.next_id('customers')
+        customer['created_at'] = now()
+        return self._insert('customers', customer)
     
-    def update_customer(self, customer_id: int, updates: Dict[str, Any]) -> bool:
+    def update_customer(self, customer_id: int, updates: Dict[str, Any], expected_version: Optional[int] = None) -> bool:
         """Update customer"""
-        for i, customer in enumerate(st.session_state.customers):
-            if customer['id'] == customer_id:
-                st.session_state.customers[i].update(updates)
-                return True
-        return False
+        return self._update('customers', customer_id, updates, expected_version)
     
     def delete_customer(self, customer_id: int) -> bool:
-        """Delete customer"""
-        st.session_state.customers = [c for c in st.session_state.customers if c['id'] != customer_id]
-        return True
+        """Delete customer, refused while projects, RFQs or estimations reference it"""
+        return bool(self.delete('customers', customer_id))
     
     # Project operations
     def get_all_projects(self) -> List[Dict[str, Any]]:
         """Get all projects"""
-        return st.session_state.projects
+        return self._store.all('projects')
     
     def get_project_by_id(self, project_id: int) -> Optional[Dict[str, Any]]:
         """Get project by ID"""
-        return next((p for p in st.session_state.projects if p['id'] == project_id), None)
+        return self._get_by_id('projects', project_id)
+    
+    def get_projects_by_customer(self, customer_id: int) -> List[Dict[str, Any]]:
+        """Get projects for a customer"""
+        return self._find_by('projects', 'client_id', customer_id)
+    
+    def count_customers_with_projects(self) -> int:
+        """Count distinct customers referenced by at least one project"""
+        return self._store.count_distinct('projects', 'client_id')
     
     def add_project(self, project: Dict[str, Any]) -> Dict[str, Any]:
         """Add new project"""
-        project['id'] = len(st.session_state.projects) + 1
-        project['created_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        st.session_state.projects.append(project)
-        return project
+        project['id'] = self._store.next_id('projects')
+        project['created_at'] = now()
+        return self._insert('projects', project)
     
-    def update_project(self, project_id: int, updates: Dict[str, Any]) -> bool:
+    def update_project(self, project_id: int, updates: Dict[str, Any], expected_version: Optional[int] = None) -> bool:
         """Update project"""
-        for i, project in enumerate(st.session_state.projects):
-            if project['id'] == project_id:
-                st.session_state.projects[i].update(updates)
-                return True
-        return False
+        return self._update('projects', project_id, updates, expected_version)
     
     # Test Plan operations
     def get_all_test_plans(self) -> List[Dict[str, Any]]:
         """Get all test plans"""
-        return st.session_state.test_plans
+        return self._store.all('test_plans')
+    
+    def get_test_plan_by_id(self, test_plan_id: int) -> Optional[Dict[str, Any]]:
+        """Get test plan by ID"""
+        return self._get_by_id('test_plans', test_plan_id)
     
     def get_test_plans_by_project(self, project_id: int) -> List[Dict[str, Any]]:
         """Get test plans for a project"""
-        return [tp for tp in st.session_state.test_plans if tp['project_id'] == project_id]
+        return self._find_by('test_plans', 'project_id', project_id)
     
     def add_test_plan(self, test_plan: Dict[str, Any]) -> Dict[str, Any]:
         """Add new test plan"""
-        test_plan['id'] = len(st.session_state.test_plans) + 1
-        test_plan['created_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        st.session_state.test_plans.append(test_plan)
-        return test_plan
+        test_plan['id'] = self._store.next_id('test_plans')
+        test_plan['created_at'] = now()
+        return self._insert('test_plans', test_plan)
     
-    def update_test_plan(self, test_plan_id: int, updates: Dict[str, Any]) -> bool:
+    def update_test_plan(self, test_plan_id: int, updates: Dict[str, Any], expected_version: Optional[int] = None) -> bool:
         """Update test plan"""
-        for i, tp in enumerate(st.session_state.test_plans):
-            if tp['id'] == test_plan_id:
-                st.session_state.test_plans[i].update(updates)
-                return True
-        return False
+        return self._update('test_plans', test_plan_id, updates, expected_version)
     
     # RFQ operations
     def get_all_rfqs(self) -> List[Dict[str, Any]]:
         """Get all RFQs"""
-        return st.session_state.rfqs
+        return self._store.all('rfqs')
+    
+    def get_rfq_by_id(self, rfq_id: int) -> Optional[Dict[str, Any]]:
+        """Get RFQ by ID"""
+        return self._get_by_id('rfqs', rfq_id)
+    
+    def get_rfqs_by_customer(self, customer_id: int) -> List[Dict[str, Any]]:
+        """Get RFQs for a customer"""
+        return self._find_by('rfqs', 'customer_id', customer_id)
     
     def add_rfq(self, rfq: Dict[str, Any]) -> Dict[str, Any]:
         """Add new RFQ"""
-        rfq['id'] = len(st.session_state.rfqs) + 1
-        rfq['received_date'] = datetime.now().strftime('%Y-%m-%d')
-        st.session_state.rfqs.append(rfq)
-        return rfq
+        rfq['id'] = self._store.next_id('rfqs')
+        rfq['received_date'] = date.today()
+        return self._insert('rfqs', rfq)
     
-    def update_rfq(self, rfq_id: int, updates: Dict[str, Any]) -> bool:
+    def update_rfq(self, rfq_id: int, updates: Dict[str, Any], expected_version: Optional[int] = None) -> bool:
         """Update RFQ"""
-        for i, rfq in enumerate(st.session_state.rfqs):
-            if rfq['id'] == rfq_id:
-                st.session_state.rfqs[i].update(updates)
-                return True
-        return False
+        return self._update('rfqs', rfq_id, updates, expected_version)
+    
+    def approve_rfq(self, rfq_id: int, valid_days: int = 30,
+                    expected_version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Approve an RFQ and open a draft estimation for it in one transaction
+        
+        Returns the RFQ's estimation (an existing one is kept), or None if the RFQ does not exist.
+        Raises ConflictError if the RFQ is no longer at expected_version.
+        """
+        with self.transaction():
+            rfq = self.get_rfq_by_id(rfq_id)
+            if rfq is None:
+                return None
+            self.update_rfq(rfq_id, {'status': 'approved'}, expected_version)
+            existing = self.get_estimations_by_rfq(rfq_id)
+            if existing:
+                return existing[0]
+            return self.add_estimation({
+                'rfq_id': rfq_id,
+                'customer_id': rfq['customer_id'],
+                'customer_name': rfq['customer_name'],
+                'product': rfq['product'],
+                'test_types': [],
+                'total_cost': 0.0,
+                'status': 'draft',
+                'valid_until': date.today() + timedelta(days=valid_days),
+                'notes': f"Opened on approval of RFQ #{rfq_id:03d}",
+            })
     
     # Estimation operations
     def get_all_estimations(self) -> List[Dict[str, Any]]:
         """Get all estimations"""
-        return st.session_state.estimations
+        return self._store.all('estimations')
+    
+    def get_estimation_by_id(self, estimation_id: int) -> Optional[Dict[str, Any]]:
+        """Get estimation by ID"""
+        return self._get_by_id('estimations', estimation_id)
+    
+    def get_estimations_by_rfq(self, rfq_id: int) -> List[Dict[str, Any]]:
+        """Get estimations for an RFQ"""
+        return self._find_by('estimations', 'rfq_id', rfq_id)
+    
+    def get_estimations_by_customer(self, customer_id: int) -> List[Dict[str, Any]]:
+        """Get estimations for a customer"""
+        return self._find_by('estimations', 'customer_id', customer_id)
     
     def add_estimation(self, estimation: Dict[str, Any]) -> Dict[str, Any]:
         """Add new estimation"""
-        estimation['id'] = len(st.session_state.estimations) + 1
-        estimation['created_at'] = datetime.now().strftime('%Y-%m-%d')
-        st.session_state.estimations.append(estimation)
-        return estimation
+        estimation['id'] = self._store.next_id('estimations')
+        estimation['created_at'] = date.today()
+        return self._insert('estimations', estimation)
     
     # Test Execution operations
     def get_all_test_executions(self) -> List[Dict[str, Any]]:
         """Get all test executions"""
-        return st.session_state.test_executions
+        return self._store.all('test_executions')
     
     def get_test_executions_by_test_plan(self, test_plan_id: int) -> List[Dict[str, Any]]:
         """Get test executions for a test plan"""
-        return [te for te in st.session_state.test_executions if te.get('test_plan_id') == test_plan_id]
+        return self._find_by('test_executions', 'test_plan_id', test_plan_id)
+    
+    def get_test_executions_by_project(self, project_id: int) -> List[Dict[str, Any]]:
+        """Get test executions for a project"""
+        return self._find_by('test_executions', 'project_id', project_id)
     
     def add_test_execution(self, execution: Dict[str, Any]) -> Dict[str, Any]:
         """Add new test execution"""
-        execution['id'] = len(st.session_state.test_executions) + 1
-        execution['created_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        st.session_state.test_executions.append(execution)
-        return execution
+        execution['id'] = self._store.next_id('test_executions')
+        execution['created_at'] = now()
+        return self._insert('test_executions', execution)
     
     # Test Result operations
     def get_all_test_results(self) -> List[Dict[str, Any]]:
         """Get all test results"""
-        return st.session_state.test_results
+        return self._store.all('test_results')
     
     def get_test_results_by_test_plan(self, test_plan_id: int) -> List[Dict[str, Any]]:
         """Get test results for a test plan"""
-        return [tr for tr in st.session_state.test_results if tr.get('test_plan_id') == test_plan_id]
+        return self._find_by('test_results', 'test_plan_id', test_plan_id)
+    
+    def get_test_results_by_project(self, project_id: int) -> List[Dict[str, Any]]:
+        """Get test results for a project"""
+        return self._find_by('test_results', 'project_id', project_id)
     
     def add_test_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
         """Add new test result"""
-        result['id'] = len(st.session_state.test_results) + 1
-        result['created_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        st.session_state.test_results.append(result)
-        return result
+        result['id'] = self._store.next_id('test_results')
+        result['created_at'] = now()
+        return self._insert('test_results', result)
     
     # Sample operations
     def get_all_samples(self) -> List[Dict[str, Any]]:
         """Get all samples"""
-        return st.session_state.samples
+        return self._store.all('samples')
+    
+    def get_samples_by_project(self, project_id: int) -> List[Dict[str, Any]]:
+        """Get samples for a project"""
+        return self._find_by('samples', 'project_id', project_id)
     
     def add_sample(self, sample: Dict[str, Any]) -> Dict[str, Any]:
         """Add new sample"""
-        sample['id'] = len(st.session_state.samples) + 1
-        sample['created_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        st.session_state.samples.append(sample)
-        return sample
+        sample['id'] = self._store.next_id('samples')
+        sample['created_at'] = now()
+        return self._insert('samples', sample)
     
     # TRF operations
     def get_all_trfs(self) -> List[Dict[str, Any]]:
         """Get all TRFs"""
-        return st.session_state.trfs
+        return self._store.all('trfs')
+    
+    def get_trfs_by_project(self, project_id: int) -> List[Dict[str, Any]]:
+        """Get TRFs for a project"""
+        return self._find_by('trfs', 'project_id', project_id)
     
     def add_trf(self, trf: Dict[str, Any]) -> Dict[str, Any]:
         """Add new TRF"""
-        trf['id'] = len(st.session_state.trfs) + 1
-        trf['created_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        st.session_state.trfs.append(trf)
-        return trf
+        trf['id'] = self._store.next_id('trfs')
+        trf['created_at'] = now()
+        return self._insert('trfs', trf)
     
     # Document operations
     def get_all_documents(self) -> List[Dict[str, Any]]:
         """Get all documents"""
-        return st.session_state.documents
+        return self._store.all('documents')
     
     def add_document(self, document: Dict[str, Any]) -> Dict[str, Any]:
         """Add new document"""
-        document['id'] = len(st.session_state.documents) + 1
-        document['uploaded_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        st.session_state.documents.append(document)
-        return document
+        document['id'] = self._store.next_id('documents')
+        document['uploaded_at'] = now()
+        return self._insert('documents', document)
     
     # Audit operations
     def get_all_audits(self) -> List[Dict[str, Any]]:
         """Get all audits"""
-        return st.session_state.audits
+        return self._store.all('audits')
     
     def add_audit(self, audit: Dict[str, Any]) -> Dict[str, Any]:
         """Add new audit"""
-        audit['id'] = len(st.session_state.audits) + 1
-        audit['created_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        st.session_state.audits.append(audit)
-        return audit
+        audit['id'] = self._store.next_id('audits')
+        audit['created_at'] = now()
+        return self._insert('audits', audit)
     
     # NCR operations
     def get_all_ncrs(self) -> List[Dict[str, Any]]:
         """Get all NCRs"""
-        return st.session_state.ncrs
+        return self._store.all('ncrs')
     
     def add_ncr(self, ncr: Dict[str, Any]) -> Dict[str, Any]:
         """Add new NCR"""
-        ncr['id'] = len(st.session_state.ncrs) + 1
-        ncr['created_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        st.session_state.ncrs.append(ncr)
-        return ncr
+        ncr['id'] = self._store.next_id('ncrs')
+        ncr['created_at'] = now()
+        return self._insert('ncrs', ncr)
     
     # Certification operations
     def get_all_certifications(self) -> List[Dict[str, Any]]:
         """Get all certifications"""
-        return st.session_state.certifications
+        return self._store.all('certifications')
     
     def add_certification(self, certification: Dict[str, Any]) -> Dict[str, Any]:
         """Add new certification"""
-        certification['id'] = len(st.session_state.certifications) + 1
-        certification['created_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        st.session_state.certifications.append(certification)
-        return certification
+        certification['id'] = self._store.next_id('certifications')
+        certification['created_at'] = now()
+        return self._insert('certifications', certification)
+    
+    # Bulk operations
+    def add_many(self, collection: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Add a batch of records, e.g. a nightly instrument result load
+        
+        All records are validated before anything is written, get IDs from a
+        single reserved block and share one creation timestamp.
+        """
+        self._check_collection(collection)
+        errors = [f"record {i}: expected a dict" for i, r in enumerate(records) if not isinstance(r, dict)]
+        if not errors:
+            errors = self._check_references(collection, records)
+        if errors:
+            raise ValueError(f"Invalid {collection} batch: " + '; '.join(errors[:10]))
+        
+        field, date_only = CREATED_FIELDS[collection]
+        created = date.today() if date_only else now()
+        ids = self._store.reserve_ids(collection, len(records)) if records else range(0)
+        for record_id, record in zip(ids, records):
+            record['id'] = record_id
+            record.setdefault(field, created)
+            normalize(collection, record)
+        self._store.insert_many(collection, records)
+        return {'collection': collection, 'inserted': len(records), 'ids': list(ids)}
+    
+    def update_many(self, collection: str, updates: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+        """Update a batch of records given as {id: updates}; nothing is written if any entry is invalid"""
+        self._check_collection(collection)
+        errors = [f"record {record_id}: expected a dict of updates without 'id'"
+                  for record_id, changes in updates.items()
+                  if not isinstance(changes, dict) or 'id' in changes]
+        found = {r['id'] for r in self._store.get_many(collection, updates)}
+        errors += [f"record {record_id}: not found" for record_id in updates if record_id not in found]
+        if not errors:
+            errors = self._check_references(collection, list(updates.values()))
+        if errors:
+            raise ValueError(f"Invalid {collection} batch: " + '; '.join(errors[:10]))
+        
+        for changes in updates.values():
+            normalize(collection, changes)
+        updated = self._store.update_many(collection, updates)
+        return {'collection': collection, 'updated': updated, 'ids': list(updates)}
+    
+    def delete(self, collection: str, record_id: int) -> Dict[str, List[int]]:
+        """Delete a record and, following the ON_DELETE rules, the records referencing it
+        
+        Returns the deleted IDs per collection, empty if the record does not
+        exist. Raises ValueError and deletes nothing if a 'restrict' rule
+        finds a referencing record.
+        """
+        self._check_collection(collection)
+        deleted: Dict[str, List[int]] = {}
+        with self.transaction():
+            self._delete(collection, record_id, deleted)
+        return deleted
+    
+    def _delete(self, collection: str, record_id: int, deleted: Dict[str, List[int]]):
+        """Delete a record, then apply the ON_DELETE rules to its referencing records via the FK indexes"""
+        if self._store.get(collection, record_id) is None:
+            return
+        self._store.delete(collection, record_id)
+        deleted.setdefault(collection, []).append(record_id)
+        for (child, field), rule in ON_DELETE.items():
+            if REFERENCES[field] != collection:
+                continue
+            children = self._store.find_by(child, field, record_id)
+            if children and rule == 'restrict':
+                raise ValueError(f"Cannot delete {collection} record {record_id}: "
+                                 f"{len(children)} {child} record(s) reference it")
+            for record in children:
+                self._delete(child, record['id'], deleted)
+    
+    def _check_collection(self, collection: str):
+        """Reject unknown collection names"""
+        if collection not in COLLECTIONS:
+            raise ValueError(f"Unknown collection: {collection}")
+    
+    def _check_references(self, collection: str, records: List[Dict[str, Any]]) -> List[str]:
+        """Check that every foreign key in a batch points at an existing record"""
+        errors = []
+        for field in FOREIGN_KEYS.get(collection, ()):
+            values = {r[field] for r in records if r.get(field) is not None}
+            if not values:
+                continue
+            target = REFERENCES[field]
+            found = {r['id'] for r in self._store.get_many(target, values)}
+            errors += [f"{field} {value}: no such {target} record" for value in values - found]
+        return errors
     
     # Statistics methods
+    def count_by(self, collection: str, field: str) -> Dict[Any, int]:
+        """Get record counts per value of a status-like field, e.g. count_by('rfqs', 'status')"""
+        return self._store.count_by(collection, field)
+    
+    @memoized(argument='collection')
+    def count_values(self, collection: str, field: str, default: Any = 'Unknown') -> Dict[Any, int]:
+        """Get record counts per value of any field in first-seen order, e.g. count_values('test_plans', 'test_type')"""
+        self._check_collection(collection)
+        counts: Dict[Any, int] = {}
+        for record in self._store.all(collection):
+            value = record.get(field, default)
+            counts[value] = counts.get(value, 0) + 1
+        return counts
+    
+    @memoized('test_results')
+    def get_results_by_test_type(self) -> Dict[str, Dict[str, int]]:
+        """Get passed/failed test result counts per test type"""
+        type_results: Dict[str, Dict[str, int]] = {}
+        for tr in self._store.all('test_results'):
+            counts = type_results.setdefault(tr.get('test_type', 'Unknown'), {'passed': 0, 'failed': 0})
+            if tr.get('pass_fail') == 'Pass':
+                counts['passed'] += 1
+            else:
+                counts['failed'] += 1
+        return type_results
+    
+    @memoized('certifications')
+    def get_expiring_certifications(self, today: date, days: int = 91) -> List[Tuple[Dict[str, Any], int]]:
+        """Get (certification, days left) for active certifications expiring within days of today"""
+        expiring = self.get_by_date_range('certifications', 'expiry_date', today, today + timedelta(days=days))
+        return [(cert, (cert['expiry_date'] - today).days) for cert in expiring if cert.get('status') == 'active']
+    
     def get_dashboard_stats(self) -> Dict[str, Any]:
         """Get dashboard statistics"""
-        projects = self.get_all_projects()
-        test_plans = self.get_all_test_plans()
+        project_status = self.count_by('projects', 'status')
+        test_plan_status = self.count_by('test_plans', 'status')
         
         return {
-            'total_projects': len(projects),
-            'active_projects': len([p for p in projects if p['status'] == 'active']),
-            'completed_projects': len([p for p in projects if p['status'] == 'completed']),
-            'total_customers': len(self.get_all_customers()),
-            'total_test_plans': len(test_plans),
-            'completed_tests': len([tp for tp in test_plans if tp['status'] == 'Completed']),
-            'pending_rfqs': len([r for r in self.get_all_rfqs() if r['status'] == 'pending']),
-            'total_samples': len(self.get_all_samples()),
+            'total_projects': self._store.count('projects'),
+            'active_projects': project_status.get('active', 0),
+            'completed_projects': project_status.get('completed', 0),
+            'total_customers': self._store.count('customers'),
+            'total_test_plans': self._store.count('test_plans'),
+            'completed_tests': test_plan_status.get('Completed', 0),
+            'pending_rfqs': self.count_by('rfqs', 'status').get('pending', 0),
+            'total_samples': self._store.count('samples'),
         }
-
@@ -0,0 +1,42 @@
+"""
+Native date handling for records
+Date fields hold datetime (timestamps) or date (calendar days) objects;
+strings are only produced when rendering or serializing
+"""
+
+from datetime import date, datetime, time
+from typing import Any, Dict, Optional
+
+from .schema import DATE_FIELDS
+
+
+def now() -> datetime:
+    """Get the current time as stored on records (whole seconds)"""
+    return datetime.now().replace(microsecond=0)
+
+
+def to_native(value: Any) -> Any:
+    """Convert an ISO date ('2024-01-15') or timestamp ('2024-01-15 10:00:00') string to date/datetime"""
+    if isinstance(value, str) and value:
+        if len(value) == 10:
+            return date.fromisoformat(value)
+        return datetime.fromisoformat(value)
+    return value
+
+
+def normalize(collection: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a record's date fields to native values in place"""
+    for field in DATE_FIELDS.get(collection, ()):
+        value = record.get(field)
+        if isinstance(value, str):
+            record[field] = to_native(value)
+    return record
+
+
+def as_datetime(value: Any) -> Optional[datetime]:
+    """Get a comparable datetime for a date field value, treating a date as its midnight"""
+    value = to_native(value)
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.combine(value, time())
+
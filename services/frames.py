@@ -0,0 +1,30 @@
+"""
+Columnar DataFrame views of collections for vectorized filtering and aggregation
+"""
+
+from typing import List, Dict, Any
+
+import pandas as pd
+
+from .schema import COUNTED_FIELDS, CATEGORICAL_FIELDS, DATE_FIELDS, SEARCH_FIELDS, FOREIGN_KEYS
+
+
+def frame_columns(collection: str) -> tuple:
+    """Get the columns every view of a collection has, even when it is empty"""
+    return (('id',) + FOREIGN_KEYS.get(collection, ()) + COUNTED_FIELDS.get(collection, ())
+            + CATEGORICAL_FIELDS.get(collection, ()) + DATE_FIELDS.get(collection, ())
+            + SEARCH_FIELDS.get(collection, ()))
+
+
+def build_frame(collection: str, records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Build a DataFrame for a collection with categorical status/type and datetime64 date columns"""
+    # Typed records (see models.Record) are converted back to dicts
+    df = pd.DataFrame.from_records([r if isinstance(r, dict) else r.to_dict() for r in records])
+    for column in frame_columns(collection):
+        if column not in df.columns:
+            df[column] = None
+    for column in COUNTED_FIELDS.get(collection, ()) + CATEGORICAL_FIELDS.get(collection, ()):
+        df[column] = df[column].astype('category')
+    for column in DATE_FIELDS.get(collection, ()):
+        df[column] = pd.to_datetime(df[column], errors='coerce', format='ISO8601')
+    return df
@@ -0,0 +1,240 @@
+"""
+In-memory indexes maintained alongside the session state collections
+"""
+
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Iterable
+
+from .dates import as_datetime
+
+_TOKEN = re.compile(r'[^\W_]+')
+
+
+def tokenize(value: Any) -> List[str]:
+    """Split a field value (or list of values) into lowercase word tokens"""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [token for item in value for token in tokenize(item)]
+    return _TOKEN.findall(str(value).lower())
+
+
+def rank(scores: Dict[int, int], limit: Optional[int] = None) -> List[int]:
+    """Order IDs by descending search score, then ID"""
+    ranked = sorted(scores, key=lambda i: (-scores[i], i))
+    return ranked if limit is None else ranked[:limit]
+
+
+class CollectionIndex:
+    """Index over a single collection's list of records"""
+
+    def __init__(self, records: List[Dict[str, Any]], foreign_keys: Iterable[str] = (),
+                 counted_fields: Iterable[str] = ()):
+        """Build the index for an existing list of records"""
+        self.records = records
+        self.by_id: Dict[int, Dict[str, Any]] = {}
+        # field -> value -> ordered set of IDs (dict keys keep insertion order)
+        self.by_fk: Dict[str, Dict[Any, Dict[int, None]]] = {field: {} for field in foreign_keys}
+        self.counts: Dict[str, Counter] = {field: Counter() for field in counted_fields}
+        for record in records:
+            self.add(record)
+
+    def get(self, record_id: int) -> Optional[Dict[str, Any]]:
+        """Get record by ID"""
+        return self.by_id.get(record_id)
+
+    def ids_for(self, field: str, value: Any) -> List[int]:
+        """Get IDs of records whose foreign key field equals value"""
+        return list(self.by_fk[field].get(value, ()))
+
+    def find(self, field: str, value: Any) -> List[Dict[str, Any]]:
+        """Get records whose foreign key field equals value"""
+        return [self.by_id[i] for i in self.by_fk[field].get(value, ())]
+
+    def values(self, field: str) -> List[Any]:
+        """Get the distinct values currently referenced by a foreign key field"""
+        return list(self.by_fk[field])
+
+    def count_by(self, field: str) -> Dict[Any, int]:
+        """Get the number of records for each value of a counted field"""
+        return dict(self.counts[field])
+
+    def add(self, record: Dict[str, Any]):
+        """Index a newly added record"""
+        self.by_id[record['id']] = record
+        for field, buckets in self.by_fk.items():
+            self._link(buckets, record.get(field), record['id'])
+        for field, counter in self.counts.items():
+            self._increment(counter, record.get(field), 1)
+
+    def add_many(self, records: List[Dict[str, Any]]):
+        """Index a batch of newly added records, updating each counter once"""
+        for record in records:
+            self.by_id[record['id']] = record
+        for field, buckets in self.by_fk.items():
+            for record in records:
+                self._link(buckets, record.get(field), record['id'])
+        for field, counter in self.counts.items():
+            counter.update(record[field] for record in records if record.get(field) is not None)
+
+    def update(self, record: Dict[str, Any], updates: Dict[str, Any]):
+        """Apply updates to an indexed record"""
+        for field, buckets in self.by_fk.items():
+            if field in updates and updates[field] != record.get(field):
+                self._unlink(buckets, record.get(field), record['id'])
+                self._link(buckets, updates[field], record['id'])
+        for field, counter in self.counts.items():
+            if field in updates and updates[field] != record.get(field):
+                self._increment(counter, record.get(field), -1)
+                self._increment(counter, updates[field], 1)
+        record.update(updates)
+
+    def remove(self, record: Dict[str, Any]):
+        """Drop a record from the index"""
+        self.by_id.pop(record['id'], None)
+        for field, buckets in self.by_fk.items():
+            self._unlink(buckets, record.get(field), record['id'])
+        for field, counter in self.counts.items():
+            self._increment(counter, record.get(field), -1)
+
+    @staticmethod
+    def _link(buckets: Dict[Any, Dict[int, None]], value: Any, record_id: int):
+        """Add an ID to the bucket for value; records without a value are not indexed"""
+        if value is not None:
+            buckets.setdefault(value, {})[record_id] = None
+
+    @staticmethod
+    def _unlink(buckets: Dict[Any, Dict[int, None]], value: Any, record_id: int):
+        """Remove an ID from a bucket, dropping the bucket once it is empty"""
+        bucket = buckets.get(value)
+        if bucket is not None:
+            bucket.pop(record_id, None)
+            if not bucket:
+                del buckets[value]
+
+    @staticmethod
+    def _increment(counter: Counter, value: Any, delta: int):
+        """Adjust the count for value, dropping it once it reaches zero"""
+        if value is None:
+            return
+        counter[value] += delta
+        if counter[value] <= 0:
+            del counter[value]
+
+
+class TextIndex:
+    """Inverted index over the text fields of a collection's records
+
+    Each token maps to the IDs containing it and how often; a sorted
+    vocabulary makes every query token a prefix match.
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], fields: Iterable[str]):
+        """Build the index for an existing list of records"""
+        self.records = records
+        self.fields = tuple(fields)
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.vocabulary: List[str] = []
+        # ID -> distinct tokens, so a record can be unindexed without re-reading it
+        self.terms: Dict[int, tuple] = {}
+        for record in records:
+            self.add(record)
+
+    def add(self, record: Dict[str, Any]):
+        """Index a newly added record"""
+        terms = Counter(token for field in self.fields for token in tokenize(record.get(field)))
+        self.terms[record['id']] = tuple(terms)
+        for token, count in terms.items():
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = {}
+                insort(self.vocabulary, token)
+            posting[record['id']] = count
+
+    def update(self, record: Dict[str, Any], updates: Dict[str, Any]):
+        """Reindex a record before updates are applied to it"""
+        if any(field in updates for field in self.fields):
+            self.remove(record)
+            self.add({**record, **updates})
+
+    def remove(self, record: Dict[str, Any]):
+        """Drop a record from the index"""
+        for token in self.terms.pop(record['id'], ()):
+            posting = self.postings[token]
+            posting.pop(record['id'], None)
+            if not posting:
+                del self.postings[token]
+                del self.vocabulary[bisect_left(self.vocabulary, token)]
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """Get IDs of records matching every query token as a word prefix, best first
+
+        Exact word matches score twice as much as prefix matches; ties keep ID order.
+        """
+        return rank(self.scores(query), limit)
+
+    def scores(self, query: str) -> Dict[int, int]:
+        """Get the score of every record matching all query tokens as word prefixes"""
+        tokens = tokenize(query)
+        if not tokens:
+            return {}
+        scores = None
+        for token in dict.fromkeys(tokens):
+            matches: Dict[int, int] = {}
+            position = bisect_left(self.vocabulary, token)
+            while position < len(self.vocabulary) and self.vocabulary[position].startswith(token):
+                word = self.vocabulary[position]
+                position += 1
+                weight = 2 if word == token else 1
+                for record_id, count in self.postings[word].items():
+                    matches[record_id] = matches.get(record_id, 0) + weight * count
+            if scores is None:
+                scores = matches
+            else:
+                scores = {i: score + matches[i] for i, score in scores.items() if i in matches}
+            if not scores:
+                return {}
+        return scores
+
+
+class RangeIndex:
+    """Sorted (timestamp, ID) pairs of one date field, for range scans"""
+
+    def __init__(self, records: List[Dict[str, Any]], field: str):
+        """Build the index for an existing list of records"""
+        self.records = records
+        self.field = field
+        self.entries = sorted(
+            (key, record['id']) for record in records
+            if (key := as_datetime(record.get(field))) is not None
+        )
+
+    def add(self, record: Dict[str, Any]):
+        """Index a newly added record"""
+        key = as_datetime(record.get(self.field))
+        if key is not None:
+            insort(self.entries, (key, record['id']))
+
+    def update(self, record: Dict[str, Any], updates: Dict[str, Any]):
+        """Reindex a record before updates are applied to it"""
+        if self.field in updates:
+            self.remove(record)
+            self.add({**record, **updates})
+
+    def remove(self, record: Dict[str, Any]):
+        """Drop a record from the index"""
+        key = as_datetime(record.get(self.field))
+        if key is None:
+            return
+        position = bisect_left(self.entries, (key, record['id']))
+        if position < len(self.entries) and self.entries[position] == (key, record['id']):
+            del self.entries[position]
+
+    def between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[int]:
+        """Get IDs with start <= value < end in date order; a missing bound is open"""
+        low = 0 if start is None else bisect_left(self.entries, (start,))
+        high = len(self.entries) if end is None else bisect_left(self.entries, (end,))
+        return [record_id for _, record_id in self.entries[low:high]]
@@ -0,0 +1,108 @@
+"""
+Reader-writer lock for storage shared between session threads
+"""
+
+import threading
+from typing import Callable, Optional
+
+
+class _Hold:
+    """Reusable context manager holding one side of a ReadWriteLock"""
+    __slots__ = ('_acquire', '_release')
+
+    def __init__(self, acquire: Callable[[], None], release: Callable[[], None]):
+        self._acquire = acquire
+        self._release = release
+
+    def __enter__(self):
+        self._acquire()
+
+    def __exit__(self, *exc_info):
+        self._release()
+
+
+class ReadWriteLock:
+    """Lock admitting any number of readers at once, or a single writer
+
+    Waiting writers hold back new readers so a steady stream of reads cannot
+    starve them. Both sides are re-entrant and the writer may also read, but
+    a thread holding only a read lock cannot upgrade it to a write lock.
+    Nested reads only touch a thread-local counter, so the storage methods
+    calling one another stay cheap.
+    """
+
+    def __init__(self):
+        """Start unlocked"""
+        self._mutex = threading.Lock()
+        self._cond = threading.Condition(self._mutex)
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._write_depth = 0
+        self._writers_waiting = 0
+        # Per thread: read depth, and whether the outermost read counts in _readers
+        self._local = threading.local()
+        self._read_hold = _Hold(self.acquire_read, self.release_read)
+        self._write_hold = _Hold(self.acquire_write, self.release_write)
+
+    def acquire_read(self):
+        local = self._local
+        depth = getattr(local, 'reads', 0)
+        if depth:
+            local.reads = depth + 1
+            return
+        # Only this thread can have made itself the writer, so this check needs no lock
+        if self._writer == threading.get_ident():
+            local.counted = False
+        else:
+            with self._mutex:
+                while self._writer is not None or self._writers_waiting:
+                    self._cond.wait()
+                self._readers += 1
+            local.counted = True
+        local.reads = 1
+
+    def release_read(self):
+        local = self._local
+        local.reads -= 1
+        if local.reads or not local.counted:
+            return
+        with self._mutex:
+            self._readers -= 1
+            if not self._readers and self._writers_waiting:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            if getattr(self._local, 'reads', 0):
+                raise RuntimeError("Cannot upgrade a read lock to a write lock")
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self):
+        with self._cond:
+            self._write_depth -= 1
+            if not self._write_depth:
+                self._writer = None
+                self._cond.notify_all()
+
+    def write_held(self) -> bool:
+        """Whether the calling thread holds the write lock"""
+        return self._writer == threading.get_ident()
+
+    def read(self) -> _Hold:
+        """Hold the lock shared for a with block"""
+        return self._read_hold
+
+    def write(self) -> _Hold:
+        """Hold the lock exclusively for a with block"""
+        return self._write_hold
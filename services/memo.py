@@ -0,0 +1,50 @@
+"""
+Generation-stamped memoization of DataService aggregations
+A result is kept with the write counters (generations) of the collections it
+was computed from and reused until one of them changes.
+"""
+
+import functools
+import inspect
+from typing import Any, Callable, Optional
+
+# Results kept per storage cache; the oldest entry goes first
+MEMO_SIZE = 128
+
+
+def memoized(*collections: str, argument: Optional[str] = None) -> Callable:
+    """Decorate a DataService method computed only from collections, reusing its result until they change
+
+    argument names a parameter holding one more collection the method reads,
+    e.g. 'collection' for generic methods. The cache key is (method,
+    arguments, generations of the collections); the cache lives with the
+    storage, so it is per session for session storage and shared for the
+    shared engines. Results are shared between callers and must not be modified.
+    """
+    def decorate(func):
+        # Position of argument among the arguments after self
+        position = list(inspect.signature(func).parameters).index(argument) - 1 if argument else None
+
+        @functools.wraps(func)
+        def wrapper(self, *args: Any, **kwargs: Any):
+            names = collections
+            if argument:
+                names += (args[position] if position < len(args) else kwargs[argument],)
+            # Read the generations first: a write made while computing then only causes a recompute
+            generations = tuple(self._store.version(name) for name in names)
+            key = (func.__qualname__, args, tuple(sorted(kwargs.items())))
+            cache = self._store.memo_cache()
+            cached = cache.get(key)
+            if cached is not None and cached[0] == generations:
+                return cached[1]
+            value = func(self, *args, **kwargs)
+            cache[key] = (generations, value)
+            while len(cache) > MEMO_SIZE:
+                try:
+                    cache.pop(next(iter(cache)), None)
+                except (StopIteration, RuntimeError):
+                    # Another session thread changed the shared cache meanwhile
+                    break
+            return value
+        return wrapper
+    return decorate
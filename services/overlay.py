@@ -0,0 +1,314 @@
+"""
+Copy-on-write overlay storage for sandbox sessions
+Every session reads one shared, never-written base dataset and keeps only its
+own inserted, updated and deleted records, so its memory grows with its edits
+rather than with the dataset.
+"""
+
+import copy
+import heapq
+from collections import Counter
+from typing import List, Optional, Dict, Any, MutableMapping
+
+import pandas as pd
+
+from .dates import as_datetime
+from .indexes import CollectionIndex, TextIndex, rank
+from .schema import COUNTED_FIELDS, SEARCH_FIELDS, indexed_fields
+from .storage import MemoryStorage, Storage
+
+
+class CollectionDelta:
+    """A session's changes to one collection of the base
+
+    records holds the session's own records: inserted ones and the copies of
+    base records it updated. shadowed holds the base IDs hidden from the
+    session, i.e. base records it updated or deleted.
+    """
+
+    def __init__(self, collection: str):
+        """Start with no changes"""
+        self.records: List[Dict[str, Any]] = []
+        self.index = CollectionIndex(self.records, indexed_fields(collection), COUNTED_FIELDS.get(collection, ()))
+        self.text_index = TextIndex(self.records, SEARCH_FIELDS.get(collection, ()))
+        self.shadowed: set = set()
+        # IDs of records that are not copies of a base record
+        self.inserted: Dict[int, None] = {}
+        self.last_id: Optional[int] = None
+        self.version = 0
+        # (base version, delta version, merged records) from the last all()
+        self.merged: Optional[tuple] = None
+
+    def __bool__(self) -> bool:
+        return bool(self.records or self.shadowed)
+
+    def add(self, record: Dict[str, Any], inserted: bool):
+        self.records.append(record)
+        self.index.add(record)
+        self.text_index.add(record)
+        if inserted:
+            self.inserted[record['id']] = None
+
+    def remove(self, record: Dict[str, Any]):
+        self.records.remove(record)
+        self.index.remove(record)
+        self.text_index.remove(record)
+        self.inserted.pop(record['id'], None)
+
+
+class OverlayStorage(Storage):
+    """Storage reading through a shared base and writing to per-session deltas
+
+    Reads merge the base with the session's delta, whose lookup and text
+    indexes only cover the session's own records. The base is never written,
+    so sessions do not see each other's changes.
+    """
+
+    def __init__(self, base: MemoryStorage, state: MutableMapping):
+        """Layer the deltas held in state (e.g. st.session_state) over base"""
+        self.base = base
+        self.state = state
+        if '_overlay' not in state:
+            state['_overlay'] = {}
+        if '_frames' not in state:
+            state['_frames'] = {}
+        if '_memo' not in state:
+            state['_memo'] = {}
+
+    def _delta(self, collection: str, create: bool = False) -> Optional[CollectionDelta]:
+        """Get the session's delta for a collection, None while it has no changes"""
+        deltas = self.state['_overlay']
+        delta = deltas.get(collection)
+        if delta is None and create:
+            delta = deltas[collection] = CollectionDelta(collection)
+        return delta if delta or create else None
+
+    def _shadowed(self, collection: str, delta: CollectionDelta) -> List[Dict[str, Any]]:
+        """Get the base records the session has updated or deleted, as the base holds them"""
+        return [self.base.get(collection, record_id) for record_id in delta.shadowed]
+
+    def _touch(self, delta: CollectionDelta):
+        delta.version += 1
+        delta.merged = None
+
+    def version(self, collection: str) -> int:
+        delta = self.state['_overlay'].get(collection)
+        # Both counters only grow, so their sum changes whenever either does
+        return self.base.version(collection) + (delta.version if delta else 0)
+
+    def frame(self, collection: str) -> pd.DataFrame:
+        if self._delta(collection) is None:
+            # Unedited collections share the base's frame; drop any copy left from edits since reset
+            self._frames().pop(collection, None)
+            return self.base.frame(collection)
+        return super().frame(collection)
+
+    def _frames(self) -> Dict[str, tuple]:
+        return self.state['_frames']
+
+    def memo_cache(self) -> Dict[tuple, tuple]:
+        return self.state['_memo']
+
+    def all(self, collection: str) -> List[Dict[str, Any]]:
+        delta = self._delta(collection)
+        if delta is None:
+            return self.base.all(collection)
+        base_version = self.base.version(collection)
+        if delta.merged is None or delta.merged[:2] != (base_version, delta.version):
+            # Updated copies take their base record's place, inserts go last
+            merged = []
+            for record in self.base.all(collection):
+                if record['id'] in delta.shadowed:
+                    record = delta.index.get(record['id'])
+                    if record is None:
+                        continue
+                merged.append(record)
+            merged.extend(delta.index.get(record_id) for record_id in delta.inserted)
+            delta.merged = (base_version, delta.version, merged)
+        return delta.merged[2]
+
+    def get(self, collection: str, record_id: int) -> Optional[Dict[str, Any]]:
+        delta = self._delta(collection)
+        if delta is None:
+            return self.base.get(collection, record_id)
+        record = delta.index.get(record_id)
+        if record is not None or record_id in delta.shadowed:
+            return record
+        return self.base.get(collection, record_id)
+
+    def count(self, collection: str) -> int:
+        delta = self._delta(collection)
+        if delta is None:
+            return self.base.count(collection)
+        return self.base.count(collection) - len(delta.shadowed) + len(delta.records)
+
+    def find_by(self, collection: str, field: str, value: Any) -> List[Dict[str, Any]]:
+        delta = self._delta(collection)
+        records = self.base.find_by(collection, field, value)
+        if delta is None:
+            return records
+        records = [r for r in records if r['id'] not in delta.shadowed] + delta.index.find(field, value)
+        return sorted(records, key=lambda r: r['id'])
+
+    def count_where(self, collection: str, field: str, value: Any) -> int:
+        delta = self._delta(collection)
+        count = self.base.count_where(collection, field, value)
+        if delta is None:
+            return count
+        hidden = sum(1 for r in self._shadowed(collection, delta) if r.get(field) == value)
+        return count - hidden + len(delta.index.by_fk[field].get(value, ()))
+
+    def count_by(self, collection: str, field: str) -> Dict[Any, int]:
+        delta = self._delta(collection)
+        counts = self.base.count_by(collection, field)
+        if delta is None:
+            return counts
+        counts = Counter(counts)
+        counts.subtract(r.get(field) for r in self._shadowed(collection, delta) if r.get(field) is not None)
+        counts.update(delta.index.count_by(field))
+        return {value: n for value, n in counts.items() if n > 0}
+
+    def count_distinct(self, collection: str, field: str) -> int:
+        delta = self._delta(collection)
+        distinct = self.base.count_distinct(collection, field)
+        if delta is None:
+            return distinct
+        hidden = Counter(r.get(field) for r in self._shadowed(collection, delta) if r.get(field) is not None)
+
+        def left_in_base(value):
+            return self.base.count_where(collection, field, value) - hidden.get(value, 0)
+
+        # Values only the hidden base records had, then values only the session's records have
+        distinct -= sum(1 for value in hidden if left_in_base(value) <= 0)
+        distinct += sum(1 for value in delta.index.values(field) if left_in_base(value) <= 0)
+        return distinct
+
+    def date_range(self, collection: str, field: str, start: Any = None, end: Any = None) -> List[Dict[str, Any]]:
+        delta = self._delta(collection)
+        records = self.base.date_range(collection, field, start, end)
+        if delta is None:
+            return records
+        start, end = as_datetime(start), as_datetime(end)
+        own = []
+        for record in delta.records:
+            key = as_datetime(record.get(field))
+            if key is not None and (start is None or key >= start) and (end is None or key < end):
+                own.append((key, record['id'], record))
+        own.sort(key=lambda k: k[:2])
+        records = [r for r in records if r['id'] not in delta.shadowed]
+        return list(heapq.merge(records, [r for _, _, r in own],
+                                key=lambda r: (as_datetime(r.get(field)), r['id'])))
+
+    def search(self, collection: str, query: str, limit: Optional[int] = None) -> List[int]:
+        delta = self._delta(collection)
+        if delta is None:
+            return self.base.search(collection, query, limit)
+        scores = {record_id: score for record_id, score in self.base._text_index(collection).scores(query).items()
+                  if record_id not in delta.shadowed}
+        scores.update(delta.text_index.scores(query))
+        return rank(scores, limit)
+
+    def _restore(self, collection: str, record_id: int, own: Optional[Dict[str, Any]], shadowed: bool):
+        """Put a record's entry in the delta back as it was, to undo a write"""
+        delta = self._delta(collection, create=True)
+        current = delta.index.get(record_id)
+        if current is not None:
+            delta.remove(current)
+        if own is not None:
+            delta.add(own, inserted=self.base.get(collection, record_id) is None)
+        if shadowed:
+            delta.shadowed.add(record_id)
+        else:
+            delta.shadowed.discard(record_id)
+        self._touch(delta)
+
+    def insert(self, collection: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        record = self.base._record(collection, record)
+        delta = self._delta(collection, create=True)
+        existing = delta.index.get(record['id'])
+        was_shadowed = record['id'] in delta.shadowed
+        self._logged(lambda: self._restore(collection, record['id'], existing, was_shadowed))
+        if existing is not None:
+            delta.remove(existing)
+        in_base = self.base.get(collection, record['id']) is not None
+        if in_base:
+            delta.shadowed.add(record['id'])
+        delta.add(record, inserted=not in_base)
+        if delta.last_id is not None and record['id'] > delta.last_id:
+            delta.last_id = record['id']
+        self._touch(delta)
+        return record
+
+    def update(self, collection: str, record_id: int, updates: Dict[str, Any],
+               expected_version: Optional[int] = None) -> bool:
+        delta = self._delta(collection, create=True)
+        record = delta.index.get(record_id)
+        if record is None:
+            original = None if record_id in delta.shadowed else self.base.get(collection, record_id)
+            if original is None:
+                return False
+            updates = self._versioned(collection, original, updates, expected_version)
+            # Deep copy so nested lists are not shared with the base either
+            record = copy.deepcopy(original)
+            delta.shadowed.add(record_id)
+            delta.add(record, inserted=False)
+            self._logged(lambda: self._restore(collection, record_id, None, False))
+        else:
+            updates = self._versioned(collection, record, updates, expected_version)
+            before = {field: record.get(field) for field in updates}
+            self._logged(lambda: self.update(collection, record_id, before))
+        delta.text_index.update(record, updates)
+        delta.index.update(record, updates)
+        self._touch(delta)
+        return True
+
+    def delete(self, collection: str, record_id: int) -> bool:
+        delta = self._delta(collection, create=True)
+        record = delta.index.get(record_id)
+        was_shadowed = record_id in delta.shadowed
+        if record is not None:
+            delta.remove(record)
+        elif record_id not in delta.shadowed and self.base.get(collection, record_id) is not None:
+            delta.shadowed.add(record_id)
+        else:
+            return True
+        self._logged(lambda: self._restore(collection, record_id, record, was_shadowed))
+        self._touch(delta)
+        return True
+
+    def reserve_ids(self, collection: str, count: int = 1) -> range:
+        delta = self._delta(collection, create=True)
+        if delta.last_id is None:
+            ids = (r['id'] for r in (*self.base.all(collection), *delta.records))
+            delta.last_id = max(ids, default=0)
+        last = delta.last_id
+        delta.last_id = last + count
+        return range(last + 1, last + count + 1)
+
+    def load(self, data: Dict[str, List[Dict[str, Any]]]):
+        for name, records in data.items():
+            # The new records replace every base record for this session only
+            previous = self.state['_overlay'].get(name)
+            delta = self.state['_overlay'][name] = CollectionDelta(name)
+            delta.version = previous.version + 1 if previous else 1
+            self._logged(lambda name=name, previous=previous: self._put_back(name, previous))
+            delta.shadowed.update(r['id'] for r in self.base.all(name))
+            for record in records:
+                record = self.base._record(name, record)
+                delta.add(record, inserted=record['id'] not in delta.shadowed)
+
+    def _put_back(self, collection: str, delta: Optional[CollectionDelta]):
+        """Reinstate a replaced delta, keeping the version growing"""
+        current = self.state['_overlay'].get(collection)
+        delta = delta or CollectionDelta(collection)
+        delta.version = (current.version if current else 0) + 1
+        delta.merged = None
+        self.state['_overlay'][collection] = delta
+
+    def reseed(self):
+        """Drop the session's changes, going back to the shared base data"""
+        deltas = self.state['_overlay']
+        for name, delta in list(deltas.items()):
+            # Keep the version growing so cached frames are rebuilt
+            fresh = deltas[name] = CollectionDelta(name)
+            fresh.version = delta.version + 1
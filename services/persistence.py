@@ -0,0 +1,204 @@
+"""
+Write-behind persistence of the shared in-memory storage to SQLite
+Writes apply to memory and return at once; a background thread writes the
+records they touched to the database in batches, one transaction per batch.
+"""
+
+import atexit
+import logging
+import threading
+from typing import List, Optional, Dict, Any, Iterable
+
+from .schema import COLLECTIONS
+from .storage import SharedMemoryStorage, SQLiteStorage
+
+logger = logging.getLogger(__name__)
+
+# async: writes never wait for the disk, which they reach within flush_interval
+# commit: each write waits for the group commit that includes it
+# fsync: as commit, with SQLite syncing every commit to the disk (synchronous=FULL)
+DURABILITY_LEVELS = ('async', 'commit', 'fsync')
+
+
+class WriteBehindStorage(SharedMemoryStorage):
+    """Shared memory storage persisting its writes to a SQLite database in the background
+
+    Reads never touch the database. Writes only mark the records they touch as
+    dirty; the flusher thread writes the current version of every dirty record
+    at least every flush_interval seconds, so repeated writes to a record
+    between flushes cost one row write. A batch is read under the read lock,
+    so it never contains half of a transaction, and written in one database
+    transaction. Pending writes are flushed when the process exits.
+    """
+
+    def __init__(self, backend: SQLiteStorage, flush_interval: float = 0.5, durability: str = 'async',
+                 typed: bool = False):
+        """Load the database into memory and start the flusher thread"""
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Unknown durability level: {durability} (expected {', '.join(DURABILITY_LEVELS)})")
+        super().__init__(typed=typed)
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.durability = durability
+        # collection -> IDs written since the last flush, and collections replaced by load()
+        self._dirty: Dict[str, Dict[int, None]] = {}
+        self._replaced: set = set()
+        self._pending = threading.Condition()
+        self._queued = 0
+        self._flushed = 0
+        self._urgent = False
+        self._closing = False
+        self.last_error: Optional[BaseException] = None
+        self._flush_lock = threading.Lock()
+        SharedMemoryStorage.load(self, {name: backend.all(name) for name in COLLECTIONS})
+        self._thread = threading.Thread(target=self._run, name='lms-write-behind', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _written(self, collection: str, record_ids: Iterable[int] = (), replaced: bool = False):
+        """Queue written records for the next flush, waiting for it if the durability level asks to"""
+        with self._pending:
+            if replaced:
+                self._replaced.add(collection)
+                self._dirty.pop(collection, None)
+            elif collection not in self._replaced:
+                self._dirty.setdefault(collection, {}).update(dict.fromkeys(record_ids))
+            self._queued += 1
+            ticket = self._queued
+        # Inside a transaction the write lock is still held, so wait once the whole block is written
+        if not self._lock.write_held():
+            self._wait(ticket)
+
+    def _wait(self, ticket: int):
+        """Block until the flush covering write number ticket commits, unless durability is async"""
+        if self.durability == 'async':
+            return
+        with self._pending:
+            self._urgent = True
+            self._pending.notify_all()
+            while self._flushed < ticket:
+                if self.last_error is not None:
+                    raise RuntimeError("Could not persist the write") from self.last_error
+                self._pending.wait()
+
+    def insert(self, collection: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        record = super().insert(collection, record)
+        self._written(collection, (record['id'],))
+        return record
+
+    def update(self, collection: str, record_id: int, updates: Dict[str, Any],
+               expected_version: Optional[int] = None) -> bool:
+        updated = super().update(collection, record_id, updates, expected_version)
+        if updated:
+            self._written(collection, (record_id,))
+        return updated
+
+    def delete(self, collection: str, record_id: int) -> bool:
+        deleted = super().delete(collection, record_id)
+        self._written(collection, (record_id,))
+        return deleted
+
+    def insert_many(self, collection: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        records = super().insert_many(collection, records)
+        self._written(collection, [record['id'] for record in records])
+        return records
+
+    def update_many(self, collection: str, updates: Dict[int, Dict[str, Any]]) -> int:
+        updated = super().update_many(collection, updates)
+        self._written(collection, updates)
+        return updated
+
+    def load(self, data: Dict[str, List[Dict[str, Any]]]):
+        super().load(data)
+        for name in data:
+            self._written(name, replaced=True)
+
+    def transaction(self):
+        block = super().transaction()
+        return block if self._lock.write_held() else _WaitAfter(block, self)
+
+    def _run(self):
+        """Flush on every interval, or at once when a writer is waiting, until closed"""
+        while True:
+            with self._pending:
+                self._pending.wait_for(lambda: self._urgent or self._closing, timeout=self.flush_interval)
+                self._urgent = False
+                closing = self._closing
+            self.flush()
+            if closing:
+                return
+
+    def flush(self) -> int:
+        """Write every pending change to the database now, in one transaction; returns the records written"""
+        with self._flush_lock:
+            with self._pending:
+                dirty, self._dirty = self._dirty, {}
+                replaced, self._replaced = self._replaced, set()
+                ticket = self._queued
+            if dirty or replaced:
+                try:
+                    written = self._write(dirty, replaced)
+                except Exception as e:
+                    logger.exception("Write-behind flush failed; the batch will be retried")
+                    with self._pending:
+                        # Requeue the batch under any writes made since
+                        for name, ids in dirty.items():
+                            if name not in self._replaced:
+                                self._dirty[name] = {**ids, **self._dirty.get(name, {})}
+                        self._replaced |= replaced
+                        self.last_error = e
+                        self._pending.notify_all()
+                    return 0
+            else:
+                written = 0
+            with self._pending:
+                self._flushed = max(self._flushed, ticket)
+                self.last_error = None
+                self._pending.notify_all()
+            return written
+
+    def _write(self, dirty: Dict[str, Dict[int, None]], replaced: set) -> int:
+        """Copy the batch's records out under the read lock, then write them in one database transaction"""
+        with self._lock.read():
+            collections = {name: [dict(r.items()) for r in self.all(name)] for name in replaced}
+            changes = {}
+            for name, ids in dirty.items():
+                records = [self.get(name, record_id) for record_id in ids]
+                changes[name] = ([dict(r.items()) for r in records if r is not None],
+                                 [record_id for record_id, r in zip(ids, records) if r is None])
+        with self.backend.transaction():
+            if collections:
+                self.backend.load(collections)
+            for name, (records, deleted) in changes.items():
+                self.backend.save_many(name, records, deleted)
+        return sum(len(records) for records in collections.values()) + sum(
+            len(records) + len(deleted) for records, deleted in changes.values())
+
+    def close(self):
+        """Flush pending writes and stop the flusher thread"""
+        with self._pending:
+            if self._closing:
+                return
+            self._closing = True
+            self._pending.notify_all()
+        self._thread.join(timeout=max(self.flush_interval * 4, 5.0))
+        self.flush()
+
+
+class _WaitAfter:
+    """Wrap a transaction so the writer waits for its flush only after the block is done"""
+
+    def __init__(self, block, storage: WriteBehindStorage):
+        self._block = block
+        self._storage = storage
+
+    def __enter__(self):
+        return self._block.__enter__()
+
+    def __exit__(self, *exc_info):
+        suppressed = self._block.__exit__(*exc_info)
+        if exc_info[0] is None:
+            with self._storage._pending:
+                ticket = self._storage._queued
+            self._storage._wait(ticket)
+        return suppressed
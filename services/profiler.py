@@ -0,0 +1,215 @@
+"""
+Opt-in rerun profiler for the pages
+Enabled with LMS_PROFILE=1. Times DataService calls and ChartService figure
+builders per page section and keeps a rolling history of reruns per session.
+When disabled the decorators return the classes untouched.
+"""
+
+import functools
+import json
+import os
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Iterator
+
+import numpy as np
+import streamlit as st
+from streamlit.runtime.scriptrunner_utils.script_run_context import get_script_run_ctx
+
+ENABLED = os.environ.get('LMS_PROFILE', '') == '1'
+HISTORY_SIZE = 200
+KINDS = ('data', 'chart')
+_STATE_KEY = '_profiler'
+
+
+def _state() -> Optional[Dict[str, Any]]:
+    """Get this session's profiler state, or None outside a script run"""
+    if not ENABLED or get_script_run_ctx() is None:
+        return None
+    if _STATE_KEY not in st.session_state:
+        st.session_state[_STATE_KEY] = {'current': None, 'history': deque(maxlen=HISTORY_SIZE)}
+    return st.session_state[_STATE_KEY]
+
+
+def _current() -> Optional[Dict[str, Any]]:
+    """Get the rerun being recorded, if any"""
+    state = _state()
+    return state['current'] if state else None
+
+
+def _record(rerun: Dict[str, Any], kind: str, name: str, seconds: float) -> Dict[str, Any]:
+    span = {'kind': kind, 'name': name, 'section': len(rerun['sections']) - 1, 'ms': seconds * 1000}
+    rerun['spans'].append(span)
+    return span
+
+
+def _timed_iter(items: Iterator, rerun: Dict[str, Any], kind: str, span: Dict[str, Any]) -> Iterator:
+    """Add the time spent producing each item of a lazy result to its call's span"""
+    while True:
+        rerun['depth'][kind] += 1
+        start = time.perf_counter()
+        try:
+            item = next(items)
+        except StopIteration:
+            return
+        finally:
+            rerun['depth'][kind] -= 1
+            span['ms'] += (time.perf_counter() - start) * 1000
+        yield item
+
+
+def timed(kind: str, name: Optional[str] = None):
+    """Decorate a function so its calls count as kind time ('data' or 'chart') in the current section
+
+    Only the outermost call of each kind is timed, so DataService methods
+    calling each other are not counted twice.
+    """
+    def decorate(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            rerun = _current()
+            if rerun is None or rerun['depth'][kind]:
+                return func(*args, **kwargs)
+            rerun['depth'][kind] += 1
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                rerun['depth'][kind] -= 1
+                span = _record(rerun, kind, label, time.perf_counter() - start)
+            if isinstance(result, Iterator):
+                return _timed_iter(result, rerun, kind, span)
+            return result
+        return wrapper
+    return decorate
+
+
+def instrument(kind: str):
+    """Class decorator timing every public method (static methods included) as kind when profiling"""
+    def decorate(cls):
+        if not ENABLED:
+            return cls
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith('_'):
+                continue
+            label = f"{cls.__name__}.{attr}"
+            if isinstance(value, staticmethod):
+                setattr(cls, attr, staticmethod(timed(kind, label)(value.__func__)))
+            elif callable(value):
+                setattr(cls, attr, timed(kind, label)(value))
+        return cls
+    return decorate
+
+
+def profile_page(page: str):
+    """Start recording a rerun of page, dropping any rerun left unfinished by st.rerun()/st.stop()"""
+    state = _state()
+    if state is None:
+        return
+    start = time.perf_counter()
+    state['current'] = {
+        'page': page,
+        'started': datetime.now().isoformat(timespec='seconds'),
+        'start': start,
+        'sections': [{'name': 'Setup', 'start': start}],
+        'spans': [],
+        'depth': defaultdict(int),
+    }
+
+
+def section(name: str):
+    """Mark the start of the next page section; the previous one ends here"""
+    rerun = _current()
+    if rerun is not None:
+        rerun['sections'].append({'name': name, 'start': time.perf_counter()})
+
+
+@contextmanager
+def timer(kind: str, name: str):
+    """Time a block as kind in the current section, e.g. an expensive pandas pivot"""
+    rerun = _current()
+    if rerun is None or rerun['depth'][kind]:
+        yield
+        return
+    rerun['depth'][kind] += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        rerun['depth'][kind] -= 1
+        _record(rerun, kind, name, time.perf_counter() - start)
+
+
+def finish_rerun() -> Optional[Dict[str, Any]]:
+    """Close the rerun being recorded, add it to the history and get its breakdown"""
+    state = _state()
+    if state is None or state['current'] is None:
+        return None
+    rerun, state['current'] = state['current'], None
+    end = time.perf_counter()
+
+    sections = []
+    bounds = rerun['sections'] + [{'start': end}]
+    for index, (part, following) in enumerate(zip(rerun['sections'], bounds[1:])):
+        total = (following['start'] - part['start']) * 1000
+        kinds = {kind: sum(s['ms'] for s in rerun['spans'] if s['section'] == index and s['kind'] == kind)
+                 for kind in KINDS}
+        sections.append({
+            'section': part['name'],
+            'total_ms': round(total, 2),
+            'data_ms': round(kinds['data'], 2),
+            'chart_ms': round(kinds['chart'], 2),
+            # Widget emission and page-side pandas work
+            'other_ms': round(max(total - kinds['data'] - kinds['chart'], 0.0), 2),
+        })
+
+    calls: Dict[tuple, Dict[str, Any]] = {}
+    for span in rerun['spans']:
+        entry = calls.setdefault((span['kind'], span['name']),
+                                 {'kind': span['kind'], 'name': span['name'], 'calls': 0, 'ms': 0.0})
+        entry['calls'] += 1
+        entry['ms'] += span['ms']
+
+    summary = {
+        'page': rerun['page'],
+        'started': rerun['started'],
+        'total_ms': round((end - rerun['start']) * 1000, 2),
+        'sections': sections,
+        'calls': sorted(({**c, 'ms': round(c['ms'], 2)} for c in calls.values()), key=lambda c: -c['ms']),
+    }
+    state['history'].append(summary)
+    return summary
+
+
+def history(page: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Get this session's recorded reruns, oldest first, optionally only those of page"""
+    state = _state()
+    if state is None:
+        return []
+    return [r for r in state['history'] if page is None or r['page'] == page]
+
+
+def percentiles(reruns: List[Dict[str, Any]], points=(50, 90, 99)) -> List[Dict[str, Any]]:
+    """Get rolling latency percentiles of the whole rerun and of each section over reruns"""
+    timings: Dict[str, List[float]] = defaultdict(list)
+    for rerun in reruns:
+        timings['(rerun)'].append(rerun['total_ms'])
+        for part in rerun['sections']:
+            timings[part['section']].append(part['total_ms'])
+    rows = []
+    for name, values in timings.items():
+        row = {'section': name, 'reruns': len(values)}
+        for p, value in zip(points, np.percentile(values, points)):
+            row[f'p{p}_ms'] = round(float(value), 2)
+        rows.append(row)
+    return rows
+
+
+def export_json(page: Optional[str] = None) -> str:
+    """Get the recorded reruns as JSON, optionally only those of page"""
+    return json.dumps({'exported': datetime.now().isoformat(timespec='seconds'), 'reruns': history(page)},
+                      indent=2)
@@ -0,0 +1,124 @@
+"""
+Collection schema shared by the storage engines
+"""
+
+COLLECTIONS = (
+    'customers', 'projects', 'test_plans', 'rfqs', 'estimations',
+    'test_executions', 'test_results', 'samples', 'trfs', 'documents',
+    'audits', 'ncrs', 'certifications',
+)
+
+# Foreign key fields indexed for each collection
+FOREIGN_KEYS = {
+    'projects': ('client_id',),
+    'test_plans': ('project_id',),
+    'rfqs': ('customer_id',),
+    'estimations': ('rfq_id', 'customer_id'),
+    'test_executions': ('test_plan_id', 'project_id'),
+    'test_results': ('test_plan_id', 'project_id'),
+    'samples': ('project_id',),
+    'trfs': ('project_id',),
+}
+
+# Collection each foreign key field points at
+REFERENCES = {
+    'client_id': 'customers',
+    'customer_id': 'customers',
+    'project_id': 'projects',
+    'test_plan_id': 'test_plans',
+    'rfq_id': 'rfqs',
+}
+
+# What DataService.delete does with the records whose foreign key points at a deleted record:
+# 'cascade' deletes them too, 'restrict' refuses the delete while any exist.
+# References not listed are left pointing at the deleted record.
+ON_DELETE = {
+    ('projects', 'client_id'): 'restrict',
+    ('rfqs', 'customer_id'): 'restrict',
+    ('estimations', 'customer_id'): 'restrict',
+    ('estimations', 'rfq_id'): 'cascade',
+    ('test_plans', 'project_id'): 'cascade',
+    ('test_executions', 'test_plan_id'): 'cascade',
+    ('test_executions', 'project_id'): 'cascade',
+    ('test_results', 'test_plan_id'): 'cascade',
+    ('test_results', 'project_id'): 'cascade',
+    ('samples', 'project_id'): 'cascade',
+    ('trfs', 'project_id'): 'cascade',
+}
+
+# Field stamped with the creation time of each collection's records, and whether it is a date only
+CREATED_FIELDS = {name: ('created_at', False) for name in COLLECTIONS}
+CREATED_FIELDS.update({
+    'rfqs': ('received_date', True),
+    'estimations': ('created_at', True),
+    'documents': ('uploaded_at', False),
+})
+
+# Categorical fields with running value counts for each collection
+COUNTED_FIELDS = {
+    'customers': ('status',),
+    'projects': ('status',),
+    'test_plans': ('status',),
+    'rfqs': ('status',),
+    'estimations': ('status',),
+    'test_executions': ('status',),
+    'test_results': ('pass_fail',),
+    'samples': ('status',),
+    'trfs': ('status',),
+    'documents': ('status', 'category'),
+    'audits': ('status',),
+    'ncrs': ('status', 'severity', 'category'),
+    'certifications': ('status',),
+}
+
+
+def indexed_fields(collection: str) -> tuple:
+    """Get every field a collection keeps an index on"""
+    return FOREIGN_KEYS.get(collection, ()) + COUNTED_FIELDS.get(collection, ())
+
+
+# Additional low-cardinality fields stored as categoricals in DataFrame views
+CATEGORICAL_FIELDS = {
+    'test_plans': ('test_type',),
+    'test_executions': ('result',),
+    'test_results': ('test_type',),
+    'samples': ('sample_type',),
+    'trfs': ('priority',),
+    'audits': ('audit_type',),
+    'certifications': ('cert_type',),
+}
+
+# Date and timestamp fields of each collection
+DATE_FIELDS = {
+    'customers': ('created_at',),
+    'projects': ('start_date', 'end_date', 'created_at'),
+    'test_plans': ('planned_start_date', 'planned_end_date', 'actual_start_date',
+                   'actual_end_date', 'created_at'),
+    'rfqs': ('received_date',),
+    'estimations': ('created_at', 'valid_until'),
+    'test_executions': ('started_at', 'ended_at', 'created_at'),
+    'test_results': ('created_at',),
+    'samples': ('received_date', 'created_at'),
+    'trfs': ('created_at',),
+    'documents': ('uploaded_at',),
+    'audits': ('scheduled_date', 'created_at'),
+    'ncrs': ('detected_date', 'created_at'),
+    'certifications': ('issue_date', 'expiry_date', 'created_at'),
+}
+
+# Free-text fields the list pages search over
+SEARCH_FIELDS = {
+    'customers': ('company_name', 'email', 'contact_person'),
+    'projects': ('name', 'code', 'client_name'),
+    'test_plans': ('name', 'project_name'),
+    'rfqs': ('product', 'customer_name', 'description'),
+    'estimations': ('product', 'customer_name'),
+    'test_executions': ('test_name', 'project_name'),
+    'test_results': ('test_name', 'project_name'),
+    'samples': ('name', 'sample_number', 'project_name'),
+    'trfs': ('trf_number', 'project_name', 'requested_tests'),
+    'documents': ('name', 'description'),
+    'audits': ('name', 'auditor', 'department'),
+    'ncrs': ('title', 'description'),
+    'certifications': ('name', 'cert_number', 'issued_by'),
+}
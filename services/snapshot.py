@@ -0,0 +1,78 @@
+"""
+Binary snapshots of the in-memory collections and their indexes
+A snapshot is a pickle (protocol 5) of the storage state, so loading it
+restores records, ID sequences and ready-built indexes in one pass.
+
+Usage: python -m services.snapshot [path]   # write the demo data snapshot
+"""
+
+import hashlib
+import mmap
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Any, Dict, MutableMapping
+
+from .schema import COLLECTIONS, COUNTED_FIELDS, SEARCH_FIELDS, indexed_fields
+
+DEFAULT_SNAPSHOT_PATH = str(Path(__file__).parent.parent / 'data' / 'lms.snapshot')
+FORMAT_VERSION = 1
+
+# State entries saved next to the collections; DataFrame views are rebuilt on demand
+_INDEX_KEYS = ('_indexes', '_text_indexes', '_range_indexes')
+_META_KEYS = ('_sequences', '_versions')
+
+
+def schema_signature() -> str:
+    """Get a fingerprint of the index layout, so stale snapshot indexes are not reused"""
+    layout = [(name, indexed_fields(name), COUNTED_FIELDS.get(name, ()), SEARCH_FIELDS.get(name, ()))
+              for name in COLLECTIONS]
+    return hashlib.sha1(repr((FORMAT_VERSION, layout)).encode()).hexdigest()
+
+
+def save_snapshot(state: MutableMapping, path: str):
+    """Write the collections, sequences and indexes held in state to path"""
+    payload = {
+        'format': FORMAT_VERSION,
+        'schema': schema_signature(),
+        'state': {key: state[key] for key in COLLECTIONS + _INDEX_KEYS + _META_KEYS if key in state},
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(payload, f, protocol=5)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path: str) -> mmap.mmap:
+    """Map a snapshot file into memory so it can be loaded repeatedly without re-reading it"""
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def load_snapshot(data: Any) -> Dict[str, Any]:
+    """Restore state from snapshot bytes (or a mapped file), getting a private copy each call
+
+    Indexes saved under a different index layout are dropped and get rebuilt on first use.
+    """
+    payload = pickle.loads(data)
+    if payload.get('format') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format: {payload.get('format')}")
+    state = payload['state']
+    if payload.get('schema') != schema_signature():
+        for key in _INDEX_KEYS:
+            state.pop(key, None)
+    return state
+
+
+if __name__ == '__main__':
+    from data.sample_data import build_sample_data
+    from .storage import MemoryStorage
+
+    target = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_SNAPSHOT_PATH
+    storage = MemoryStorage({})
+    storage.load(build_sample_data())
+    storage.build_indexes()
+    save_snapshot(storage.state, target)
+    print(f"Wrote {target}")
@@ -0,0 +1,1188 @@
+"""
+Storage engines used by DataService
+Session state (default) keeps lists of dicts per browser session,
+shared keeps one in-memory copy for the whole process,
+SQLite keeps a single on-disk database shared by all sessions.
+sandbox layers per-session changes over one shared copy (see overlay.py).
+The in-memory engines can hold typed, slotted records instead of dicts
+"""
+
+import heapq
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Callable, Iterable, Iterator, MutableMapping, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from models import MODELS
+
+from .dates import as_datetime, normalize
+from .frames import build_frame
+from .indexes import CollectionIndex, RangeIndex, TextIndex, tokenize
+from .locking import ReadWriteLock
+from .schema import COLLECTIONS, COUNTED_FIELDS, DATE_FIELDS, SEARCH_FIELDS, indexed_fields
+from .snapshot import load_snapshot, read_snapshot, save_snapshot
+
+DEFAULT_SQLITE_PATH = str(Path(__file__).parent.parent / 'data' / 'lms.db')
+
+# The in-memory engines compact a collection once this many deleted records, and at least
+# this share of its list, are tombstones
+COMPACT_MIN_TOMBSTONES = 64
+COMPACT_RATIO = 0.25
+
+# Idle SQLite connections kept open for reuse; more are opened while many threads query at once
+SQLITE_POOL_SIZE = 8
+
+# Per-record write counter; records that were never updated do not have it and are at version 0
+VERSION_FIELD = '_version'
+
+
+class ConflictError(Exception):
+    """Raised by an update whose expected version is not the record's current one"""
+
+    def __init__(self, collection: str, record_id: int, expected: int, actual: int):
+        self.collection = collection
+        self.record_id = record_id
+        self.expected = expected
+        self.actual = actual
+        super().__init__(f"{collection} record {record_id} was changed by someone else "
+                         f"(version {actual}, expected {expected})")
+
+
+def record_version(record: Dict[str, Any]) -> int:
+    """Get the number of times a record has been updated"""
+    return record.get(VERSION_FIELD) or 0
+
+
+class Storage:
+    """Interface implemented by every storage engine"""
+
+    def all(self, collection: str) -> List[Dict[str, Any]]:
+        """Get all records of a collection"""
+        raise NotImplementedError
+
+    def get(self, collection: str, record_id: int) -> Optional[Dict[str, Any]]:
+        """Get record by ID"""
+        raise NotImplementedError
+
+    def get_many(self, collection: str, record_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Get records by ID in the given order, skipping missing ones"""
+        records = (self.get(collection, record_id) for record_id in record_ids)
+        return [record for record in records if record is not None]
+
+    def count(self, collection: str) -> int:
+        """Get the number of records in a collection"""
+        raise NotImplementedError
+
+    def page(self, collection: str, offset: int = 0, limit: int = 20, order_by: str = 'id',
+             descending: bool = False, after: Optional[Tuple[Any, int]] = None) -> List[Dict[str, Any]]:
+        """Get one page of records ordered by (order_by, id)
+
+        after is the (order_by value, id) of the last record already seen and
+        continues from there (keyset paging); missing values sort first.
+        Only offset + limit records are kept while scanning.
+        """
+        def key(record):
+            value = record.get(order_by)
+            return (value is not None, value, record['id'])
+
+        records = self.all(collection)
+        if after is not None:
+            start = key({order_by: after[0], 'id': after[1]})
+            if descending:
+                records = (r for r in records if key(r) < start)
+            else:
+                records = (r for r in records if key(r) > start)
+        select = heapq.nlargest if descending else heapq.nsmallest
+        return select(offset + limit, records, key=key)[offset:]
+
+    def find_by(self, collection: str, field: str, value: Any) -> List[Dict[str, Any]]:
+        """Get records whose indexed field equals value"""
+        raise NotImplementedError
+
+    def count_where(self, collection: str, field: str, value: Any) -> int:
+        """Get the number of records whose indexed field equals value"""
+        return len(self.find_by(collection, field, value))
+
+    def date_range(self, collection: str, field: str, start: Any = None, end: Any = None) -> List[Dict[str, Any]]:
+        """Get records whose date field is in [start, end), ordered by it then ID"""
+        start, end = as_datetime(start), as_datetime(end)
+        keyed = [(as_datetime(r.get(field)), r['id'], r) for r in self.all(collection)]
+        return [r for key, _, r in sorted(keyed, key=lambda k: k[:2])
+                if key is not None and (start is None or key >= start) and (end is None or key < end)]
+
+    def count_by(self, collection: str, field: str) -> Dict[Any, int]:
+        """Get record counts per value of a counted field"""
+        raise NotImplementedError
+
+    def count_distinct(self, collection: str, field: str) -> int:
+        """Get the number of distinct non-null values of an indexed field"""
+        raise NotImplementedError
+
+    def insert(self, collection: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a new record"""
+        raise NotImplementedError
+
+    def update(self, collection: str, record_id: int, updates: Dict[str, Any],
+               expected_version: Optional[int] = None) -> bool:
+        """Update a record, returning False if it does not exist
+
+        Every update bumps the record's version. With expected_version the
+        update only applies if the record is still at that version (compare
+        and set) and raises ConflictError otherwise.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _versioned(collection: str, record: Dict[str, Any], updates: Dict[str, Any],
+                   expected_version: Optional[int] = None) -> Dict[str, Any]:
+        """Check a record against the expected version and get the updates with its next version
+
+        Updates that set the version themselves, i.e. undoing a write, keep it.
+        """
+        version = record_version(record)
+        if expected_version is not None and version != expected_version:
+            raise ConflictError(collection, record['id'], expected_version, version)
+        return {VERSION_FIELD: version + 1, **updates}
+
+    def delete(self, collection: str, record_id: int) -> bool:
+        """Delete a record; references to it are left alone (see DataService.delete for ON_DELETE rules)"""
+        raise NotImplementedError
+
+    def insert_many(self, collection: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Store a batch of new records"""
+        return [self.insert(collection, record) for record in records]
+
+    def update_many(self, collection: str, updates: Dict[int, Dict[str, Any]]) -> int:
+        """Update a batch of records, returning how many existed"""
+        return sum(self.update(collection, record_id, changes) for record_id, changes in updates.items())
+
+    def reserve_ids(self, collection: str, count: int = 1) -> range:
+        """Atomically reserve a block of new IDs; IDs are never handed out twice"""
+        raise NotImplementedError
+
+    def next_id(self, collection: str) -> int:
+        """Allocate a single new ID"""
+        return self.reserve_ids(collection, 1)[0]
+
+    def load(self, data: Dict[str, List[Dict[str, Any]]]):
+        """Replace the given collections with new records"""
+        raise NotImplementedError
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Make the writes in the block atomic, undoing all of them if it raises
+
+        Engines record how to revert each write with _logged(); a nested block
+        joins the outermost one.
+        """
+        if getattr(self, '_undo', None) is not None:
+            yield
+            return
+        self._undo = []
+        try:
+            yield
+        except BaseException:
+            undo, self._undo = self._undo, None
+            for revert in reversed(undo):
+                revert()
+            raise
+        finally:
+            self._undo = None
+
+    def _logged(self, revert: Callable[[], Any]):
+        """Remember how to revert a write made inside a transaction"""
+        undo = getattr(self, '_undo', None)
+        if undo is not None:
+            undo.append(revert)
+
+    def reseed(self):
+        """Replace every collection with the demo data"""
+        from data.sample_data import build_sample_data
+        self.load(build_sample_data())
+
+    def is_empty(self) -> bool:
+        """Check whether no collection holds any record"""
+        return all(self.count(name) == 0 for name in COLLECTIONS)
+
+    def save_snapshot(self, path: str):
+        """Write the data and its indexes to a binary snapshot file"""
+        raise NotImplementedError(f"{type(self).__name__} does not support snapshots")
+
+    def version(self, collection: str) -> int:
+        """Get a counter that changes whenever the collection is written to"""
+        raise NotImplementedError
+
+    def frame(self, collection: str) -> pd.DataFrame:
+        """Get a columnar snapshot of a collection, rebuilt only after it changes"""
+        cache = self._frames()
+        version = self.version(collection)
+        cached = cache.get(collection)
+        if cached is None or cached[0] != version:
+            cached = (version, build_frame(collection, self.all(collection)))
+            cache[collection] = cached
+        return cached[1]
+
+    def _frames(self) -> Dict[str, tuple]:
+        """Get the collection -> (version, DataFrame) cache"""
+        if not hasattr(self, '_frame_cache'):
+            self._frame_cache = {}
+        return self._frame_cache
+
+    def memo_cache(self) -> Dict[tuple, tuple]:
+        """Get the (method, arguments) -> (generations, result) cache of services.memo"""
+        if not hasattr(self, '_memo_cache'):
+            self._memo_cache = {}
+        return self._memo_cache
+
+    def search(self, collection: str, query: str, limit: Optional[int] = None) -> List[int]:
+        """Get IDs of records whose search fields contain every query word as a prefix, best match first"""
+        if not hasattr(self, '_text_cache'):
+            self._text_cache = {}
+        version = self.version(collection)
+        cached = self._text_cache.get(collection)
+        if cached is None or cached[0] != version:
+            cached = (version, TextIndex(self.all(collection), SEARCH_FIELDS.get(collection, ())))
+            self._text_cache[collection] = cached
+        return cached[1].search(query, limit)
+
+
+class MemoryStorage(Storage):
+    """Storage engine keeping each collection as a list of dicts in a mapping
+
+    With typed=True records are stored as the slotted dataclasses in
+    models.MODELS, which keep a dict-style interface for the pages.
+    """
+
+    def __init__(self, state: MutableMapping, typed: bool = False,
+                 seed: Optional[Callable[[str], List[Dict[str, Any]]]] = None):
+        """Use state (e.g. st.session_state) to hold the collections
+
+        seed(name) builds the records of a collection emptied by defer() when it is first used.
+        """
+        self.state = state
+        self.typed = typed
+        self.seed = seed
+        # collections that reached the tombstone threshold inside the open transaction
+        self._compact_pending: set = set()
+        for name in COLLECTIONS:
+            if name not in state:
+                state[name] = []
+            elif typed and any(isinstance(record, dict) for record in state[name]):
+                state[name] = [self._record(name, record) for record in state[name]]
+        if '_indexes' not in state:
+            state['_indexes'] = {}
+        # collection -> last allocated ID
+        if '_sequences' not in state:
+            state['_sequences'] = {}
+        # collection -> write counter, and the DataFrame views built from it
+        if '_versions' not in state:
+            state['_versions'] = {}
+        if '_frames' not in state:
+            state['_frames'] = {}
+        if '_memo' not in state:
+            state['_memo'] = {}
+        if '_text_indexes' not in state:
+            state['_text_indexes'] = {}
+        # collection -> date field -> RangeIndex, built on first range query
+        if '_range_indexes' not in state:
+            state['_range_indexes'] = {}
+        # collections waiting for seed() on first access
+        if '_unseeded' not in state:
+            state['_unseeded'] = set()
+        # collection -> ID -> deleted record still in the list, until compact() drops it
+        if '_tombstones' not in state:
+            state['_tombstones'] = {}
+        # collection -> (version, list without the tombstones) for all()
+        if '_live' not in state:
+            state['_live'] = {}
+
+    def _records(self, collection: str) -> List[Dict[str, Any]]:
+        """Get the stored list of a collection, seeding it first if it was deferred"""
+        if collection in self.state['_unseeded'] and self.seed is not None:
+            self.state[collection] = [self._record(collection, record) for record in self.seed(collection)]
+            self.state['_sequences'].pop(collection, None)
+            self.state['_tombstones'].pop(collection, None)
+            self.state['_unseeded'].discard(collection)
+        return self.state[collection]
+
+    def defer(self, collections: Iterable[str]):
+        """Empty the given collections and seed each one when it is first used"""
+        for name in collections:
+            self.state[name] = []
+            self.state['_sequences'].pop(name, None)
+            self.state['_tombstones'].pop(name, None)
+            self.state['_unseeded'].add(name)
+            self._touch(name)
+
+    def reseed(self):
+        if self.seed is None:
+            super().reseed()
+        else:
+            self.defer(COLLECTIONS)
+
+    def _record(self, collection: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the record as stored, converting dicts to the collection's model in typed mode"""
+        if self.typed and isinstance(record, dict):
+            return MODELS[collection].from_dict(record)
+        return record
+
+    def _index(self, collection: str) -> CollectionIndex:
+        """Get the index for a collection, rebuilding it if the list was replaced"""
+        indexes = self.state['_indexes']
+        records = self._records(collection)
+        index = indexes.get(collection)
+        if index is None or index.records is not records:
+            # Counted fields get ID buckets too so status filters can use them
+            index = CollectionIndex(records, indexed_fields(collection),
+                                    COUNTED_FIELDS.get(collection, ()))
+            self._unindex_tombstones(collection, index)
+            indexes[collection] = index
+        return index
+
+    def _text_index(self, collection: str) -> TextIndex:
+        """Get the full-text index for a collection, rebuilding it if the list was replaced"""
+        indexes = self.state['_text_indexes']
+        records = self._records(collection)
+        index = indexes.get(collection)
+        if index is None or index.records is not records:
+            index = TextIndex(records, SEARCH_FIELDS.get(collection, ()))
+            self._unindex_tombstones(collection, index)
+            indexes[collection] = index
+        return index
+
+    def _unindex_tombstones(self, collection: str, index: Any):
+        """Drop the deleted records from an index built over the whole list"""
+        for record in self.state['_tombstones'].get(collection, {}).values():
+            index.remove(record)
+
+    def search(self, collection: str, query: str, limit: Optional[int] = None) -> List[int]:
+        return self._text_index(collection).search(query, limit)
+
+    def _range_index(self, collection: str, field: str) -> RangeIndex:
+        """Get the range index for a date field, building it on first use"""
+        indexes = self.state['_range_indexes'].setdefault(collection, {})
+        records = self._records(collection)
+        index = indexes.get(field)
+        if index is None or index.records is not records:
+            index = RangeIndex(records, field)
+            self._unindex_tombstones(collection, index)
+            indexes[field] = index
+        return index
+
+    def _range_indexes(self, collection: str) -> List[RangeIndex]:
+        """Get the range indexes built so far that still cover the collection"""
+        records = self._records(collection)
+        return [index for index in self.state['_range_indexes'].get(collection, {}).values()
+                if index.records is records]
+
+    def date_range(self, collection: str, field: str, start: Any = None, end: Any = None) -> List[Dict[str, Any]]:
+        index = self._index(collection)
+        ids = self._range_index(collection, field).between(as_datetime(start), as_datetime(end))
+        return [index.get(record_id) for record_id in ids]
+
+    def _touch(self, collection: str):
+        """Record a write to a collection"""
+        versions = self.state['_versions']
+        versions[collection] = versions.get(collection, 0) + 1
+
+    def version(self, collection: str) -> int:
+        return self.state['_versions'].get(collection, 0)
+
+    def _frames(self) -> Dict[str, tuple]:
+        return self.state['_frames']
+
+    def memo_cache(self) -> Dict[tuple, tuple]:
+        return self.state['_memo']
+
+    def all(self, collection: str) -> List[Dict[str, Any]]:
+        records = self._records(collection)
+        dead = self.state['_tombstones'].get(collection)
+        if not dead:
+            return records
+        version = self.version(collection)
+        cached = self.state['_live'].get(collection)
+        if cached is None or cached[0] != version:
+            cached = (version, [r for r in records if dead.get(r['id']) is not r])
+            self.state['_live'][collection] = cached
+        return cached[1]
+
+    def get(self, collection: str, record_id: int) -> Optional[Dict[str, Any]]:
+        return self._index(collection).get(record_id)
+
+    def count(self, collection: str) -> int:
+        return len(self._records(collection)) - len(self.state['_tombstones'].get(collection, ()))
+
+    def find_by(self, collection: str, field: str, value: Any) -> List[Dict[str, Any]]:
+        return self._index(collection).find(field, value)
+
+    def count_where(self, collection: str, field: str, value: Any) -> int:
+        return len(self._index(collection).by_fk[field].get(value, ()))
+
+    def count_by(self, collection: str, field: str) -> Dict[Any, int]:
+        return self._index(collection).count_by(field)
+
+    def count_distinct(self, collection: str, field: str) -> int:
+        return len(self._index(collection).values(field))
+
+    def insert(self, collection: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        record = self._record(collection, record)
+        index = self._index(collection)
+        text_index = self._text_index(collection)
+        range_indexes = self._range_indexes(collection)
+        self._purge(collection, record['id'])
+        self.state[collection].append(record)
+        index.add(record)
+        text_index.add(record)
+        for range_index in range_indexes:
+            range_index.add(record)
+        sequences = self.state['_sequences']
+        if collection in sequences and record['id'] > sequences[collection]:
+            sequences[collection] = record['id']
+        self._touch(collection)
+        self._logged(lambda: self.delete(collection, record['id']))
+        return record
+
+    def update(self, collection: str, record_id: int, updates: Dict[str, Any],
+               expected_version: Optional[int] = None) -> bool:
+        index = self._index(collection)
+        record = index.get(record_id)
+        if record is None:
+            return False
+        updates = self._versioned(collection, record, updates, expected_version)
+        before = {field: record.get(field) for field in updates}
+        self._logged(lambda: self.update(collection, record_id, before))
+        self._text_index(collection).update(record, updates)
+        for range_index in self._range_indexes(collection):
+            range_index.update(record, updates)
+        index.update(record, updates)
+        self._touch(collection)
+        return True
+
+    def delete(self, collection: str, record_id: int) -> bool:
+        # The record stays in the list as a tombstone, so only the indexes change
+        index = self._index(collection)
+        record = index.get(record_id)
+        if record is not None:
+            index.remove(record)
+            self._text_index(collection).remove(record)
+            for range_index in self._range_indexes(collection):
+                range_index.remove(record)
+            dead = self.state['_tombstones'].setdefault(collection, {})
+            dead[record_id] = record
+            self._touch(collection)
+            self._logged(lambda: self._revive(collection, record))
+            if (len(dead) >= COMPACT_MIN_TOMBSTONES
+                    and len(dead) >= COMPACT_RATIO * len(self.state[collection])):
+                self._compact_later(collection)
+        return True
+
+    def _revive(self, collection: str, record: Dict[str, Any]):
+        """Undo the delete of a record, putting it back in the list if it was compacted meanwhile"""
+        if self.state['_tombstones'].get(collection, {}).pop(record['id'], None) is None:
+            self.state[collection].append(record)
+        self._index(collection).add(record)
+        self._text_index(collection).add(record)
+        for range_index in self._range_indexes(collection):
+            range_index.add(record)
+        self._touch(collection)
+
+    def _purge(self, collection: str, record_id: int):
+        """Drop the tombstone of a deleted record right away, before its ID is inserted again"""
+        record = self.state['_tombstones'].get(collection, {}).pop(record_id, None)
+        if record is not None:
+            records = self.state[collection]
+            del records[next(i for i, r in enumerate(records) if r is record)]
+
+    def _compact_later(self, collection: str):
+        """Compact a collection that reached the tombstone threshold, once any open transaction commits"""
+        if getattr(self, '_undo', None) is None:
+            self.compact(collection)
+        else:
+            self._compact_pending.add(collection)
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        # Compactions due inside the block run after the outermost block commits
+        if getattr(self, '_undo', None) is not None:
+            yield
+            return
+        try:
+            with super().transaction():
+                yield
+            for name in self._compact_pending:
+                self.compact(name)
+        finally:
+            self._compact_pending = set()
+
+    def compact(self, collection: Optional[str] = None) -> int:
+        """Drop the tombstones of deleted records from one or every collection, returning how many
+
+        The list is filtered in place, so the indexes built over it stay valid.
+        """
+        dropped = 0
+        sequences = self.state['_sequences']
+        for name in [collection] if collection else COLLECTIONS:
+            dead = self.state['_tombstones'].pop(name, None)
+            if dead:
+                # reserve_ids falls back to the highest ID in the list, so keep deleted IDs from coming back
+                last = max(r['id'] for r in self.state[name])
+                sequences[name] = max(sequences.get(name, 0), last)
+                self.state[name][:] = [r for r in self.state[name] if dead.get(r['id']) is not r]
+                dropped += len(dead)
+        return dropped
+
+    def insert_many(self, collection: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not records:
+            return records
+        records = [self._record(collection, record) for record in records]
+        index = self._index(collection)
+        text_index = self._text_index(collection)
+        range_indexes = self._range_indexes(collection)
+        if self.state['_tombstones'].get(collection):
+            for record in records:
+                self._purge(collection, record['id'])
+        self.state[collection].extend(records)
+        index.add_many(records)
+        for record in records:
+            text_index.add(record)
+            for range_index in range_indexes:
+                range_index.add(record)
+        sequences = self.state['_sequences']
+        last = max(record['id'] for record in records)
+        if collection in sequences and last > sequences[collection]:
+            sequences[collection] = last
+        self._touch(collection)
+        self._logged(lambda: [self.delete(collection, record['id']) for record in records])
+        return records
+
+    def update_many(self, collection: str, updates: Dict[int, Dict[str, Any]]) -> int:
+        index = self._index(collection)
+        text_index = self._text_index(collection)
+        range_indexes = self._range_indexes(collection)
+        updated = 0
+        for record_id, changes in updates.items():
+            record = index.get(record_id)
+            if record is not None:
+                changes = self._versioned(collection, record, changes)
+                before = {field: record.get(field) for field in changes}
+                self._logged(lambda record_id=record_id, before=before: self.update(collection, record_id, before))
+                text_index.update(record, changes)
+                for range_index in range_indexes:
+                    range_index.update(record, changes)
+                index.update(record, changes)
+                updated += 1
+        if updated:
+            self._touch(collection)
+        return updated
+
+    def reserve_ids(self, collection: str, count: int = 1) -> range:
+        sequences = self.state['_sequences']
+        last = sequences.get(collection)
+        if last is None:
+            last = max((r['id'] for r in self._records(collection)), default=0)
+        sequences[collection] = last + count
+        return range(last + 1, last + count + 1)
+
+    def build_indexes(self):
+        """Build every collection's lookup and text indexes now rather than on first use"""
+        for name in COLLECTIONS:
+            self._index(name)
+            self._text_index(name)
+
+    def save_snapshot(self, path: str):
+        self.compact()
+        self.build_indexes()
+        save_snapshot(self.state, path)
+
+    def load(self, data: Dict[str, List[Dict[str, Any]]]):
+        previous = {name: self.all(name) for name in data}
+        self._logged(lambda: self.load(previous))
+        for name, records in data.items():
+            self.state[name] = [self._record(name, record) for record in records]
+            self.state['_sequences'].pop(name, None)
+            self.state['_tombstones'].pop(name, None)
+            self.state['_unseeded'].discard(name)
+            self._touch(name)
+
+
+class SharedMemoryStorage(MemoryStorage):
+    """Memory storage shared by every session of the process
+
+    Streamlit runs each session's script in its own thread, so reads share a
+    reader-writer lock and writes hold it exclusively. Indexes built lazily
+    under the read lock are deterministic, so two readers racing to build one
+    store equivalent copies.
+    """
+
+    def __init__(self, state: Optional[MutableMapping] = None, typed: bool = False):
+        """Hold the collections in state, a new dict by default"""
+        self._lock = ReadWriteLock()
+        self._compacting: set = set()
+        self._compacting_lock = threading.Lock()
+        super().__init__(state if state is not None else {}, typed)
+
+    def _index(self, collection: str) -> CollectionIndex:
+        with self._lock.read():
+            return super()._index(collection)
+
+    def _text_index(self, collection: str) -> TextIndex:
+        with self._lock.read():
+            return super()._text_index(collection)
+
+    def search(self, collection: str, query: str, limit: Optional[int] = None) -> List[int]:
+        with self._lock.read():
+            return super().search(collection, query, limit)
+
+    def date_range(self, collection: str, field: str, start: Any = None, end: Any = None) -> List[Dict[str, Any]]:
+        with self._lock.read():
+            return super().date_range(collection, field, start, end)
+
+    def find_by(self, collection: str, field: str, value: Any) -> List[Dict[str, Any]]:
+        with self._lock.read():
+            return super().find_by(collection, field, value)
+
+    def count_where(self, collection: str, field: str, value: Any) -> int:
+        with self._lock.read():
+            return super().count_where(collection, field, value)
+
+    def count_by(self, collection: str, field: str) -> Dict[Any, int]:
+        with self._lock.read():
+            return super().count_by(collection, field)
+
+    def page(self, collection: str, offset: int = 0, limit: int = 20, order_by: str = 'id',
+             descending: bool = False, after: Optional[Tuple[Any, int]] = None) -> List[Dict[str, Any]]:
+        with self._lock.read():
+            return super().page(collection, offset, limit, order_by, descending, after)
+
+    def count_distinct(self, collection: str, field: str) -> int:
+        with self._lock.read():
+            return super().count_distinct(collection, field)
+
+    def all(self, collection: str) -> List[Dict[str, Any]]:
+        with self._lock.read():
+            return super().all(collection)
+
+    def insert(self, collection: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock.write():
+            return super().insert(collection, record)
+
+    def update(self, collection: str, record_id: int, updates: Dict[str, Any],
+               expected_version: Optional[int] = None) -> bool:
+        # The version check and the write happen under one write lock
+        with self._lock.write():
+            return super().update(collection, record_id, updates, expected_version)
+
+    def delete(self, collection: str, record_id: int) -> bool:
+        with self._lock.write():
+            return super().delete(collection, record_id)
+
+    def insert_many(self, collection: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        with self._lock.write():
+            return super().insert_many(collection, records)
+
+    def update_many(self, collection: str, updates: Dict[int, Dict[str, Any]]) -> int:
+        with self._lock.write():
+            return super().update_many(collection, updates)
+
+    def reserve_ids(self, collection: str, count: int = 1) -> range:
+        with self._lock.write():
+            return super().reserve_ids(collection, count)
+
+    def save_snapshot(self, path: str):
+        with self._lock.write():
+            super().save_snapshot(path)
+
+    def load(self, data: Dict[str, List[Dict[str, Any]]]):
+        with self._lock.write():
+            super().load(data)
+
+    def compact(self, collection: Optional[str] = None) -> int:
+        with self._lock.write():
+            return super().compact(collection)
+
+    def _compact_later(self, collection: str):
+        # Compact in the background; the thread waits for the write lock, so any transaction finishes first
+        with self._compacting_lock:
+            if collection in self._compacting:
+                return
+            self._compacting.add(collection)
+
+        def run():
+            try:
+                self.compact(collection)
+            finally:
+                with self._compacting_lock:
+                    self._compacting.discard(collection)
+
+        threading.Thread(target=run, name=f'lms-compact-{collection}', daemon=True).start()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        # Other sessions see none of the block's writes until all of them are made
+        with self._lock.write(), super().transaction():
+            yield
+
+
+class SQLiteStorage(Storage):
+    """Storage engine backed by a SQLite database in WAL mode
+
+    Each collection is a table with the record stored as JSON plus one
+    indexed column per foreign key and counted field, so lookups, filters
+    and counts run in SQL. Date fields are stored as ISO strings, indexed as
+    SQLite datetimes and turned back into date/datetime objects on read.
+    Search fields are mirrored, pre-tokenized, into an FTS5 table per
+    collection. Statements use bound parameters and are
+    built once per collection so sqlite3's statement cache can reuse them;
+    connections are pooled so the cache outlives a rerun.
+    """
+
+    def __init__(self, path: str, synchronous: str = 'NORMAL'):
+        """Open (or create) the database at path, with the given PRAGMA synchronous level"""
+        self.path = path
+        self.synchronous = synchronous
+        # Idle connections, and the connection a thread's open transaction runs on
+        self._pool: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()
+        self._columns = {name: indexed_fields(name) for name in COLLECTIONS}
+        self._sql = {name: self._statements(name) for name in COLLECTIONS}
+        with self._write() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS sequences (name TEXT PRIMARY KEY, last_id INTEGER NOT NULL)')
+            conn.execute('CREATE TABLE IF NOT EXISTS versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL)')
+            for name in COLLECTIONS:
+                columns = ''.join(f', {column}' for column in self._columns[name])
+                conn.execute(f'CREATE TABLE IF NOT EXISTS {name} (id INTEGER PRIMARY KEY{columns}, data TEXT NOT NULL)')
+                for column in self._columns[name]:
+                    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{name}_{column} ON {name} ({column})')
+                for field in DATE_FIELDS.get(name, ()):
+                    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{name}_{field} ON {name} ({self._date_expr(field)})')
+                conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {name}_search USING fts5({', '.join(SEARCH_FIELDS[name])})")
+                # Backfill databases created before the search tables existed
+                if (conn.execute(f'SELECT COUNT(*) FROM {name}_search').fetchone()[0]
+                        != conn.execute(f'SELECT COUNT(*) FROM {name}').fetchone()[0]):
+                    conn.execute(f'DELETE FROM {name}_search')
+                    conn.executemany(self._sql[name]['search_insert'],
+                                     [self._search_row(name, json.loads(data)) for (data,) in conn.execute(f'SELECT data FROM {name}')])
+
+    def _open(self) -> sqlite3.Connection:
+        """Open a new connection to the database"""
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(f'PRAGMA synchronous={self.synchronous}')
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Lease an idle connection from the pool for the block, or use the one this thread's transaction holds
+
+        Streamlit runs every rerun on a new thread, so connections are pooled
+        rather than kept per thread; their setup and statement caches carry
+        over between reruns.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            yield conn
+            return
+        with self._pool_lock:
+            conn = self._pool.pop() if self._pool else None
+        if conn is None:
+            conn = self._open()
+        try:
+            yield conn
+        finally:
+            with self._pool_lock:
+                kept = len(self._pool) < SQLITE_POOL_SIZE
+                if kept:
+                    self._pool.append(conn)
+            if not kept:
+                conn.close()
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Get a connection for a write, committed at the end unless a transaction is open"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            yield conn
+            return
+        with self._connection() as conn, conn:
+            yield conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        if getattr(self._local, 'conn', None) is not None:
+            yield
+            return
+        with self._connection() as conn:
+            # IMMEDIATE takes the database write lock up front, so the block cannot fail half way on a busy database
+            conn.execute('BEGIN IMMEDIATE')
+            self._local.conn = conn
+            try:
+                yield
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+            finally:
+                self._local.conn = None
+
+    def _statements(self, name: str) -> Dict[str, str]:
+        """Build the parameterised statements for a collection"""
+        columns = ('id',) + self._columns[name] + ('data',)
+        search_columns = ('rowid',) + SEARCH_FIELDS[name]
+        return {
+            'all': f'SELECT data FROM {name} ORDER BY id',
+            'get': f'SELECT data FROM {name} WHERE id = ?',
+            'count': f'SELECT COUNT(*) FROM {name}',
+            'insert': f"INSERT INTO {name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            'upsert': f"INSERT OR REPLACE INTO {name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            'update': f"UPDATE {name} SET {', '.join(f'{c} = ?' for c in columns[1:])} WHERE id = ?",
+            'delete': f'DELETE FROM {name} WHERE id = ?',
+            'clear': f'DELETE FROM {name}',
+            'init_sequence': f'INSERT OR IGNORE INTO sequences (name, last_id) SELECT ?, COALESCE(MAX(id), 0) FROM {name}',
+            'search': f'SELECT rowid FROM {name}_search WHERE {name}_search MATCH ? ORDER BY rank, rowid LIMIT ?',
+            'search_insert': f"INSERT INTO {name}_search ({', '.join(search_columns)}) VALUES ({', '.join('?' * len(search_columns))})",
+            'search_delete': f'DELETE FROM {name}_search WHERE rowid = ?',
+            'search_clear': f'DELETE FROM {name}_search',
+        }
+
+    @staticmethod
+    def _date_expr(field: str) -> str:
+        """Get the SQL expression a date field is indexed and compared by"""
+        return f"datetime(json_extract(data, '$.{field}'))"
+
+    def _decode(self, collection: str, data: str) -> Dict[str, Any]:
+        """Turn a stored JSON document back into a record"""
+        return normalize(collection, json.loads(data))
+
+    def _column(self, collection: str, field: str) -> str:
+        """Validate that field is an indexed column of collection"""
+        if field not in self._columns[collection]:
+            raise KeyError(field)
+        return field
+
+    def _row(self, collection: str, record: Dict[str, Any]) -> tuple:
+        """Get the column values stored for a record"""
+        return ((record['id'],) + tuple(record.get(c) for c in self._columns[collection])
+                + (json.dumps(record, default=str),))
+
+    def _search_row(self, collection: str, record: Dict[str, Any]) -> tuple:
+        """Get the tokenized search text stored for a record"""
+        return (record['id'],) + tuple(' '.join(tokenize(record.get(field))) for field in SEARCH_FIELDS[collection])
+
+    def _touch(self, conn: sqlite3.Connection, collection: str):
+        """Record a write to a collection inside the caller's transaction"""
+        conn.execute(
+            'INSERT INTO versions (name, version) VALUES (?, 1) '
+            'ON CONFLICT (name) DO UPDATE SET version = version + 1',
+            (collection,),
+        )
+
+    def version(self, collection: str) -> int:
+        with self._connection() as conn:
+            row = conn.execute('SELECT version FROM versions WHERE name = ?', (collection,)).fetchone()
+            return row[0] if row else 0
+
+    def all(self, collection: str) -> List[Dict[str, Any]]:
+        with self._connection() as conn:
+            rows = conn.execute(self._sql[collection]['all'])
+            return [self._decode(collection, data) for (data,) in rows]
+
+    def get(self, collection: str, record_id: int) -> Optional[Dict[str, Any]]:
+        with self._connection() as conn:
+            row = conn.execute(self._sql[collection]['get'], (record_id,)).fetchone()
+            return self._decode(collection, row[0]) if row else None
+
+    def get_many(self, collection: str, record_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        record_ids = [int(i) for i in record_ids]
+        found = {}
+        # Stay under SQLite's bound parameter limit
+        with self._connection() as conn:
+            for start in range(0, len(record_ids), 500):
+                chunk = record_ids[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT id, data FROM {collection} WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+                )
+                found.update((record_id, self._decode(collection, data)) for record_id, data in rows)
+        return [found[i] for i in record_ids if i in found]
+
+    def count(self, collection: str) -> int:
+        with self._connection() as conn:
+            return conn.execute(self._sql[collection]['count']).fetchone()[0]
+
+    def date_range(self, collection: str, field: str, start: Any = None, end: Any = None) -> List[Dict[str, Any]]:
+        if field not in DATE_FIELDS.get(collection, ()):
+            raise KeyError(field)
+        expr = self._date_expr(field)
+        conditions, params = [f'{expr} IS NOT NULL'], []
+        if start is not None:
+            conditions.append(f'{expr} >= ?')
+            params.append(str(as_datetime(start)))
+        if end is not None:
+            conditions.append(f'{expr} < ?')
+            params.append(str(as_datetime(end)))
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT data FROM {collection} WHERE {' AND '.join(conditions)} ORDER BY {expr}, id", params
+            )
+            return [self._decode(collection, data) for (data,) in rows]
+
+    def search(self, collection: str, query: str, limit: Optional[int] = None) -> List[int]:
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        with self._connection() as conn:
+            rows = conn.execute(self._sql[collection]['search'], (match, -1 if limit is None else limit))
+            return [record_id for (record_id,) in rows]
+
+    def page(self, collection: str, offset: int = 0, limit: int = 20, order_by: str = 'id',
+             descending: bool = False, after: Optional[Tuple[Any, int]] = None) -> List[Dict[str, Any]]:
+        if order_by == 'id' or order_by in self._columns[collection]:
+            column = order_by
+        elif order_by.isidentifier():
+            column = f"json_extract(data, '$.{order_by}')"
+        else:
+            raise KeyError(order_by)
+        direction = 'DESC' if descending else 'ASC'
+        where, params = '', []
+        if after is not None:
+            value, last_id = after
+            # Mirror ORDER BY with NULLs first: (column IS NOT NULL, column, id)
+            if column == 'id':
+                where, params = f"WHERE id {'<' if descending else '>'} ?", [last_id]
+            elif value is None:
+                where = f'WHERE {column} IS NULL AND id < ?' if descending else f'WHERE {column} IS NOT NULL OR id > ?'
+                params = [last_id]
+            elif descending:
+                where = f'WHERE {column} < ? OR {column} IS NULL OR ({column} = ? AND id < ?)'
+                params = [value, value, last_id]
+            else:
+                where = f'WHERE {column} > ? OR ({column} = ? AND id > ?)'
+                params = [value, value, last_id]
+        with self._connection() as conn:
+            rows = conn.execute(
+                f'SELECT data FROM {collection} {where} ORDER BY {column} {direction}, id {direction} LIMIT ? OFFSET ?',
+                params + [limit, offset],
+            )
+            return [self._decode(collection, data) for (data,) in rows]
+
+    def find_by(self, collection: str, field: str, value: Any) -> List[Dict[str, Any]]:
+        column = self._column(collection, field)
+        with self._connection() as conn:
+            rows = conn.execute(f'SELECT data FROM {collection} WHERE {column} = ? ORDER BY id', (value,))
+            return [self._decode(collection, data) for (data,) in rows]
+
+    def count_where(self, collection: str, field: str, value: Any) -> int:
+        column = self._column(collection, field)
+        with self._connection() as conn:
+            return conn.execute(f'SELECT COUNT(*) FROM {collection} WHERE {column} = ?', (value,)).fetchone()[0]
+
+    def count_by(self, collection: str, field: str) -> Dict[Any, int]:
+        column = self._column(collection, field)
+        with self._connection() as conn:
+            rows = conn.execute(
+                f'SELECT {column}, COUNT(*) FROM {collection} WHERE {column} IS NOT NULL '
+                f'GROUP BY {column} ORDER BY MIN(id)'
+            )
+            return dict(rows.fetchall())
+
+    def count_distinct(self, collection: str, field: str) -> int:
+        column = self._column(collection, field)
+        with self._connection() as conn:
+            return conn.execute(f'SELECT COUNT(DISTINCT {column}) FROM {collection}').fetchone()[0]
+
+    def insert(self, collection: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        with self._write() as conn:
+            conn.execute(self._sql[collection]['insert'], self._row(collection, record))
+            conn.execute(self._sql[collection]['search_insert'], self._search_row(collection, record))
+            self._touch(conn, collection)
+        return record
+
+    def update(self, collection: str, record_id: int, updates: Dict[str, Any],
+               expected_version: Optional[int] = None) -> bool:
+        # Read and write in one IMMEDIATE transaction so no other writer gets in between
+        with self.transaction(), self._write() as conn:
+            record = self.get(collection, record_id)
+            if record is None:
+                return False
+            record.update(self._versioned(collection, record, updates, expected_version))
+            row = self._row(collection, record)
+            conn.execute(self._sql[collection]['update'], row[1:] + (record_id,))
+            conn.execute(self._sql[collection]['search_delete'], (record_id,))
+            conn.execute(self._sql[collection]['search_insert'], self._search_row(collection, record))
+            self._touch(conn, collection)
+        return True
+
+    def delete(self, collection: str, record_id: int) -> bool:
+        with self._write() as conn:
+            if conn.execute(self._sql[collection]['delete'], (record_id,)).rowcount:
+                conn.execute(self._sql[collection]['search_delete'], (record_id,))
+                self._touch(conn, collection)
+        return True
+
+    def insert_many(self, collection: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not records:
+            return records
+        with self._write() as conn:
+            conn.executemany(self._sql[collection]['insert'], [self._row(collection, r) for r in records])
+            conn.executemany(self._sql[collection]['search_insert'], [self._search_row(collection, r) for r in records])
+            self._touch(conn, collection)
+        return records
+
+    def update_many(self, collection: str, updates: Dict[int, Dict[str, Any]]) -> int:
+        with self.transaction(), self._write() as conn:
+            records = self.get_many(collection, updates)
+            if not records:
+                return 0
+            rows = []
+            for record in records:
+                record.update(self._versioned(collection, record, updates[record['id']]))
+                row = self._row(collection, record)
+                rows.append(row[1:] + (record['id'],))
+            conn.executemany(self._sql[collection]['update'], rows)
+            conn.executemany(self._sql[collection]['search_delete'], [(r['id'],) for r in records])
+            conn.executemany(self._sql[collection]['search_insert'], [self._search_row(collection, r) for r in records])
+            self._touch(conn, collection)
+        return len(records)
+
+    def save_many(self, collection: str, records: List[Dict[str, Any]], deleted: Iterable[int] = ()):
+        """Write records as they are now, inserting or replacing each, and delete the deleted IDs"""
+        deleted = [(record_id,) for record_id in deleted]
+        if not records and not deleted:
+            return
+        with self._write() as conn:
+            conn.executemany(self._sql[collection]['search_delete'], [(r['id'],) for r in records] + deleted)
+            conn.executemany(self._sql[collection]['delete'], deleted)
+            conn.executemany(self._sql[collection]['upsert'], [self._row(collection, r) for r in records])
+            conn.executemany(self._sql[collection]['search_insert'], [self._search_row(collection, r) for r in records])
+            # Keep the sequence ahead of IDs handed out by whoever wrote the records
+            conn.execute(self._sql[collection]['init_sequence'], (collection,))
+            conn.execute('UPDATE sequences SET last_id = MAX(last_id, ?) WHERE name = ?',
+                         (max((r['id'] for r in records), default=0), collection))
+            self._touch(conn, collection)
+
+    def reserve_ids(self, collection: str, count: int = 1) -> range:
+        # The sequence row write lock makes this atomic across threads and processes
+        with self._write() as conn:
+            conn.execute(self._sql[collection]['init_sequence'], (collection,))
+            (last,) = conn.execute(
+                'UPDATE sequences SET last_id = last_id + ? WHERE name = ? RETURNING last_id',
+                (count, collection),
+            ).fetchall()[0]
+        return range(last - count + 1, last + 1)
+
+    def load(self, data: Dict[str, List[Dict[str, Any]]]):
+        with self._write() as conn:
+            for name, records in data.items():
+                conn.execute(self._sql[name]['clear'])
+                conn.execute(self._sql[name]['search_clear'])
+                conn.execute('DELETE FROM sequences WHERE name = ?', (name,))
+                self._touch(conn, name)
+                conn.executemany(self._sql[name]['insert'], [self._row(name, r) for r in records])
+                conn.executemany(self._sql[name]['search_insert'], [self._search_row(name, r) for r in records])
+
+
+@st.cache_resource
+def _snapshot_file(path: str):
+    """Map a snapshot file once per process"""
+    return read_snapshot(path)
+
+
+@st.cache_resource
+def _shared_storage(typed: bool = False, snapshot: Optional[str] = None) -> SharedMemoryStorage:
+    """Create the process-wide in-memory storage seeded from the snapshot or demo data"""
+    if snapshot:
+        return SharedMemoryStorage(load_snapshot(_snapshot_file(snapshot)), typed)
+    storage = SharedMemoryStorage(typed=typed)
+    storage.reseed()
+    return storage
+
+
+@st.cache_resource
+def _sqlite_storage(path: str) -> SQLiteStorage:
+    """Open the process-wide SQLite storage, seeding demo data into a new database"""
+    storage = SQLiteStorage(path)
+    if storage.is_empty():
+        storage.reseed()
+    return storage
+
+
+@st.cache_resource
+def _write_behind_storage(path: str, flush_interval: float, durability: str, typed: bool = False):
+    """Open the process-wide in-memory copy of the SQLite database, persisted to it in the background"""
+    from .persistence import WriteBehindStorage
+    backend = SQLiteStorage(path, synchronous='FULL' if durability == 'fsync' else 'NORMAL')
+    if backend.is_empty():
+        backend.reseed()
+    return WriteBehindStorage(backend, flush_interval, durability, typed)
+
+
+@st.cache_resource
+def _sandbox_base(typed: bool = False, snapshot: Optional[str] = None) -> SharedMemoryStorage:
+    """Create the process-wide base data that sandbox sessions read through and never write"""
+    base = SharedMemoryStorage(load_snapshot(_snapshot_file(snapshot)) if snapshot else None, typed)
+    if not snapshot:
+        base.reseed()
+    base.build_indexes()
+    return base
+
+
+def _demo_records(collection: str) -> List[Dict[str, Any]]:
+    """Build the demo records of one collection"""
+    from data.sample_data import build_collection
+    return build_collection(collection)
+
+
+def _session_storage(typed: bool = False, snapshot: Optional[str] = None) -> MemoryStorage:
+    """Get storage over the current session state, seeding it on first use
+
+    Without a snapshot each demo collection is seeded when a page first uses it.
+    With a snapshot each session gets its own unpickled copy, indexes included.
+    """
+    if 'initialized' not in st.session_state and snapshot:
+        st.session_state.update(load_snapshot(_snapshot_file(snapshot)))
+        st.session_state.initialized = True
+    elif 'initialized' not in st.session_state:
+        try:
+            from data.sample_data import initialize_data
+            initialize_data()
+        except Exception:
+            # Fall back to empty collections if seeding fails
+            pass
+    return MemoryStorage(st.session_state, typed, seed=_demo_records)
+
+
+def get_storage() -> Storage:
+    """Get the storage engine selected by the LMS_STORAGE environment variable
+
+    LMS_TYPED_RECORDS=1 stores typed records in the in-memory engines, and
+    LMS_SNAPSHOT=<path> seeds them from a snapshot file instead of the demo data.
+    sandbox layers each session's changes over one shared copy of that data.
+    With sqlite, LMS_WRITE_BEHIND=<seconds> serves reads and writes from memory
+    and flushes writes to the database at that interval, waiting for the flush
+    as set by LMS_DURABILITY (async, commit or fsync; see persistence.py).
+    """
+    backend = os.environ.get('LMS_STORAGE', 'session')
+    typed = os.environ.get('LMS_TYPED_RECORDS', '') == '1'
+    snapshot = os.environ.get('LMS_SNAPSHOT') or None
+    if backend == 'shared':
+        return _shared_storage(typed, snapshot)
+    if backend == 'sqlite':
+        path = os.environ.get('LMS_SQLITE_PATH', DEFAULT_SQLITE_PATH)
+        if os.environ.get('LMS_WRITE_BEHIND'):
+            return _write_behind_storage(path, float(os.environ['LMS_WRITE_BEHIND']),
+                                         os.environ.get('LMS_DURABILITY', 'async'), typed)
+        return _sqlite_storage(path)
+    if backend == 'sandbox':
+        from .overlay import OverlayStorage
+        return OverlayStorage(_sandbox_base(typed, snapshot), st.session_state)
+    if backend != 'session':
+        raise ValueError(f"Unknown LMS_STORAGE backend: {backend}")
+    return _session_storage(typed, snapshot)